@@ -0,0 +1,68 @@
+"""Compares the euclidean algorithm and the half-GCD algorithm of `Polynomial.gcd` and `Polynomial.xgcd`
+over a prime field, to set `Polynomial.half_gcd_threshold`.
+
+    PYTHONPATH=. python benchmarks/gcd.py [--prime 101] [--repeat 1] [--threshold 128] [--xgcd] degree...
+
+Over F101 with random polynomials of degrees `n` and `n - 1`, the half-GCD from degree 128 is slower at any degree:
+
+      degree   euclid (s)   half-GCD (s)
+         150         0.25           1.20
+         200         0.42           2.17
+         300         0.95           6.23
+         450         2.21          14.21
+         600         3.98          26.56
+
+and so is the half-GCD backend of `xgcd`, with `--xgcd`:
+
+      degree   euclid (s)   half-GCD (s)
+         150         0.71           1.70
+         300         3.43           8.05
+         600        13.88          32.80
+"""
+from argparse import ArgumentParser
+from random import seed
+from time import perf_counter
+
+from pyimath.polynomial import Polynomial
+from pyimath.primefield import PrimeField
+
+
+def timing(f, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        start = perf_counter()
+        f()
+        elapsed = perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('degrees', metavar='degree', type=int, nargs='+')
+    parser.add_argument('--prime', type=int, default=101)
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--threshold', type=int, default=128, help='threshold of the half-GCD runs')
+    parser.add_argument('--xgcd', action='store_true', help='time xgcd instead of gcd')
+    args = parser.parse_args()
+
+    seed(0)
+    field = PrimeField(args.prime)
+    threshold = Polynomial.half_gcd_threshold
+    print(f'{"degree":>8} {"euclid (s)":>12} {"half-GCD (s)":>14}')
+    try:
+        for degree in args.degrees:
+            a, b = field.random_polynomial(degree), field.random_polynomial(degree - 1)
+            method = a.xgcd if args.xgcd else a.gcd
+
+            Polynomial.half_gcd_threshold = None
+            euclid = timing(lambda: method(b), args.repeat)
+            Polynomial.half_gcd_threshold = args.threshold
+            half_gcd = timing(lambda: method(b), args.repeat)
+            print(f'{degree:>8} {euclid:>12.2f} {half_gcd:>14.2f}')
+    finally:
+        Polynomial.half_gcd_threshold = threshold
+
+
+if __name__ == '__main__':
+    main()
@@ -1,26 +1,74 @@
 __all__ = [
     'factorize',
+    'factorize_many',
     'Factorization',
+    'FactorizationCache',
     'Factor',
 ]
 
 
-from collections import namedtuple
-from typing import Sequence, Tuple
+from collections import namedtuple, OrderedDict
+from concurrent.futures import Executor, FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import reduce
+from itertools import combinations, islice
+from typing import Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 
-from pyimath.polynomial import Polynomial
-from pyimath.functions import gcd
+from pyimath.polynomial import Polynomial, FrobeniusMatrix
+from pyimath.primefield import PrimeField
+from pyimath.functions import gcd, isqrt, primes
+from pyimath.linalg import kernel
+from pyimath.hensel import hensel_lift, reduce_mod, to_prime_field
 from pyimath.annotations import BaseField, BaseNumber
 
 
-def factorize(p: Polynomial) -> 'Factorization':
+def factorize(p: Polynomial, executor: Optional[Executor] = None,
+              cache: Optional['FactorizationCache'] = None) -> 'Factorization':
     """
     Main entry point of the module, provide an instance of the Factorization class as a place holder
-    to call any factorization algorithms : `square_free`, `distinct_degree`, `equal_degree` or `cantor_zassenhaus`.
-
-    Accepts an instance of `Polynomial` (parameter `p`) and returns a instance of `Factorization`
+    to call any factorization algorithms : `square_free`, `distinct_degree`, `equal_degree`, `cantor_zassenhaus`,
+    `berlekamp`, `zassenhaus` or the `factor` dispatcher.
+
+    Accepts an instance of `Polynomial` (parameter `p`) and returns a instance of `Factorization`.
+    If an `executor` (e.g. a `concurrent.futures.ProcessPoolExecutor`) is given, `cantor_zassenhaus` submits
+    the distinct degree and equal degree factorizations of independent factors to it.
+    If a `cache` is given, `cantor_zassenhaus` and `berlekamp` reuse and record the factorizations of the polynomial,
+    of its square free parts and of its distinct degree factors
     """
-    return Factorization(p.base_field, p)
+    return Factorization(p.base_field, p, executor=executor, cache=cache)
+
+
+def factorize_many(polys: Iterable[Polynomial], workers: Optional[int] = None, method: str = 'auto',
+                   chunk_size: int = 32, cache: Optional['FactorizationCache'] = None) \
+        -> Iterator[Tuple[Sequence['Factor'], BaseNumber]]:
+    """Factorizes many polynomials with `factorize(p).factor(method)` and yields the results in the order of `polys`
+
+    The polynomials are read lazily by windows. Within a window, they are grouped by base field and
+    split into chunks of at most `chunk_size` polynomials over the same field, so that a chunk carries
+    the tables of its field only once.
+    If `workers` is greater than 1, the chunks are factorized by a process pool of `workers` processes,
+    otherwise they are factorized in the current process, with an optional `cache`"""
+    assert chunk_size > 0
+    polys = iter(polys)
+    if workers is None or workers <= 1:
+        for chunk in _chunks_by_field(polys, chunk_size):
+            yield from _factor_chunk(chunk, method, cache)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        window_size = 2 * workers * chunk_size
+        while True:
+            window = list(islice(polys, window_size))
+            if len(window) == 0:
+                break
+            futures = []
+            for chunk in _chunks_by_field(enumerate(window), chunk_size, indexed=True):
+                indices = [i for i, _ in chunk]
+                futures.append((indices, executor.submit(_factor_chunk, [p for _, p in chunk], method)))
+            results = [None] * len(window)
+            for indices, future in futures:
+                for i, result in zip(indices, future.result()):
+                    results[i] = result
+            yield from results
 
 
 class Factor(namedtuple('Factor', 'value, multiplicity, max_degree', defaults=(0,))):
@@ -44,23 +92,93 @@ class Factor(namedtuple('Factor', 'value, multiplicity, max_degree', defaults=(0
             s = f'({self.value})**{self.multiplicity}'
         else:
             s = f'({self.value})'
-        if self.is_irreducible:
+        if self.value.base_field.characteristic > 0 and self.is_irreducible:
             s += ' IRREDUCIBLE'
         return s
 
 
+class FactorizationCache:
+    """Bounded LRU cache of the factorizations of monic polynomials over finite fields
+
+    Entries are keyed by the base field and the coefficients of the polynomials. The least recently used entry is
+    evicted once the cache holds `max_size` entries. Share an instance across calls with `factorize(p, cache=...)`
+    """
+
+    CacheInfo = namedtuple('CacheInfo', 'hits, misses, max_size, size')
+
+    def __init__(self, max_size: int = 1024):
+        assert max_size > 0
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def cache_info(self) -> 'FactorizationCache.CacheInfo':
+        """Returns the hit and miss statistics, the maximum size and the current size of the cache"""
+        return self.CacheInfo(self.hits, self.misses, self.max_size, len(self._entries))
+
+    def clear(self):
+        """Removes all the entries and resets the statistics"""
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+    def get(self, poly: Polynomial) -> Optional[List[Factor]]:
+        """Returns the factors of a monic polynomial if they are in cache, `None` otherwise"""
+        key = self._key(poly)
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return list(self._entries[key])
+        self.misses += 1
+        return None
+
+    def put(self, poly: Polynomial, factors: Sequence[Factor]):
+        """Records the factors of a monic polynomial"""
+        key = self._key(poly)
+        self._entries[key] = tuple(factors)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _key(poly: Polynomial) -> Tuple:
+        return repr(poly.base_field), tuple(sorted((deg, repr(c)) for deg, c in poly.internal.items()))
+
+
 class Factorization:
     """
     Service provider for polynomial factorization.
 
-    The main service is the full factorization by the Cantor-Zassenhaus algorithm
+    The main services are the full factorizations by the Cantor-Zassenhaus and the Berlekamp algorithms over
+    finite fields and by the Zassenhaus algorithm over the integers.
+    `factor` picks one of them according to the base field and the degree of the polynomial
 
     Never use it directly, subclass it if you want but in any case, please use `factorize(poly).<method>()`
     """
 
-    def __init__(self, base_field: BaseField, poly: Polynomial):
+    berlekamp_max_order = 32
+    """Largest field order for which `factor(method='auto')` uses the Berlekamp algorithm"""
+    berlekamp_max_degree = 64
+    """Largest degree for which `factor(method='auto')` uses the Berlekamp algorithm"""
+
+    zassenhaus_nb_primes = 3
+    """Number of suitable primes tried by the Zassenhaus algorithm to prune the degrees of the factors"""
+    zassenhaus_max_prime = 200
+    """Largest prime tried by the Zassenhaus algorithm"""
+    baby_step_giant_step_min_degree = None
+    """Smallest degree for which `distinct_degree(method='auto')` uses the baby-step giant-step algorithm, `None`
+    to never use it. With the schoolbook multiplication of this module it is about 1.5 times slower than the
+    incremental algorithm up to degree 500 at least (see `benchmarks/distinct_degree.py`), so it is opt-in"""
+
+    def __init__(self, base_field: BaseField, poly: Polynomial, executor: Optional[Executor] = None,
+                 cache: Optional[FactorizationCache] = None):
         self.base_field = base_field
         self.poly = poly
+        self.executor = executor
+        self.cache = cache
 
     def factors_product(self, factors: Sequence[Factor]) -> Polynomial:
         """
@@ -123,20 +241,45 @@ class Factorization:
 
         return sqf, factors
 
-    def distinct_degree(self) -> Sequence[Factor]:
+    def distinct_degree(self, method: str = 'auto') -> Sequence[Factor]:
         """Distinct degree factorisation of a square free monic polynomial.
-        Returns a list of Factors with a multiplicity of 1 and the maximum degree of any irreducible factor"""
+        Returns a list of Factors with a multiplicity of 1 and the maximum degree of any irreducible factor
+
+        The `method` is either:
+
+        * `'incremental'`: computes `X^(q^i)` for each degree `i` in turn
+        * `'baby_step_giant_step'`: the Kaltofen-Shoup algorithm, computes about `sqrt(n)` modular compositions
+        * `'auto'`: baby-step giant-step from a degree of `baby_step_giant_step_min_degree` if it is set,
+          incremental otherwise"""
+        if method == 'auto':
+            threshold = self.baby_step_giant_step_min_degree
+            if threshold is not None and self.poly.degree >= threshold:
+                method = 'baby_step_giant_step'
+            else:
+                method = 'incremental'
+
+        if method == 'baby_step_giant_step':
+            return self._baby_step_giant_step_distinct_degree()
+        elif method != 'incremental':
+            raise ValueError(f'unknown distinct degree factorization method {method}')
+
         f = self.poly.copy.make_monic()
         factors = []
 
         fp = f.copy
-        q = f.base_field.characteristic
+        x = f.monic(1)
+        h = x
         i = 1
+        if fp.degree >= 2:
+            frobenius = FrobeniusMatrix.of(f)
         while fp.degree >= 2 * i:
-            g = gcd(fp, f.monic(q ** i) - f.monic(1))
+            # h = X^(q^i) mod f is maintained by q-th powering through the Frobenius matrix of f
+            # so that only polynomials of degree less than deg(f) are ever built
+            h = frobenius.power(h)
+            g = gcd(fp, h - x)
             if not g.make_monic().is_abs_unit:
                 factors.append(Factor(g.make_monic(), 1, i))
-            fp /= g
+                fp /= g
             i += 1
 
         if not fp.is_abs_unit and fp.degree > 0:
@@ -148,48 +291,62 @@ class Factorization:
 
     def equal_degree(self, nb_factors: int, max_degree: int) -> Sequence[Factor]:
         """Cantor–Zassenhaus factorization algorithm.
-        Input: Over a finite field Fq of odd order q,
+        Input: Over a finite field Fq of order q,
                p is a monic square free polynomial in Fq[x] of degree n = rd,
                which has r ≥ 2 irreducible factors each of degree d
-        Output: The set of monic irreducible factors of f."""
+        Output: The set of monic irreducible factors of f.
+
+        Each round picks a random polynomial `a` and splits every pending factor `g` by `gcd(g, a^((q^d-1)/2) - 1)`
+        for an odd `q`, or by `gcd(g, a + a^2 + ... + a^(2^(kd-1)))` for `q = 2^k`.
+        The q-th powers are computed through the Frobenius matrix of p."""
 
-        factors = []
         r, d = nb_factors, max_degree
         f = self.poly.copy.make_monic()
-        q = self.poly.base_field.characteristic
 
         assert f.degree == r * d, f'Degree of {str(f)} mismatches input parameters {nb_factors}, {max_degree}'
         assert r >= 2
 
-        max_retries = 2 * r * d
-        found_factors, nb_retries = 0, 0
-        while found_factors < r and nb_retries < max_retries:
-            # pick a random polynomial a of degree < r * d
-            a = f.base_field.random_polynomial(f.degree - 1)
-            g = gcd(f, a).make_monic()
-            if not g.is_unit and g not in factors:
-                factors.append(g)
-                found_factors += 1
-                continue
-            else:
-                m = (q ** d - 1) // 2
-                a_p = a ** m + a.unit
-                if not a_p.is_null:
-                    g = gcd(f, a_p).make_monic()
-                    if not g.is_unit and g != f and g not in factors:
-                        factors.append(g)
-                        found_factors += 1
-                        continue
-            nb_retries += 1
-        else:
+        frobenius = FrobeniusMatrix.of(f)
+        # a round splits a pending factor with a probability of about 1/2 at least
+        max_retries = 2 * r * d + 16
+        factors, to_split, nb_retries = [], [f], 0
+        while len(to_split) > 0:
             if nb_retries >= max_retries:
                 raise RuntimeError(f'unable to find {r} degree {d} factors for {str(f)}')
 
-        return [Factor(g, 1, 0) for g in factors]
+            # pick a random polynomial a of degree < r * d
+            a = f.base_field.polynomial(*[f.base_field.random_element() for _ in range(f.degree)])
+            h = self._splitting_polynomial(a, d, frobenius)
+            nb_retries += 1
+
+            pending, to_split = to_split, []
+            for g in pending:
+                s = gcd(g, h)
+                if 0 < s.degree < g.degree:
+                    nb_retries = 0
+                    pending_factors = [s, g / s]
+                else:
+                    pending_factors = [g]
+                for fct in pending_factors:
+                    if fct.degree == d:
+                        factors.append(fct.make_monic())
+                    else:
+                        to_split.append(fct)
+
+        if len(set(factors)) != r:
+            # p is not a square free product of r irreducible polynomials of degree d
+            raise RuntimeError(f'unable to find {r} degree {d} factors for {str(f)}')
+
+        return [Factor(g, 1, d) for g in factors]
 
     def cantor_zassenhaus(self) -> Tuple[Sequence[Factor], BaseNumber]:
         """Full factorisation algorithm for any polynomial over a finite field.
-           Returns a tuple containing a constant term and a list of factors with their multiplicity"""
+           Returns a tuple containing a constant term and a list of factors with their multiplicity
+
+           With an executor, the distinct degree factorization of each square free part and the equal degree
+           factorization of each distinct degree factor run as separate tasks.
+           With a cache, the factorizations of the polynomial, of its square free parts and of its distinct degree
+           factors are looked up first and recorded once computed"""
 
         irreducible_factors = []
         factors_to_consider = []
@@ -201,6 +358,10 @@ class Factorization:
             f = self.poly.copy
             constant_term = self.poly.base_field.one
 
+        cached = self._cache_get(f)
+        if cached is not None:
+            return cached, constant_term
+
         # attempt a square free factorisation
         sqf, multiple_factors = factorize(f).square_free()
         # sqf may be irreducible or not
@@ -209,18 +370,428 @@ class Factorization:
             factors_to_consider.append(Factor(sqf, 1, 0))
         factors_to_consider += multiple_factors
 
-        while len(factors_to_consider) > 0:  # we keep on factorizing while some reducible factors remain
+        pending = dict()
+        # we keep on factorizing while some reducible factors remain
+        while len(factors_to_consider) > 0 or len(pending) > 0:
+            if len(factors_to_consider) == 0:
+                done, _ = wait(pending.keys(), return_when=FIRST_COMPLETED)
+                for future in done:
+                    mfct = pending.pop(future)
+                    factors_to_consider += self._record_equal_degree(mfct, future.result())
+                continue
+
             mfct = factors_to_consider.pop()
             if mfct.is_irreducible:
                 irreducible_factors.append(mfct)
             elif mfct.max_degree == 0:
-                subfactors = factorize(mfct.value).distinct_degree()
-                for s in subfactors:
-                    factors_to_consider.append(Factor(s.value, mfct.multiplicity, s.max_degree))
+                if self.cache is not None and mfct.value != f:
+                    # square free part of f, factorized on its own so that its factorization is cached
+                    subfactors, _ = factorize(mfct.value, executor=self.executor, cache=self.cache).cantor_zassenhaus()
+                    for s in subfactors:
+                        irreducible_factors.append(Factor(s.value, mfct.multiplicity * s.multiplicity, s.max_degree))
+                elif self.executor is not None:
+                    pending[self.executor.submit(_distinct_degree_task, mfct)] = mfct
+                else:
+                    factors_to_consider += _distinct_degree_task(mfct)
             else:
                 d = int(mfct.max_degree)
                 assert mfct.value.degree % d == 0
-                r = mfct.value.degree // d
-                factors_to_consider += factorize(mfct.value).equal_degree(r, d)
+                cached = self._cache_get(mfct.value)
+                if cached is not None:
+                    irreducible_factors += [Factor(s.value, mfct.multiplicity, d) for s in cached]
+                elif self.executor is not None:
+                    pending[self.executor.submit(_equal_degree_task, mfct)] = mfct
+                else:
+                    factors_to_consider += self._record_equal_degree(mfct, _equal_degree_task(mfct))
+
+        self._cache_put(f, irreducible_factors)
+        return irreducible_factors, constant_term
+
+    def berlekamp(self) -> Tuple[Sequence[Factor], BaseNumber]:
+        """Full deterministic factorisation algorithm for any polynomial over a finite field.
+           Returns a tuple containing a constant term and a list of factors with their multiplicity
+
+           Each square free part `f` is split along the null space of `Q - I` where `Q` is the Frobenius matrix of `f`.
+           The splitting iterates over the elements of the field, hence the algorithm suits small fields"""
+
+        irreducible_factors = []
+        if not self.poly.is_monic:
+            f = self.poly.make_monic()
+            constant_term = self.poly.leading
+        else:
+            f = self.poly.copy
+            constant_term = self.poly.base_field.one
+
+        cached = self._cache_get(f)
+        if cached is not None:
+            return cached, constant_term
 
+        sqf, multiple_factors = factorize(f).square_free()
+        factors_to_consider = list(multiple_factors)
+        if not sqf.is_unit:
+            factors_to_consider.append(Factor(sqf, 1, 0))
+
+        for mfct in factors_to_consider:
+            g = mfct.value.make_monic()
+            split_factors = self._cache_get(g) if g != f else None
+            if split_factors is None:
+                split_factors = [Factor(s, 1, s.degree) for s in self._berlekamp_split(g)]
+                self._cache_put(g, split_factors)
+            for s in split_factors:
+                irreducible_factors.append(Factor(s.value, mfct.multiplicity, s.max_degree))
+
+        self._cache_put(f, irreducible_factors)
         return irreducible_factors, constant_term
+
+    def factor(self, method: str = 'auto') -> Tuple[Sequence[Factor], BaseNumber]:
+        """Full factorisation of a polynomial over a finite field with a given `method`:
+
+        * `'cantor_zassenhaus'`: probabilistic, suits large fields
+        * `'berlekamp'`: deterministic, suits small fields and moderate degrees
+        * `'zassenhaus'`: over the integers
+        * `'auto'`: Zassenhaus over the integers. Over a finite field, Berlekamp if the order of the field
+        and the degree of the polynomial are at most `berlekamp_max_order` and `berlekamp_max_degree`,
+        Cantor-Zassenhaus otherwise
+
+        Returns a tuple containing a constant term and a list of factors with their multiplicity"""
+        if method == 'auto':
+            if self.base_field.characteristic == 0:
+                method = 'zassenhaus'
+            elif self.base_field.order <= self.berlekamp_max_order and self.poly.degree <= self.berlekamp_max_degree:
+                method = 'berlekamp'
+            else:
+                method = 'cantor_zassenhaus'
+
+        if method == 'berlekamp':
+            return self.berlekamp()
+        elif method == 'cantor_zassenhaus':
+            return self.cantor_zassenhaus()
+        elif method == 'zassenhaus':
+            return self.zassenhaus()
+        else:
+            raise ValueError(f'unknown factorization method {method}')
+
+    def zassenhaus(self) -> Tuple[Sequence[Factor], BaseNumber]:
+        """Full factorisation of a polynomial over the integers.
+           Returns a tuple containing the content of the polynomial and a list of factors with their multiplicity
+
+           Each square free part `f` is factorized modulo a prime `p` that keeps it square free. The modular factors
+           are lifted modulo `p^k` above the Mignotte bound of the factors of `f` by Hensel lifting, then recombined
+           into factors over the integers. The subsets of modular factors whose degree is not compatible with
+           the factorizations modulo other primes are pruned"""
+        if self.base_field.characteristic != 0:
+            raise ValueError(f'Zassenhaus factorization is defined over the integers, not over {self.base_field}')
+
+        if self.poly.degree < 1:
+            return [], self.poly.constant
+
+        content = self._content(self.poly)
+        f = self._primitive_part(self.poly)
+
+        factors = []
+        for g, multiplicity in self._integer_square_free(f):
+            for h in self._zassenhaus_split(g):
+                factors.append(Factor(h, multiplicity, h.degree))
+
+        return factors, content
+
+    # Gory Details
+
+    def _cache_get(self, f: Polynomial) -> Optional[List[Factor]]:
+        return self.cache.get(f) if self.cache is not None else None
+
+    def _cache_put(self, f: Polynomial, factors: Sequence[Factor]):
+        if self.cache is not None:
+            self.cache.put(f, factors)
+
+    def _record_equal_degree(self, mfct: Factor, factors: List[Factor]) -> List[Factor]:
+        """Records the result of a task in cache if the task was an equal degree factorization"""
+        if mfct.max_degree > 0:
+            self._cache_put(mfct.value, [Factor(s.value, 1, s.max_degree) for s in factors])
+        return factors
+
+    @staticmethod
+    def _content(f: Polynomial) -> int:
+        """Returns the GCD of the coefficients of a polynomial over the integers, with the sign of its leading term"""
+        c = abs(reduce(gcd, f.coefficients))
+        return c if f.leading > 0 else -c
+
+    @classmethod
+    def _primitive_part(cls, f: Polynomial) -> Polynomial:
+        """Returns the primitive part of a polynomial over the integers, with a positive leading term"""
+        c = cls._content(f)
+        return Polynomial([a // c for a in f.coefficients], base_field=f.base_field, indeterminate=f.indeterminate)
+
+    @classmethod
+    def _integer_gcd(cls, a: Polynomial, b: Polynomial) -> Polynomial:
+        """Returns the primitive GCD of two polynomials over the integers by primitive pseudo-remainder sequences"""
+        a, b = cls._primitive_part(a), cls._primitive_part(b)
+        if a.degree < b.degree:
+            a, b = b, a
+        while not b.is_null:
+            _, r = a.mul_constant(b.leading ** (a.degree - b.degree + 1)).long_division(b)
+            a, b = b, r if r.is_null else cls._primitive_part(r)
+        return a
+
+    @classmethod
+    def _integer_square_free(cls, f: Polynomial) -> List[Tuple[Polynomial, int]]:
+        """Returns the square free decomposition of a primitive polynomial over the integers (Yun's algorithm)
+        as a list of square free primitive polynomials along with their multiplicity"""
+        factors = []
+        g = cls._integer_gcd(f, f.formal_derivative())
+        w, _ = f.long_division(g)
+        i = 1
+        while w.degree > 0:
+            y = cls._integer_gcd(w, g)
+            z, _ = w.long_division(y)
+            if z.degree > 0:
+                factors.append((z, i))
+            w, g = y, g.long_division(y)[0]
+            i += 1
+        return factors
+
+    @staticmethod
+    def _mignotte_bound(f: Polynomial) -> int:
+        """Returns an upper bound of the absolute value of the coefficients of any factor of `f` over the integers"""
+        n = f.degree
+        return (isqrt(n + 1) + 1) * 2 ** n * max(abs(c) for c in f.coefficients)
+
+    @staticmethod
+    def _degree_sums(degrees: Sequence[int]) -> Set[int]:
+        """Returns the set of the sums of the subsets of a sequence of degrees"""
+        sums = {0}
+        for d in degrees:
+            sums |= {s + d for s in sums}
+        return sums
+
+    @classmethod
+    def _zassenhaus_split(cls, f: Polynomial) -> Sequence[Polynomial]:
+        """Returns the irreducible factors of a square free primitive polynomial over the integers"""
+        n = f.degree
+        if n < 2:
+            return [f]
+
+        lc = f.leading
+        allowed_degrees, best, nb_primes = None, None, 0
+        for p in primes(cls.zassenhaus_max_prime):
+            if lc % p == 0:
+                continue
+            field = PrimeField(p)
+            fp = to_prime_field(f, field)
+            if gcd(fp, fp.formal_derivative()).degree > 0:
+                continue
+
+            modular_factors, _ = factorize(fp).factor()
+            degrees = cls._degree_sums([fct.value.degree for fct in modular_factors])
+            allowed_degrees = degrees if allowed_degrees is None else allowed_degrees & degrees
+            if best is None or len(modular_factors) < len(best[1]):
+                best = p, modular_factors
+            if len(allowed_degrees) == 2:
+                # only 0 and n: f is irreducible
+                return [f]
+            nb_primes += 1
+            if nb_primes == cls.zassenhaus_nb_primes:
+                break
+
+        if best is None:
+            raise RuntimeError(f'unable to find a prime below {cls.zassenhaus_max_prime} to factorize {f}')
+
+        p, modular_factors = best
+        bound = 2 * lc * cls._mignotte_bound(f)
+        k, m = 1, p
+        while m <= bound:
+            k, m = k + 1, m * p
+
+        lifted = hensel_lift(f, [fct.value for fct in modular_factors], k)
+        return cls._recombine(f, lifted, m, allowed_degrees)
+
+    @classmethod
+    def _recombine(cls, f: Polynomial, lifted: Sequence[Polynomial], m: int, allowed_degrees: Set[int]) \
+            -> List[Polynomial]:
+        """Recombines monic factors of `f` modulo `m` into factors of `f` over the integers
+
+        Subsets of the modular factors are tried by increasing size, the leading coefficient of `f` times
+        their product is a factor of `f` if it divides it exactly"""
+        factors = []
+        remaining = list(lifted)
+        s = 1
+        while 2 * s <= len(remaining):
+            for subset in combinations(range(len(remaining)), s):
+                if 2 * s == len(remaining) and 0 not in subset:
+                    # the complementary subset was already tried
+                    continue
+                if sum(remaining[i].degree for i in subset) not in allowed_degrees:
+                    continue
+                g = reduce(lambda a, b: a * b, (remaining[i] for i in subset), f.unit.mul_constant(f.leading))
+                g = reduce_mod(g, m)
+                # the constant term of g shall divide the one of lc(f) * f
+                if g.constant == 0 and f.constant != 0:
+                    continue
+                if g.constant != 0 and (f.leading * f.constant) % g.constant != 0:
+                    continue
+                g = cls._primitive_part(g)
+                try:
+                    q, r = f.long_division(g)
+                except ValueError:
+                    continue
+                if r.is_null:
+                    factors.append(g)
+                    f = q
+                    remaining = [u for i, u in enumerate(remaining) if i not in subset]
+                    break
+            else:
+                s += 1
+
+        factors.append(f)
+        return factors
+
+    def _baby_step_giant_step_distinct_degree(self) -> Sequence[Factor]:
+        """Kaltofen-Shoup distinct degree factorisation of a square free monic polynomial `f` of degree `n`
+
+        With `s = ceil(sqrt(n/2))`, the baby steps are `h_i = X^(q^i) % f` for `i <= s` and the giant steps are
+        `H_j = X^(q^(s*j)) % f`. An irreducible factor of degree `d` in `](j-1)*s, j*s]` divides
+        the product of `H_j - h_i` for `i < s`, the interval polynomials are then refined with the baby steps"""
+        f = self.poly.copy.make_monic()
+        n = f.degree
+        if n < 2:
+            return [Factor(f, 1, n)]
+
+        frobenius = FrobeniusMatrix.of(f)
+        s = isqrt((n + 1) // 2 - 1) + 1
+        m = -(-(n // 2) // s)
+
+        baby_steps = [f.monic(1)]
+        for _ in range(s):
+            baby_steps.append(frobenius.power(baby_steps[-1]))
+
+        factors = []
+        fp = f.copy
+        big_h = baby_steps[s]
+        for j in range(1, m + 1):
+            if fp.degree < 2 * (j - 1) * s + 2:
+                break
+            if j > 1:
+                # s matrix-vector products are cheaper than the modular composition H_(j-1)(H_1)
+                # with schoolbook multiplication
+                big_h = frobenius.power(big_h, s)
+
+            interval = f.unit
+            for i in range(s):
+                interval = (interval * (big_h - baby_steps[i])) % f
+            g = gcd(fp, interval)
+            if g.degree == 0:
+                continue
+            fp /= g
+
+            # refine the product of the factors of degree in ](j-1)*s, j*s]
+            for i in range(s - 1, -1, -1):
+                if g.degree == 0:
+                    break
+                h = gcd(g, big_h - baby_steps[i])
+                if h.degree > 0:
+                    factors.append(Factor(h.make_monic(), 1, s * j - i))
+                    g /= h
+
+        if fp.degree > 0:
+            factors.append(Factor(fp.make_monic(), 1, fp.degree))
+
+        return factors
+
+    @staticmethod
+    def _berlekamp_split(f: Polynomial) -> Sequence[Polynomial]:
+        """Returns the monic irreducible factors of a square free monic polynomial"""
+        n = f.degree
+        if n < 2:
+            return [f]
+
+        bf = f.base_field
+        rows = FrobeniusMatrix.of(f).rows
+        # a polynomial v satisfies v^q = v mod f iff its coefficients lie in the left null space of Q - I
+        q_minus_i = [[rows[i][j] - bf.one if i == j else rows[i][j] for i in range(n)] for j in range(n)]
+        basis = kernel(q_minus_i, bf)
+
+        nb_factors = len(basis)
+        factors = [f]
+        for v in basis:
+            if len(factors) == nb_factors:
+                break
+            v = Polynomial(v, base_field=bf, indeterminate=f.indeterminate)
+            if v.degree == 0:
+                continue
+            split_factors = []
+            for g in factors:
+                for s in bf:
+                    if g.degree < 2:
+                        break
+                    h = gcd(g, v.add_constant(-s))
+                    if 0 < h.degree < g.degree:
+                        split_factors.append(h.make_monic())
+                        g = g / h
+                split_factors.append(g.make_monic())
+            factors = split_factors
+
+        assert len(factors) == nb_factors
+        return factors
+
+    @staticmethod
+    def _splitting_polynomial(a: Polynomial, d: int, frobenius: FrobeniusMatrix) -> Polynomial:
+        """Returns a polynomial whose GCD with any product of irreducible factors of degree `d`
+        of the Frobenius matrix modulus splits it with a probability of about 1/2"""
+        f = frobenius.modulus
+        q = frobenius.order
+        if q % 2 != 0:
+            # a^((q^d-1)/2) = (a * a^q * ... * a^(q^(d-1)))^((q-1)/2)
+            norm, t = a % f, a % f
+            for _ in range(d - 1):
+                t = frobenius.power(t)
+                norm = (norm * t) % f
+            return pow(norm, (q - 1) // 2, f) - f.unit
+        else:
+            # absolute trace from F_(q^d) to F_2
+            trace, t = a % f, a % f
+            for _ in range(d * (q.bit_length() - 1) - 1):
+                t = (t * t) % f
+                trace = trace + t
+            return trace
+
+
+def _distinct_degree_task(mfct: Factor) -> List[Factor]:
+    """Distinct degree factorization of a square free factor, keeps its multiplicity.
+    Defined at module level so that it can be submitted to a process pool"""
+    return [Factor(s.value, mfct.multiplicity, s.max_degree) for s in factorize(mfct.value).distinct_degree()]
+
+
+def _equal_degree_task(mfct: Factor) -> List[Factor]:
+    """Equal degree factorization of a distinct degree factor, keeps its multiplicity.
+    Defined at module level so that it can be submitted to a process pool"""
+    d = int(mfct.max_degree)
+    r = mfct.value.degree // d
+    return [Factor(s.value, mfct.multiplicity, d) for s in factorize(mfct.value).equal_degree(r, d)]
+
+
+def _chunks_by_field(items: Iterable, chunk_size: int, indexed: bool = False) -> Iterator[List]:
+    """Groups consecutive polynomials, or `(index, polynomial)` pairs if `indexed`, into chunks over the same field.
+    In indexed mode, all the items are grouped by field before chunking"""
+    if not indexed:
+        chunk = []
+        for p in items:
+            if len(chunk) == chunk_size or (len(chunk) > 0 and repr(chunk[0].base_field) != repr(p.base_field)):
+                yield chunk
+                chunk = []
+            chunk.append(p)
+        if len(chunk) > 0:
+            yield chunk
+        return
+
+    groups = OrderedDict()
+    for i, p in items:
+        groups.setdefault(repr(p.base_field), []).append((i, p))
+    for group in groups.values():
+        for start in range(0, len(group), chunk_size):
+            yield group[start:start + chunk_size]
+
+
+def _factor_chunk(polys: Sequence[Polynomial], method: str,
+                  cache: Optional[FactorizationCache] = None) -> List[Tuple[Sequence[Factor], BaseNumber]]:
+    """Factorizes a chunk of polynomials. Defined at module level so that it can be submitted to a process pool"""
+    return [factorize(p, cache=cache).factor(method) for p in polys]
@@ -1,13 +1,18 @@
+from array import array
+from collections.abc import Mapping
 from itertools import product as cartesian_product
 import operator
+from threading import Lock
 
-from typing import Optional, Sequence, MutableSequence, Iterator, Union, List, Tuple, Any, Collection
+from typing import Optional, Sequence, MutableSequence, Iterator, Union, List, Tuple, Any, Collection, Callable
 
 
-from pyimath.functions import maybe_prime
+from pyimath.functions import factor, maybe_prime
 from pyimath.functions import power
-from pyimath.polynomial import Polynomial, symbolic_polynomial
+from pyimath.irreducible import irreducible_polynomial
+from pyimath.polynomial import Polynomial, PolynomialBuilder, symbolic_polynomial
 from pyimath.primefield import PrimeField, PFElement
+from pyimath.tables import default_table_cache, TableCache
 
 __all__ = ['FiniteField', 'finite_field', 'FFElement']
 
@@ -19,6 +24,13 @@ Vector = Union[List[BaseAtom], MutableSequence[BaseAtom], Sequence[BaseAtom], Co
 class FiniteField:
     """Represents a non-prime finite field where:
     """
+
+    table_cache_min_order = 256
+    """Smallest order from which the powers of the root and of the generator and the Frobenius map are loaded from
+    and stored into `table_cache`"""
+    table_cache = None
+    """`TableCache` of the tables of the finite fields, `tables.default_table_cache()` if `None`"""
+
     def __init__(self,
                  prime: int,
                  dimension: int,
@@ -48,16 +60,20 @@ class FiniteField:
         assert self.base_polynomial.is_monic
         assert self.base_polynomial.is_irreducible
 
-        self.root_powers = dict()
-        self._compute_root_powers()
-
-        self.generator_powers = dict()
-        self.element_as_powers = dict()
         if self.generator is not None:
             self.generator = self.element(self.generator)
-            self._check_generator_order()
 
-        self._frobenius_map = self._compute_frobenius_map()
+        if not self._load_tables():
+            self.root_powers = dict()
+            self._compute_root_powers()
+
+            self.generator_powers = dict()
+            self.element_as_powers = dict()
+            if self.generator is not None:
+                self._check_generator_order()
+
+            self._frobenius_map = self._compute_frobenius_map()
+            self._store_tables()
 
     def add(self, a: 'FFElement', b: 'FFElement') -> 'FFElement':
         """Adds two elements
@@ -270,20 +286,8 @@ class FiniteField:
             if p_a == p or p_a == p_a.null:
                 raise ZeroDivisionError
 
-            neutral = p_a.unit
-            t = p_a.null
-            newt = neutral
-            r = p
-            newr = p_a
-            while newr != newr.null:
-                quotient = r / newr
-                r, newr = newr, r - quotient * newr
-                t, newt = newt, t - quotient * newt
-
-            assert r.degree == 0
-            # if r.degree > 0
-            # Either p is not irreducible over the base_field or p_a is a multiple of p
-            return self.element_from_polynomial((neutral / r) * t)
+            # p is irreducible over the base field, p_a is therefore invertible modulo p
+            return self.element_from_polynomial(p_a.inverse_mod(p))
 
     @property
     def neutral(self) -> 'FFElement':
@@ -353,6 +357,18 @@ class FiniteField:
         """
         return self._prime_field
 
+    def random_element(self) -> 'FFElement':
+        """Returns an element of the field at random
+        """
+        return self.element([self.prime_field.random_element() for _ in range(self.dimension)])
+
+    def random_polynomial(self, degree: int) -> Polynomial:
+        """Returns a random monic polynomial of a given degree
+        """
+        p = self.polynomial(*[self.random_element() for _ in range(0, degree)])
+        p += p.monic(degree)
+        return p
+
     @property
     def zero(self) -> 'FFElement':
         """Returns the additive neutral element of the field
@@ -389,6 +405,12 @@ class FiniteField:
             s += ')'
         return s
 
+    def __reduce__(self):
+        """Pickles the field by its defining parameters, the unpickled field is looked up in the registry of
+        `finite_field` or built once per process
+        """
+        return _field_from_parameters, _field_parameters(self)
+
     def __str__(self) -> str:
         """Returns a printable representation of the finite field
         """
@@ -443,13 +465,62 @@ class FiniteField:
         e = self.dimension
         self.root_powers[e] = r
         while r != p_neutral and e < self.order - 1:
-            r *= r.monic(1)
+            # multiply by the adjunct root j and substitute j^n with -pr
+            b = PolynomialBuilder(f, indeterminate=p.indeterminate).iadd_scaled_shift(r, f.one, 1)
+            c = b[p.degree]
+            if c != f.zero:
+                b.iadd_term(p.degree, -c).isub_scaled_shift(pr, c)
+            r = b.freeze()
             e += 1
-            if r.degree == p.degree:
-                r -= p.monic(p.degree)
-                r += -pr
             self.root_powers[e] = r
 
+    def _load_tables(self) -> bool:
+        """Sets the powers of the root and of the generator and the Frobenius map from the table cache.
+        Returns `False` if they are not in cache or if the field is too small to use the cache"""
+        if self.order < self.table_cache_min_order:
+            return False
+        tables = self._table_cache.load('finite', self._table_params())
+        if tables is None:
+            return False
+
+        n = self.dimension
+        self.root_powers = _VectorTable(n, n, tables['root_powers'], self._polynomial_from_vector)
+        self.generator_powers = _VectorTable(1, n, tables['generator_powers'], self.element)
+        self.element_as_powers = _LogTable(self, tables['logs']) if self.generator is not None else dict()
+        self._frobenius_map = list(_VectorTable(0, n, tables['frobenius_map'], self.element).values())
+        return True
+
+    def _store_tables(self):
+        if self.order < self.table_cache_min_order:
+            return
+
+        def flatten(vectors):
+            return [int(c) for v in vectors for c in v]
+
+        n, p = self.dimension, self.characteristic
+        logs = [0] * self.order
+        for e, k in self.element_as_powers.items():
+            logs[_LogTable.index(e, p)] = k
+        root_powers = [r.coefficients + [0] * (n - 1 - r.degree) for _, r in sorted(self.root_powers.items())]
+        tables = dict(root_powers=flatten(root_powers),
+                      generator_powers=flatten(e.vector for _, e in sorted(self.generator_powers.items())),
+                      logs=logs if self.generator is not None else [],
+                      frobenius_map=flatten(e.vector for e in self._frobenius_map))
+        self._table_cache.store('finite', self._table_params(), tables)
+
+    @property
+    def _table_cache(self) -> TableCache:
+        return self.table_cache if self.table_cache is not None else default_table_cache()
+
+    def _table_params(self) -> List[int]:
+        params = [self.characteristic, self.dimension] + [int(c) for c in self.base_polynomial.coefficients]
+        if self.generator is not None:
+            params += [int(c) for c in self.generator.vector]
+        return params
+
+    def _polynomial_from_vector(self, v: Vector) -> Polynomial:
+        return self.prime_field.polynomial(*v)
+
     def _safe_convert_vector(self, v: Vector) -> List[PFElement]:
         """Creates an element of the field from a variety of input values
         """
@@ -586,6 +657,11 @@ class FFElement:
         """
         return self.field.pow(self, n)
 
+    def __reduce__(self):
+        """Pickles the element as its field and the vector of the integer values of its components
+        """
+        return self.field.element, ([int(c) for c in self.vector],)
+
     def __repr__(self) -> str:
         """Returns an evaluable representation of an element
         """
@@ -619,53 +695,157 @@ class FFElement:
             return self.field.mul(self, self.field.multiplicative_inverse(self.field(other)))
 
 
-# Pre-computed finite fields
-class Record:
-    """Record in the register of pre-instantiated finite field
-    """
-    def __init__(self, code: str):
-        self.code = code
-        self.instance = None
+class _VectorTable(Mapping):
+    """Read-only mapping of the consecutive integers from `start` to vectors of `dimension` integers stored
+    in a buffer, each turned into a value by `factory` on access"""
 
-    def instantiate(self):
-        if not self.instantiated:
-            self.instance = eval(self.code)
+    def __init__(self, start: int, dimension: int, vectors: Sequence[int], factory: Callable[[List[int]], Any]):
+        self._start = start
+        self._dimension = dimension
+        self._vectors = vectors
+        self._factory = factory
 
-        return self.instance
+    def __contains__(self, key: Any) -> bool:
+        return isinstance(key, int) and self._start <= key < self._start + len(self)
 
-    @property
-    def instantiated(self) -> bool:
-        return self.instance is not None
-
-
-FINITE_FIELD = {
-    'F2': Record("PrimeField(2)"),
-    'F3': Record("PrimeField(3)"),
-    'F4': Record("FiniteField(2, 2, symbolic_polynomial('X^2+X+1', PrimeField(2)), generator=(0, 1))"),
-    'F5': Record("PrimeField(5)"),
-    'F7': Record("PrimeField(7)"),
-    'F8': Record("FiniteField(2, 3, symbolic_polynomial('X^3+X+1', PrimeField(2)), generator=(0, 1))"),
-    'F9': Record("FiniteField(3, 2, symbolic_polynomial('X^2+1', PrimeField(3)), generator=(1, 1))"),
-    'F11': Record("PrimeField(11)"),
-    'F13': Record("PrimeField(13)"),
-    'F16': Record("FiniteField(2, 4, symbolic_polynomial('X^4+X+1', PrimeField(2)), generator=(1, 1, 0, 0))"),
-    'F17': Record("PrimeField(17)"),
-    'F19': Record("PrimeField(19)"),
-    'F23': Record("PrimeField(23)"),
-    'F25': Record("FiniteField(5, 2, symbolic_polynomial('X^2+2', PrimeField(5)), generator=(1, 1))"),
-    'F27': Record("FiniteField(3, 3, symbolic_polynomial('X^3-X-1', PrimeField(3)), generator=(1, 0, 1))")
+    def __getitem__(self, key: int) -> Any:
+        if key not in self:
+            raise KeyError(key)
+        i = (key - self._start) * self._dimension
+        return self._factory(list(self._vectors[i:i + self._dimension]))
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(self._start, self._start + len(self)))
+
+    def __len__(self) -> int:
+        return len(self._vectors) // self._dimension
+
+    def __reduce__(self):
+        # memory mapped buffers cannot be pickled, their content can
+        return self.__class__, (self._start, self._dimension, array(self._vectors.format, self._vectors),
+                                self._factory)
+
+
+class _LogTable(Mapping):
+    """Read-only mapping of the non null elements of a finite field to their discrete logarithm, that is their
+    exponent as a power of the generator, stored in a buffer indexed by `_LogTable.index(e)`"""
+
+    def __init__(self, field: FiniteField, logs: Sequence[int]):
+        self._field = field
+        self._logs = logs
+
+    @staticmethod
+    def index(e: 'FFElement', p: int) -> int:
+        """Returns the index of an element: the integer whose digits in base `p` are its components"""
+        index = 0
+        for c in reversed(e.vector):
+            index = index * p + int(c) % p
+        return index
+
+    def __getitem__(self, e: 'FFElement') -> int:
+        k = self._logs[self.index(e, self._field.characteristic)]
+        if k == 0:
+            raise KeyError(e)
+        return k
+
+    def __iter__(self) -> Iterator['FFElement']:
+        return (e for e in self._field if not e.null)
+
+    def __len__(self) -> int:
+        return self._field.order - 1
+
+    def __reduce__(self):
+        return self.__class__, (self._field, array(self._logs.format, self._logs))
+
+
+# Registry of finite fields
+_DEFINING_POLYNOMIALS = {
+    4: ((1, 1, 1), (0, 1)),
+    8: ((1, 1, 0, 1), (0, 1)),
+    9: ((1, 0, 1), (1, 1)),
+    16: ((1, 1, 0, 0, 1), (1, 1, 0, 0)),
+    25: ((2, 0, 1), (1, 1)),
+    27: ((-1, -1, 0, 1), (1, 0, 1)),
 }
+"""Coefficients, by increasing degree, of the defining polynomials of small finite fields and vector of
+their generators. Other finite fields are defined by primitive polynomials from `irreducible_polynomial`"""
+
+_registry = dict()
+_definitions = dict()
+_registry_lock = Lock()
+_build_locks = dict()
 
 
-def finite_field(order):
-    """Returns the finite field of the given order.
-    Fields that may be instantiated this way are:
+def finite_field(order: int) -> Union[PrimeField, FiniteField]:
+    """Returns the finite field of the given order, which must be a prime power.
 
-    * all prime fields of order less then 23
-    * finite fields of non-prime order up to order 27. These finite fields have all a valid generator.
+    A prime order gives a `PrimeField`. A non-prime order `p^n` gives a `FiniteField` defined by a primitive
+    polynomial of degree `n` over `Fp`, so that the adjunct root `j` generates the multiplicative group.
+    The polynomial is looked up in the on-disk cache of the `irreducible` module, or found and recorded there.
 
+    Fields are built on first request only, then shared by all subsequent calls, from any thread
     """
-    if f'F{order}' in FINITE_FIELD:
-        return FINITE_FIELD[f'F{order}'].instantiate()
+    field = _registry.get(order)
+    if field is None:
+        with _build_lock(order):
+            field = _registry.get(order)
+            if field is None:
+                field = _make_finite_field(order)
+                with _registry_lock:
+                    field = _registry[order] = _definitions.setdefault(_field_parameters(field), field)
+    return field
+
+
+def _build_lock(key) -> Lock:
+    """Returns the lock held while the field of an order or of some parameters is built. The global lock only
+    guards the registry itself, so that building a large field does not block the requests of other fields"""
+    with _registry_lock:
+        return _build_locks.setdefault(key, Lock())
+
+
+def _field_parameters(field: Union[PrimeField, FiniteField]) -> tuple:
+    """Returns the parameters that define a field: its characteristic, its dimension, the coefficients of its ideal,
+    the vector of its generator and its root symbol"""
+    if isinstance(field, PrimeField):
+        return field.characteristic, 1, (), None, None
+    generator = tuple(int(c) for c in field.generator.vector) if field.generator is not None else None
+    return (field.characteristic, field.dimension, tuple(int(c) for c in field.base_polynomial.coefficients),
+            generator, field.root_symbol)
+
+
+def _field_from_parameters(prime: int, dimension: int, ideal: Sequence[int], generator: Optional[Sequence[int]],
+                           root_symbol: Optional[str]) -> Union[PrimeField, FiniteField]:
+    """Returns the field defined by the parameters returned by `_field_parameters`, built on first request only.
+    Fields are unpickled by this function so that a process builds the tables of a field once"""
+    key = prime, dimension, tuple(ideal), None if generator is None else tuple(generator), root_symbol
+    field = _definitions.get(key)
+    if field is None:
+        if dimension == 1:
+            return finite_field(prime)
+        with _build_lock(key):
+            field = _definitions.get(key)
+            if field is None:
+                ideal = PrimeField(prime).polynomial(*ideal)
+                field = FiniteField(prime, dimension, ideal, generator=generator, root_symbol=root_symbol)
+                with _registry_lock:
+                    field = _definitions.setdefault(key, field)
+    return field
+
+
+def _make_finite_field(order: int) -> Union[PrimeField, FiniteField]:
+    factors = factor(order) if order > 1 else []
+    if len(factors) != 1:
+        raise ValueError(f'No finite field of order {order}')
+
+    prime, dimension = factors[0]
+    prime_field = PrimeField(prime)
+    if dimension == 1:
+        return prime_field
+
+    if order in _DEFINING_POLYNOMIALS:
+        coefficients, generator = _DEFINING_POLYNOMIALS[order]
+        ideal = prime_field.polynomial(*coefficients)
     else:
-        raise ValueError(f'No pre-instantiated finite field of order {order}')
+        ideal = irreducible_polynomial(prime_field, dimension, primitive=True)
+        generator = (0, 1)
+    return FiniteField(prime, dimension, ideal, generator=generator)
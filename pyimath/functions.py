@@ -9,6 +9,7 @@ __all__ = [
     'primes',
     'factor',
     'gcd',
+    'isqrt',
     'mul_factor',
     'reduce_to_gcd',
     'power',
@@ -45,12 +46,14 @@ def comb(n: int, k: int) -> int:
 
 
 def factor(n: int) -> List[Tuple[int, int]]:
-    """Computes the prime factorization of an integer the hard way
+    """Computes the prime factorization of an integer
+
+    Small factors are found by trial division, the remaining cofactor is split by Pollard-Brent's rho method
     """
     if n <= 1:
         raise ValueError
 
-    factors = list()
+    factors = dict()
 
     ml = 0
     p = 2
@@ -58,45 +61,70 @@ def factor(n: int) -> List[Tuple[int, int]]:
         n //= p
         ml += 1
     if ml > 0:
-        factors.append((p, ml,))
+        factors[p] = ml
 
     p = 3
-    while p ** 2 <= n:
+    while p ** 2 <= n and p < _trial_division_bound:
         ml = 0
         while n % p == 0:
             n //= p
             ml += 1
         if ml > 0:
-            factors.append((p, ml,))
+            factors[p] = ml
         p += 2
 
-    if n > 2:
-        factors.append((n, 1,))
+    cofactors = [n] if n > 1 else []
+    while cofactors:
+        m = cofactors.pop()
+        if m < _trial_division_bound ** 2 or maybe_prime(m, 24):
+            factors[m] = factors.get(m, 0) + 1
+        else:
+            d = _pollard_brent(m)
+            cofactors += [d, m // d]
 
-    return factors
+    return sorted(factors.items())
 
 
 def gcd(a, b):
-    """Computes the GCD of two operands recursively where
+    """Computes the GCD of two operands where
     `a` and `b` shall be of the same type or of compatible types.
 
-    Mimics the behavior of `math.gcd` for zero operands.
+    Delegates to `a.gcd(b)` if the operands define their own GCD algorithm (e.g. polynomials),
+    otherwise applies an iterative euclidean algorithm.
+
+    Zero operands are handled by the GCD algorithms as well: the GCD of integers is always non negative,
+    like `math.gcd`, and the GCD of polynomials over a field is always monic.
     """
+    if isinstance(a, int) and isinstance(b, int):
+        return __internal_gcd(a, b)
+
+    if hasattr(a, 'gcd'):
+        return a.gcd(b)
+
     if a == 0:
         return b
     if b == 0:
         return a
 
-    if isinstance(a, int) and isinstance(b, int):
-        _gcd = __internal_gcd
-    else:
-        def _gcd(g, r):
-            if r == 0:
-                return g
-            else:
-                return _gcd(r, g % r)
+    while b != 0:
+        a, b = b, a % b
+    return a
+
 
-    return _gcd(a, b)
+def isqrt(n: int) -> int:
+    """Returns the integer square root of a non negative integer, that is the largest `r` such as `r^2 <= n`,
+    by Newton's method
+    """
+    if n < 0:
+        raise ValueError('Square root of a negative integer')
+    if n == 0:
+        return 0
+    r = 1 << ((n.bit_length() + 1) // 2)
+    while True:
+        s = (r + n // r) // 2
+        if s >= r:
+            return r
+        r = s
 
 
 def maybe_prime(n: int, k: int = 3) -> bool:
@@ -188,5 +216,37 @@ def reduce_to_gcd(it: Iterator):
     return reduce(gcd, it, next(it))
 
 
+def _pollard_brent(n: int) -> int:
+    """Returns a non trivial divisor of an odd composite integer"""
+    while True:
+        y, c, m = randrange(1, n), randrange(1, n), 128
+        g = r = q = 1
+        x = ys = y
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = __internal_gcd(q, n)
+                k += m
+            r *= 2
+
+        if g == n:
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = __internal_gcd(abs(x - ys), n)
+
+        if g != n:
+            return g
+
+
+_trial_division_bound = 1000
+
 small_primes = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43,)
 """A tuple that defines all primes up to 43"""
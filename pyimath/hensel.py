@@ -0,0 +1,125 @@
+from functools import reduce
+from typing import List, Sequence, Tuple
+
+from pyimath.annotations import BaseField
+from pyimath.integer import IntegerRing
+from pyimath.polynomial import Polynomial
+from pyimath.primefield import PrimeField
+
+__all__ = [
+    'hensel_lift',
+    'hensel_step',
+    'reduce_mod',
+    'to_integers',
+    'to_prime_field',
+]
+
+
+def hensel_lift(f: Polynomial, factors: Sequence[Polynomial], k: int) -> List[Polynomial]:
+    """Multifactor Hensel lifting.
+
+    `f` is a polynomial over the integers and `factors` are monic polynomials over a prime field `Fp`, pairwise
+    coprime, such that `f = lc(f) * u_1 * ... * u_r mod p` where `p` does not divide `lc(f)`.
+    Returns the monic polynomials `v_i` over the integers with coefficients in `]-p^k/2, p^k/2]` such that
+    `f = lc(f) * v_1 * ... * v_r mod p^k` and `v_i = u_i mod p`.
+
+    The factors are split along a balanced binary tree, each node is lifted from its parent by quadratic
+    Hensel steps"""
+    assert len(factors) > 0
+    assert all(u.is_monic for u in factors)
+    field = factors[0].base_field
+    p = field.characteristic
+    assert f.leading % p != 0
+    assert p ** k > 1
+
+    m = p ** k
+    lifted = []
+    _lift_node(reduce_mod(f, m), list(factors), p, k, lifted)
+    return lifted
+
+
+def hensel_step(f: Polynomial, g: Polynomial, h: Polynomial, s: Polynomial, t: Polynomial, m: int) \
+        -> Tuple[Polynomial, Polynomial, Polynomial, Polynomial]:
+    """Quadratic Hensel step over the integers.
+
+    From `f = g * h mod m` and `s * g + t * h = 1 mod m` where `h` is monic, `deg(s) < deg(h)` and `deg(t) < deg(g)`,
+    returns `(g', h', s', t')` with the same properties modulo `m^2` such that `g' = g mod m` and `h' = h mod m`
+    (von zur Gathen & Gerhard, Modern Computer Algebra, algorithm 15.10)"""
+    m2 = m * m
+    e = reduce_mod(f - g * h, m2)
+    q, r = reduce_mod(s * e, m2).long_division(h)
+    g_star = reduce_mod(g + t * e + q * g, m2)
+    h_star = reduce_mod(h + r, m2)
+
+    b = reduce_mod(s * g_star + t * h_star - h.unit, m2)
+    c, d = reduce_mod(s * b, m2).long_division(h_star)
+    s_star = reduce_mod(s - d, m2)
+    t_star = reduce_mod(t - t * b - c * g_star, m2)
+
+    return g_star, h_star, s_star, t_star
+
+
+def reduce_mod(f: Polynomial, m: int) -> Polynomial:
+    """Returns a polynomial over the integers with the coefficients of `f` reduced modulo `m` in `]-m/2, m/2]`"""
+    return Polynomial([_symmetric_mod(c, m) for c in f.coefficients], base_field=f.base_field,
+                      indeterminate=f.indeterminate)
+
+
+def to_integers(f: Polynomial, ring: BaseField = None) -> Polynomial:
+    """Returns a polynomial over the integers from a polynomial over a prime field"""
+    ring = ring if ring is not None else IntegerRing()
+    return Polynomial([int(c) for c in f.coefficients], base_field=ring, indeterminate=f.indeterminate)
+
+
+def to_prime_field(f: Polynomial, field: PrimeField) -> Polynomial:
+    """Returns the reduction of a polynomial over the integers modulo the characteristic of a prime field"""
+    p = field.characteristic
+    return field.polynomial(*[_symmetric_mod(c, p) for c in f.coefficients], indeterminate=f.indeterminate)
+
+
+def _lift_node(f: Polynomial, factors: List[Polynomial], p: int, k: int, lifted: List[Polynomial]):
+    """Lifts the factorization `f = lc(f) * u_1 * ... * u_r mod p` of a node of the factor tree to `p^k`
+    and appends the lifted monic factors"""
+    m = p ** k
+    if len(factors) == 1:
+        lifted.append(reduce_mod(f.mul_constant(_inverse_mod(f.leading, m)), m))
+        return
+
+    field = factors[0].base_field
+    middle = len(factors) // 2
+    left, right = factors[:middle], factors[middle:]
+
+    # f = g * h mod p with g = lc(f) * u_1 * ... * u_middle and h monic
+    g = to_integers(_product(left, to_prime_field(f.unit.mul_constant(f.leading), field)), f.base_field)
+    h = to_integers(_product(right, field.polynomial(field.one)), f.base_field)
+    _, s, t = to_prime_field(g, field).xgcd(to_prime_field(h, field))
+    s, t = to_integers(s, f.base_field), to_integers(t, f.base_field)
+
+    precision = 1
+    while precision < k:
+        g, h, s, t = hensel_step(reduce_mod(f, p ** (2 * precision)), g, h, s, t, p ** precision)
+        precision *= 2
+
+    _lift_node(reduce_mod(g, m), left, p, k, lifted)
+    _lift_node(reduce_mod(h, m), right, p, k, lifted)
+
+
+def _inverse_mod(a: int, m: int) -> int:
+    """Returns the inverse of `a` modulo `m` by the extended euclidean algorithm"""
+    r0, r1, s0, s1 = a % m, m, 1, 0
+    while r1 != 0:
+        q = r0 // r1
+        r0, r1 = r1, r0 - q * r1
+        s0, s1 = s1, s0 - q * s1
+    if r0 != 1:
+        raise ValueError(f'{a} is not invertible modulo {m}')
+    return s0 % m
+
+
+def _product(factors: Sequence[Polynomial], initial: Polynomial) -> Polynomial:
+    return reduce(lambda a, b: a * b, factors, initial)
+
+
+def _symmetric_mod(c: int, m: int) -> int:
+    c %= m
+    return c - m if 2 * c > m else c
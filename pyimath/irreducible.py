@@ -0,0 +1,211 @@
+import json
+import os
+import tempfile
+from functools import reduce
+from itertools import combinations, product
+from threading import Lock
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from pyimath.annotations import BaseField, BaseNumber
+from pyimath.functions import factor
+from pyimath.polynomial import FrobeniusMatrix, Polynomial
+from pyimath.tables import cache_directory
+
+__all__ = [
+    'default_cache',
+    'irreducible_polynomial',
+    'is_primitive',
+    'IrreducibleCache',
+]
+
+
+def irreducible_polynomial(field: BaseField, degree: int, primitive: bool = False,
+                           cache: Optional['IrreducibleCache'] = None) -> Polynomial:
+    """Returns a monic irreducible polynomial of a given degree over a prime field, that is also primitive if
+    `primitive` is set.
+
+    Sparse candidates are tried first in a fixed order, from binomials `X^n + b` and trinomials `X^n + a*X^k + b`
+    up to pentanomials, as they make reductions cheap. Random polynomials are tried afterwards. Hence the result
+    is the same from one run to another unless the sparse candidates are exhausted.
+
+    The result is looked up in and recorded into `cache`, by default the on-disk cache returned by `default_cache()`
+    """
+    assert degree > 0
+    if field.characteristic != field.order:
+        raise ValueError(f'{field} is not a prime field')
+
+    cache = cache if cache is not None else default_cache()
+    p = field.characteristic
+    coefficients = cache.get(p, degree, primitive)
+    if coefficients is not None:
+        return field.polynomial(*coefficients)
+
+    accept = is_primitive if primitive else (lambda f: f.is_irreducible)
+    poly = next((f for f in _sparse_candidates(field, degree) if accept(f)), None)
+    while poly is None:
+        f = field.generate_irreducible_polynomial(degree)
+        if not primitive or is_primitive(f):
+            poly = f
+
+    cache.put(p, degree, primitive, [int(c) for c in poly.coefficients])
+    return poly
+
+
+def is_primitive(f: Polynomial) -> bool:
+    """Returns `True` if a polynomial over a finite field of order `q` is primitive, that is irreducible and such that
+    `X` generates the multiplicative group of `K[X]/(f)`
+
+    `X` has order `q^n - 1` iff `X^((q^n - 1) / r) != 1 mod f` for each prime divisor `r` of `q^n - 1`, which
+    requires the factorization of `q^n - 1`"""
+    if f.degree < 1 or f.constant == f.base_field.zero or not f.is_irreducible:
+        return False
+
+    order = f.base_field.order ** f.degree - 1
+    if order == 1:
+        return True
+    return all(not _power_of_x(f, order // r).is_unit for r, _ in factor(order))
+
+
+class IrreducibleCache:
+    """Cache of irreducible and primitive polynomials over prime fields, keyed by characteristic and degree
+
+    Entries are stored as lists of integer coefficients in a JSON file at `path` so that they persist
+    across processes. The file is read on first access and rewritten on every new entry.
+    If `path` is `None`, the cache lives in memory only
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._entries = None
+        self._lock = Lock()
+
+    def clear(self):
+        """Removes all the entries, and the file if any"""
+        with self._lock:
+            self._entries = dict()
+            if self.path is not None and os.path.exists(self.path):
+                os.remove(self.path)
+
+    def get(self, p: int, n: int, primitive: bool = False) -> Optional[List[int]]:
+        """Returns the coefficients of an irreducible, resp. primitive, polynomial of degree `n` over `Fp`
+        if one is in cache, `None` otherwise. A primitive polynomial is returned if no other irreducible
+        polynomial is in cache"""
+        with self._lock:
+            entry = self._load().get(self._key(p, n), dict())
+        if primitive:
+            return entry.get('primitive')
+        return entry.get('irreducible', entry.get('primitive'))
+
+    def put(self, p: int, n: int, primitive: bool, coefficients: List[int]):
+        """Records the coefficients of an irreducible, resp. primitive, polynomial of degree `n` over `Fp`"""
+        with self._lock:
+            if self.path is not None:
+                # merge the entries written by other processes in the meantime
+                self._entries = None
+            entry = self._load().setdefault(self._key(p, n), dict())
+            entry['primitive' if primitive else 'irreducible'] = list(coefficients)
+            self._save()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(entry) for entry in self._load().values())
+
+    # Gory Details (as usual)
+
+    @staticmethod
+    def _key(p: int, n: int) -> str:
+        return f'{p}^{n}'
+
+    def _load(self) -> Dict[str, Dict[str, List[int]]]:
+        if self._entries is None:
+            self._entries = dict()
+            if self.path is not None:
+                try:
+                    with open(self.path) as file:
+                        self._entries = json.load(file)
+                except (OSError, ValueError):
+                    pass
+        return self._entries
+
+    def _save(self):
+        if self.path is None:
+            return
+        # the cache is a convenience: a read-only or full file system is not an error
+        try:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            with os.fdopen(fd, 'w') as file:
+                json.dump(self._entries, file, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+
+def default_cache() -> IrreducibleCache:
+    """Returns the cache used by `irreducible_polynomial` when none is given.
+
+    Its file is `irreducible.json` in `tables.cache_directory()`, that is the directory named by
+    the `PYIMATH_CACHE_DIR` environment variable, `~/.cache/pyimath` by default"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = IrreducibleCache(os.path.join(cache_directory(), 'irreducible.json'))
+    return _default_cache
+
+
+_default_cache = None
+
+
+def _power_of_x(f: Polynomial, e: int) -> Polynomial:
+    """Returns `X^e % f` as the product of the `(X^(q^j))^d_j` where the `d_j` are the digits of `e` in base `q`,
+    the `X^(q^j)` being computed by the Frobenius map"""
+    q = f.base_field.order
+    frobenius = FrobeniusMatrix.of(f)
+    res = f.unit
+    x_qj = f.monic(1) % f
+    while e > 0:
+        e, d = divmod(e, q)
+        if d > 0:
+            res = (res * pow(x_qj, d, f)) % f
+        if e > 0:
+            x_qj = frobenius.power(x_qj)
+    return res
+
+
+def _sparse_candidates(field: BaseField, degree: int) -> Iterator[Polynomial]:
+    """Yields the monic polynomials of a given degree with two to five terms, a non null constant term
+    and, from degree 2, no root in the field, by increasing number of terms and increasing degree of the second term
+
+    Since the reciprocal of an irreducible (resp. primitive) trinomial `X^n + a*X^k + b` is an irreducible
+    (resp. primitive) trinomial `X^n + (a/b)*X^(n-k) + 1/b`, only the trinomials with `k <= n/2` are yielded.
+    Over F2, the trinomials of a degree multiple of 8 are all reducible (Swan's theorem) and are not yielded"""
+    units = [c for c in field if c != field.zero]
+
+    for nb_terms in range(2, 6):
+        if nb_terms == 3 and field.characteristic == 2 and degree % 8 == 0:
+            continue
+        for exponents in _middle_exponents(degree, nb_terms - 2):
+            for coefficients in product(units, repeat=nb_terms - 1):
+                terms = dict(zip(exponents + (0,), coefficients))
+                if degree == 1 or not any(_evaluate(terms, degree, a) == field.zero for a in field):
+                    yield _sparse_polynomial(field, degree, terms)
+
+
+def _middle_exponents(degree: int, nb_exponents: int) -> Iterator[Tuple[int, ...]]:
+    if nb_exponents == 0:
+        yield tuple()
+    elif nb_exponents == 1:
+        yield from ((k,) for k in range(1, degree // 2 + 1))
+    else:
+        for top in range(nb_exponents, degree):
+            for others in combinations(range(top - 1, 0, -1), nb_exponents - 1):
+                yield (top,) + others
+
+
+def _evaluate(terms: Dict[int, BaseNumber], degree: int, a: BaseNumber) -> BaseNumber:
+    return reduce(lambda s, term: s + term[1] * a ** term[0], terms.items(), a ** degree)
+
+
+def _sparse_polynomial(field: BaseField, degree: int, terms: Dict[int, BaseNumber]) -> Polynomial:
+    coefficients = [terms.get(deg, field.zero) for deg in range(degree)] + [field.one]
+    return Polynomial(coefficients, base_field=field)
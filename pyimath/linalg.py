@@ -0,0 +1,89 @@
+from typing import List, Sequence, Tuple
+
+from pyimath.annotations import BaseField, BaseNumber
+
+__all__ = [
+    'kernel',
+    'rank',
+    'row_echelon',
+    'transpose',
+]
+
+Matrix = List[List[BaseNumber]]
+
+
+def kernel(matrix: Sequence[Sequence[BaseNumber]], base_field: BaseField) -> Matrix:
+    """Returns a basis of the (right) null space of a matrix over a field, that is the vectors `v` such that `M.v = 0`
+
+    The matrix is given as a list of rows. The basis is in reduced form: each vector has a coefficient equal to one
+    at the index of a distinct free column of the matrix
+    """
+    nb_columns = len(matrix[0]) if len(matrix) > 0 else 0
+    reduced, pivots = row_echelon(matrix, base_field)
+    zero, one = base_field.zero, base_field.one
+
+    basis = []
+    pivot_rows = {col: row for row, col in enumerate(pivots)}
+    for free in range(nb_columns):
+        if free in pivot_rows:
+            continue
+        v = [zero] * nb_columns
+        v[free] = one
+        for col, row in pivot_rows.items():
+            v[col] = -reduced[row][free]
+        basis.append(v)
+
+    return basis
+
+
+def rank(matrix: Sequence[Sequence[BaseNumber]], base_field: BaseField) -> int:
+    """Returns the rank of a matrix over a field
+    """
+    _, pivots = row_echelon(matrix, base_field)
+    return len(pivots)
+
+
+def row_echelon(matrix: Sequence[Sequence[BaseNumber]], base_field: BaseField) -> Tuple[Matrix, List[int]]:
+    """Gauss-Jordan elimination of a matrix over a field.
+
+    Returns the reduced row echelon form of the matrix, without its null rows, and the list of its pivot columns.
+    The input matrix is left untouched
+    """
+    zero, one = base_field.zero, base_field.one
+    rows = [list(row) for row in matrix]
+    nb_columns = len(rows[0]) if len(rows) > 0 else 0
+
+    pivots = []
+    r = 0
+    for col in range(nb_columns):
+        # look for a pivot in this column
+        pivot = next((i for i in range(r, len(rows)) if rows[i][col] != zero), None)
+        if pivot is None:
+            continue
+        rows[r], rows[pivot] = rows[pivot], rows[r]
+
+        # normalize the pivot row
+        c = rows[r][col]
+        if c != one:
+            inv = one / c
+            rows[r] = [e * inv for e in rows[r]]
+
+        # eliminate the column everywhere else
+        pivot_row = rows[r]
+        for i, row in enumerate(rows):
+            if i != r and row[col] != zero:
+                c = row[col]
+                rows[i] = [e - c * pe if pe != zero else e for e, pe in zip(row, pivot_row)]
+
+        pivots.append(col)
+        r += 1
+        if r == len(rows):
+            break
+
+    return rows[:r], pivots
+
+
+def transpose(matrix: Sequence[Sequence[BaseNumber]]) -> Matrix:
+    """Returns the transpose of a matrix given as a list of rows
+    """
+    return [list(col) for col in zip(*matrix)]
@@ -1,15 +1,18 @@
-from typing import Iterable, Optional, Dict, Collection, Tuple, Sequence, Iterator, Any
+from typing import Iterable, Optional, Dict, Collection, Tuple, Sequence, Iterator, Any, List, TextIO, Union
 import operator
-from collections import namedtuple
+from collections import deque, namedtuple, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from enum import Enum
-from re import finditer
+from itertools import islice
+import re
+from threading import Lock
 
 
 from pyimath.annotations import BaseField, BaseNumber, Operand
-from pyimath.functions import gcd, reduce_to_gcd, power
+from pyimath.functions import factor, gcd, reduce_to_gcd, power
 
 
-__all__ = ['Polynomial', 'symbolic_polynomial']
+__all__ = ['Polynomial', 'PolynomialBuilder', 'FrobeniusMatrix', 'parse_stream', 'symbolic_polynomial']
 
 
 class Polynomial:
@@ -23,6 +26,9 @@ class Polynomial:
     that are all zeroes from a certain index is used to initialize the polynomial
     on instantiation and can be retrieved through the `coefficients` property
 
+    Polynomials are immutable: every operation returns a new instance, which allows the degree,
+    the valuation and the hash to be computed once and cached
+
     Moreover this class implements all the operations over a ring of polynomials
 
     `base_field` must represent an integral domain that is:
@@ -34,6 +40,17 @@ class Polynomial:
     examples: Z, Z(i)
     """
 
+    half_gcd_threshold = None
+    """Degree from which `Polynomial.gcd` switches from the euclidean algorithm to the half-GCD algorithm,
+    `None` to never use the half-GCD. With the schoolbook multiplication of this module the half-GCD is slower
+    at any degree (see `benchmarks/gcd.py`), so it is opt-in"""
+    subproduct_tree_threshold = 512
+    """Number of points from which `Polynomial.evaluate_many` and `Polynomial.interpolate` switch
+    to a subproduct tree"""
+    irreducibility_early_abort = 8
+    """Degree up to which `Polynomial.check_irreducibility` looks for factors of low degree before running
+    Rabin's test"""
+
     def __init__(self, coeffs: Sequence[BaseNumber], base_field: BaseField, indeterminate: Optional[str] = 'X'):
         """`coeffs` is an iterable of elements from the base field, `base_field` an instance of what should generally be
         a finite field and `indeterminate` is a single digit string used to format the polynomial
@@ -43,56 +60,65 @@ class Polynomial:
 
         self._coefficients = self._safe_convert_coefficients(self._remove_trailing_zeros(coeffs))
         self.indeterminate = indeterminate
+        self._cache_metadata()
 
     def add(self, poly: 'Polynomial') -> 'Polynomial':
         """Returns the sum of two polynomials"""
-        a = self._coefficients
-        s = poly.copy
-        for deg_a, c_a in a.items():
-            if deg_a in s.internal.keys():
-                s._set_term(deg_a, s[deg_a] + c_a)
-            else:
-                s._set_term(deg_a, c_a)
-
-        return s
+        zero = self.base_field.zero
+        terms = dict(poly._coefficients)
+        for deg, c in self._coefficients.items():
+            if deg in terms:
+                c = terms[deg] + c
+                if c == zero:
+                    del terms[deg]
+                    continue
+            terms[deg] = c
+
+        return poly._new(terms)
 
     def add_constant(self, k: BaseNumber) -> 'Polynomial':
         """External addition of a polynomial"""
-        a = self._coefficients
-        s = self.null
-
-        if not self.is_null:
-            for deg, c in a.items():
-                if deg == 0:
-                    s._set_term(deg, c + k)
-                else:
-                    s._set_term(deg, c)
+        terms = dict(self._coefficients)
+        c = self[0] + k
+        if c == self.base_field.zero:
+            terms.pop(0, None)
         else:
-            s._set_term(0, k)
-
-        return s
+            terms[0] = c
+        return self._new(terms)
 
-    def check_irreducibility(self) -> bool:
+    def check_irreducibility(self, early_abort: Optional[int] = None) -> bool:
         """Returns True if the polynomial is irreducible
 
-        Inspired by https://jeremykun.com/2014/03/13/programming-with-finite-fields/"""
+        Rabin's test: a polynomial `f` of degree `n` over a field of order `q` is irreducible iff `f` divides
+        `X^(q^n) - X` and `gcd(f, X^(q^(n/r)) - X) = 1` for each prime divisor `r` of `n`.
+        The powers of `X` are computed with the Frobenius matrix of `f`.
+
+        Ben-Or's early abort also checks `gcd(f, X^(q^i) - X) = 1` for each `i <= early_abort` so as to reject
+        a polynomial with a factor of low degree, as most random polynomials have, before computing `X^(q^n)`.
+        `early_abort` defaults to `Polynomial.irreducibility_early_abort`"""
         p = self.copy
-        q = p.base_field.characteristic
-        if q == 0:
+        if p.base_field.characteristic == 0:
             raise NotImplementedError(f'Cannot check polynomial irreducibility in {self.base_field}')
 
-        x = p.monic(1)
-        term = x.copy
+        if p.degree < 2:
+            return True
 
-        for _ in range(p.degree // 2):
-            term = term ** q % p
-            if not (term - x).is_null:
-                if gcd(p, term - x).degree > 0:
-                    return False
-            else:
+        n = p.degree
+        if early_abort is None:
+            early_abort = self.irreducibility_early_abort
+        checkpoints = {n // r for r, _ in factor(n)}
+        checkpoints.update(range(1, min(early_abort, n // 2) + 1))
+
+        x = p.monic(1)
+        term = x
+        frobenius = FrobeniusMatrix.of(p)
+        for i in range(1, n + 1):
+            # term = X^(q^i) % p
+            term = frobenius.power(term)
+            if i in checkpoints and gcd(p, term - x).degree > 0:
                 return False
 
-        return True
+        return term == x
 
     @property
     def coefficients(self) -> Collection:
@@ -115,40 +141,69 @@ class Polynomial:
     @property
     def copy(self) -> 'Polynomial':
         """Returns a copy of itself"""
-        res = self.null
-        for deg, c in self.internal.items():
-            res._set_term(deg, c)
-        return res
+        return self._new(dict(self._coefficients))
 
     @property
     def degree(self) -> int:
         """Returns the degree of the polynomial"""
-        if self.is_null:
-            return 0  # rigorously, it should be -infinity
-        else:
-            return max(self._coefficients.keys())
+        return self._degree  # rigorously, it should be -infinity for the null polynomial, it is 0 instead
 
     def evaluate(self, value: BaseNumber) -> BaseNumber:
-        """Evaluate the polynomial for some value"""
+        """Evaluate the polynomial for some value using Horner's rule"""
         value = self.base_field.element(value)
-        # f(k) = f(x) % (x-k)
-        # f(x) = q(x)(x - k) + r (deg(r) < d(x-k) = 1 => deg(r)=0
-        # f(k) = r
+        result = self.base_field.zero
+        for deg in range(self.degree, -1, -1):
+            result = result * value + self[deg]
+        return result
+
+    def evaluate_many(self, points: Iterable[BaseNumber]) -> List[BaseNumber]:
+        """Evaluate the polynomial at several points and returns the list of values in the same order
+
+        Uses Horner's rule when there are less than `Polynomial.subproduct_tree_threshold` points,
+        otherwise reduces the polynomial along a subproduct tree of the points:
+        `f(k) = f % (X - k)` for every point `k`"""
+        points = [self.base_field.element(x) for x in points]
+        if len(points) < self.subproduct_tree_threshold:
+            return [self.evaluate(x) for x in points]
 
-        r = self % self.base_field.linear_polynomial(value)
-        return r.trailing
+        return SubproductTree(points, self.base_field).remainders(self)
 
     def formal_derivative(self) -> 'Polynomial':
         """Computes and returns the formal derivative of a polynomial"""
-        res = self.null
-        for deg, c in self.internal.items():
+        zero = self.base_field.zero
+        terms = dict()
+        for deg, c in self._coefficients.items():
             if deg > 0:
-                res._set_term(deg - 1, self.base_field.ext_mul(deg, c))
-        return res
+                c = self.base_field.ext_mul(deg, c)
+                if c != zero:
+                    terms[deg - 1] = c
+        return self._new(terms)
 
     def gcd(self, p: 'Polynomial') -> 'Polynomial':
-        """Returns the GCD of two polynomials"""
-        return gcd(self, p)
+        """Returns the GCD of two polynomials
+
+        Over a field, the GCD is made monic and is computed by an iterative euclidean algorithm,
+        or by the half-GCD algorithm (Knuth-Schönhage) as long as the degrees are at least
+        `Polynomial.half_gcd_threshold` if it is set.
+        Over a ring, the GCD is computed by the iterative euclidean algorithm only"""
+        if self.base_field.characteristic == 0:
+            return self._euclid_gcd(p)
+
+        a, b = self, p
+        if a.degree < b.degree:
+            a, b = b, a
+        threshold = self.half_gcd_threshold
+        while threshold is not None and not b.is_null and b.degree >= threshold:
+            if a.degree == b.degree:
+                a, b = b, a % b
+                continue
+            m00, m01, m10, m11 = a._half_gcd_matrix(b)
+            a, b = m00 * a + m01 * b, m10 * a + m11 * b
+            if not b.is_null:
+                a, b = b, a % b
+
+        g = a._euclid_gcd(b)
+        return g if g.is_null else g.make_monic()
 
     def frobenius_reciprocal(self) -> 'Polynomial':
         """Returns a polynomial `R` if and only if  this polynomial can be written as `R^(p*m)`
@@ -168,23 +223,49 @@ class Polynomial:
             if not self.formal_derivative().is_null:
                 raise ValueError(f'The polynomial p is not a {self.base_field.characteristic} power')
             else:
-                res = self.null
-
-                for deg in range(0, self.degree + 1):
-                    if deg == 0:
-                        res += p_th_root_func(self.constant)
-                    else:
-                        if deg % self.base_field.characteristic == 0:
-                            term = self.monic(deg // self.base_field.characteristic)
-                            term *= p_th_root_func(self[deg])
-                            res += term
-                        else:
-                            assert self[deg] == 0
+                res = PolynomialBuilder(self.base_field, indeterminate=self.indeterminate)
+                q = self.base_field.characteristic
+                for deg, c in self._coefficients.items():
+                    assert deg % q == 0
+                    res.iadd_term(deg // q, p_th_root_func(c))
 
-                return res
+                return res.freeze()
         else:
             raise RuntimeError(f'{self.base_field} does not support taking the p-th root of a polynomial')
 
+    @staticmethod
+    def interpolate(points: Sequence[BaseNumber], values: Sequence[BaseNumber], base_field: BaseField,
+                    indeterminate: Optional[str] = 'X') -> 'Polynomial':
+        """Returns the polynomial of degree less than `len(points)` that takes the given `values` at the given `points`
+
+        `points` must be distinct elements of `base_field` which must be a field.
+        Uses Newton's divided differences when there are less than `Polynomial.subproduct_tree_threshold` points,
+        otherwise combines the Lagrange basis along a subproduct tree of the points.
+        In both cases, the denominators are inverted at once by batch inversion"""
+        if base_field.characteristic == 0:
+            raise NotImplementedError(f'Cannot interpolate polynomials over {base_field}')
+        if len(points) != len(values):
+            raise ValueError('There must be as many values as points')
+
+        points = [base_field.element(k) for k in points]
+        values = [base_field.element(v) for v in values]
+        if len(set(points)) != len(points):
+            raise ValueError('Interpolation points must be distinct')
+
+        if len(points) == 0:
+            return Polynomial([], base_field=base_field, indeterminate=indeterminate)
+
+        if len(points) < Polynomial.subproduct_tree_threshold:
+            res = Polynomial._newton_interpolation(points, values, base_field)
+        else:
+            tree = SubproductTree(points, base_field)
+            weights = batch_inverse(tree.remainders(tree.root.formal_derivative()), base_field)
+            res = tree.linear_combination([v * w for v, w in zip(values, weights)])
+
+        if res.indeterminate != indeterminate:
+            res = Polynomial(res.coefficients, base_field=base_field, indeterminate=indeterminate)
+        return res
+
     @property
     def internal(self) -> Dict[int, BaseNumber]:
         """Returns the coefficients as a `dict` indexed by their degree.
@@ -192,6 +273,16 @@ class Polynomial:
         Eschews null terms"""
         return dict({deg: c for deg, c in self._coefficients.items()})
 
+    def inverse_mod(self, modulo: 'Polynomial') -> 'Polynomial':
+        """Returns the inverse of the polynomial in the quotient ring `K[X]/(modulo)`
+        i.e. the polynomial `u` of degree less than `modulo.degree` such that `u * self % modulo == 1`
+
+        Raises `ValueError` if the polynomial and `modulo` are not coprime"""
+        g, s, _ = self.xgcd(modulo)
+        if g.is_null or g.degree > 0:
+            raise ValueError(f'{self} is not invertible modulo {modulo}')
+        return (s / g.leading) % modulo
+
     @property
     def is_abs_unit(self) -> bool:
         """Returns `True` if the polynomial is a constant of constant term 1 or -1"""
@@ -210,12 +301,12 @@ class Polynomial:
     @property
     def is_monic(self) -> bool:
         """Returns `True` if the leading coefficient is one"""
-        return self._coefficients[self.degree] == self.base_field.one
+        return self.leading == self.base_field.one
 
     @property
     def is_null(self) -> bool:
         """Returns `True` if all coefficients are zero"""
-        return len(self._coefficients.keys()) == 0
+        return len(self._coefficients) == 0
 
     @property
     def is_unit(self) -> bool:
@@ -226,7 +317,7 @@ class Polynomial:
     def leading(self) -> BaseNumber:
         """Returns the value of the coefficient of the term of highest degree"""
         if not self.is_null:
-            return self._coefficients[self.degree]
+            return self._coefficients[self._degree]
         else:
             return self.base_field.zero
 
@@ -235,30 +326,33 @@ class Polynomial:
 
         Be careful if the coefficients are from a ring"""
 
-        quotient = self.null
-        remainder = self.copy
-        while remainder != self.null and remainder.degree >= divisor.degree:
-            deg = remainder.degree - divisor.degree
-            if remainder.leading % divisor.leading == self.base_field.zero:
-                c = remainder.leading // divisor.leading
-            else:
-                raise ValueError(f'{remainder.leading} is not divisible by {divisor.leading}')
+        if divisor.is_null:
+            raise ZeroDivisionError('Polynomial division by the null polynomial')
 
-            if deg == 0:
-                poly = self.unit.mul_constant(c)
+        zero = self.base_field.zero
+        divisor_degree, divisor_leading = divisor.degree, divisor.leading
+        quotient = PolynomialBuilder(self.base_field, indeterminate=self.indeterminate)
+        remainder = PolynomialBuilder(self.base_field, indeterminate=self.indeterminate, poly=self)
+        for deg in range(self.degree, divisor_degree - 1, -1):
+            leading = remainder[deg]
+            if leading == zero:
+                continue
+            if leading % divisor_leading == zero:
+                c = leading // divisor_leading
             else:
-                poly = self.monic(deg).mul_constant(c)
-            quotient += poly
-            remainder -= (divisor * poly)
+                raise ValueError(f'{leading} is not divisible by {divisor_leading}')
 
-        return quotient, remainder
+            quotient.iadd_term(deg - divisor_degree, c)
+            remainder.isub_scaled_shift(divisor, c, deg - divisor_degree)
+
+        return quotient.freeze(), remainder.freeze()
 
     def long_division_reversed(self, divisor: 'Polynomial') -> Tuple['Polynomial', 'Polynomial']:
         """Defines the long division according to increasing degrees"""
 
         quotient = self.null
         remainder = self
-        while remainder != self.null and remainder.valuation <= divisor.degree:
+        while not remainder.is_null and remainder.valuation <= divisor.degree:
 
             deg = remainder.valuation - divisor.valuation
             if remainder.trailing % divisor.trailing == 0:
@@ -296,39 +390,41 @@ class Polynomial:
 
     def monic(self, degree: int = 1) -> 'Polynomial':
         """Returns a monic polynomial with a single term of a given degree"""
-        res = self.null
-        res._set_term(degree, self.base_field.one)
-        return res
+        return self._new({degree: self.base_field.one})
 
     def mul(self, poly: 'Polynomial') -> 'Polynomial':
         """Multiplication in a ring of polynomials"""
         if poly.is_null or self.is_null:
             return self.null
 
-        res = self.null
-        for deg_p, c_p in poly.internal.items():
-            a = self._coefficients
+        terms = dict()
+        a = self._coefficients
+        for deg_p, c_p in poly._coefficients.items():
             for deg_a, c_a in a.items():
                 deg = deg_a + deg_p
-                if deg in res._coefficients.keys():
-                    res._set_term(deg, res[deg] + c_p * c_a)
+                if deg in terms:
+                    terms[deg] = terms[deg] + c_p * c_a
                 else:
-                    res._set_term(deg, c_p * c_a)
+                    terms[deg] = c_p * c_a
 
-        return res
+        zero = self.base_field.zero
+        return self._new({deg: c for deg, c in terms.items() if c != zero})
 
     def mul_constant(self, k: BaseNumber) -> 'Polynomial':
         """External multiplication (vector space external product) of a polynomial and a constant"""
-        s = self.null
-        if k != self.base_field.zero:
+        zero = self.base_field.zero
+        terms = dict()
+        if k != zero:
             for deg, c in self._coefficients.items():
-                s._set_term(deg, k * c)
-        return s
+                c = k * c
+                if c != zero:
+                    terms[deg] = c
+        return self._new(terms)
 
     @property
     def null(self) -> 'Polynomial':
         """Returns the null polynomial"""
-        return Polynomial([], base_field=self.base_field, indeterminate=self.indeterminate)
+        return self._new(dict())
 
     @staticmethod
     def parse(expr: str, base_field: BaseField, indeterminate: Optional[str] = 'X') -> 'Polynomial':
@@ -336,9 +432,17 @@ class Polynomial:
         """
         return symbolic_polynomial(expr, base_field, indeterminate=indeterminate)
 
-    def pow(self, n: int) -> 'Polynomial':
-        """Exponentiation of a polynomial"""
+    def pow(self, n: int, modulo: Optional['Polynomial'] = None) -> 'Polynomial':
+        """Exponentiation of a polynomial
+
+        If `modulo` is given, returns `self^n % modulo` by square and multiply, reducing every intermediate
+        product so that no polynomial of degree `2 * modulo.degree` or higher is ever built.
+        A negative `n` is then accepted and raises the inverse of the polynomial modulo `modulo`"""
+        if modulo is not None:
+            return self._pow_mod(n, modulo)
+
         assert n >= 0
+
         if self.is_unit:
             return self.unit
 
@@ -353,6 +457,48 @@ class Polynomial:
 
         return power(self.copy, n)
 
+    def roots(self) -> List[BaseNumber]:
+        """Returns the distinct roots of a polynomial over a finite field
+
+        The product of the linear factors is `gcd(self, X^q - X)` where `q` is the order of the field. It is then
+        split by random shifts: `gcd(g, (X + a)^((q-1)/2) - 1)` for an odd `q` and the gcd of `g` with the trace
+        `aX + (aX)^2 + ... + (aX)^(q/2)` for an even `q`. Only the splitting depends on the number of roots"""
+        if self.base_field.characteristic == 0:
+            raise NotImplementedError(f'Cannot find polynomial roots in {self.base_field}')
+        if self.is_null:
+            raise ValueError('The null polynomial vanishes everywhere')
+
+        q = self.base_field.order
+        f = self.make_monic()
+        if f.degree == 0:
+            return []
+        x = f.monic(1)
+        g = gcd(f, pow(x, q, f) - x)
+
+        roots = []
+        to_split = [g] if g.degree > 0 else []
+        while len(to_split) > 0:
+            g = to_split.pop()
+            if g.degree == 1:
+                roots.append(-g.constant)
+                continue
+            a = self.base_field.random_element()
+            if q % 2 != 0:
+                h = pow(x.add_constant(a), (q - 1) // 2, g) - g.unit
+            else:
+                t = x.mul_constant(a) % g
+                h = t
+                for _ in range(q.bit_length() - 2):
+                    t = (t * t) % g
+                    h = h + t
+            h = gcd(g, h)
+            if 0 < h.degree < g.degree:
+                to_split += [h, g / h]
+            else:
+                to_split.append(g)
+
+        return roots
+
     def sub(self, poly: 'Polynomial') -> 'Polynomial':
         """Returns the difference between two polynomials"""
         assert isinstance(poly, Polynomial)
@@ -365,7 +511,7 @@ class Polynomial:
         if self.is_null:
             return self.base_field.zero
         else:
-            return self._coefficients[self.valuation]
+            return self._coefficients[self._valuation]
 
     @property
     def unit(self) -> 'Polynomial':
@@ -378,30 +524,59 @@ class Polynomial:
         if self.is_null:
             raise ValueError('The valuation of the null polynomial is undefined')
 
-        return min(self._coefficients.keys())
+        return self._valuation
+
+    def xgcd(self, p: 'Polynomial') -> Tuple['Polynomial', 'Polynomial', 'Polynomial']:
+        """Extended euclidean algorithm.
+
+        Returns a tuple `(g, s, t)` where `g` is the GCD of the two polynomials and `s`, `t`
+        are Bézout cofactors such that `s * self + t * p == g`.
+        Over a field, `g` is monic. The half-GCD algorithm is only used to skip through the remainder
+        sequence if `Polynomial.half_gcd_threshold` is set, as long as the degrees are at least this threshold"""
+        a, b = self, p
+        m00, m01, m10, m11 = self.unit, self.null, self.null, self.unit
+        if a.degree < b.degree:
+            a, b = b, a
+            m00, m01, m10, m11 = m10, m11, m00, m01
+
+        threshold = self.half_gcd_threshold if self.base_field.characteristic > 0 else None
+        while not b.is_null:
+            if threshold is not None and a.degree > b.degree >= threshold:
+                h00, h01, h10, h11 = a._half_gcd_matrix(b)
+                a, b = h00 * a + h01 * b, h10 * a + h11 * b
+                m00, m01, m10, m11 = (h00 * m00 + h01 * m10, h00 * m01 + h01 * m11,
+                                      h10 * m00 + h11 * m10, h10 * m01 + h11 * m11)
+                if b.is_null:
+                    break
+
+            q, r = a.long_division(b)
+            a, b = b, r
+            m00, m01, m10, m11 = m10, m11, m00 - q * m10, m01 - q * m11
+
+        if self.base_field.characteristic > 0 and not a.is_null and not a.is_monic:
+            k = self.base_field.one / a.leading
+            return a.mul_constant(k), m00.mul_constant(k), m01.mul_constant(k)
+
+        return a, m00, m01
 
     def __eq__(self, other: Operand) -> bool:
         """Term-wise comparison of two polynomials"""
         if isinstance(other, Polynomial):
-            if self.degree == other.degree:
-
-                if self.is_null or other.is_null:
-                    return self.is_null and other.is_null
-
-                a = self.coefficients
-                b = other.coefficients
-
-                assert len(a) == len(b)
-                return a == b
-            else:
+            if self._degree != other._degree or len(self._coefficients) != len(other._coefficients):
                 return False
+
+            b = other._coefficients
+            for deg, c in self._coefficients.items():
+                if deg not in b or b[deg] != c:
+                    return False
+            return True
         else:
             other = self(other)
             return self == other
 
     def __getitem__(self, degree: int) -> BaseNumber:
         """Returns the coefficient of the term of a given degree"""
-        if degree in self._coefficients.keys():
+        if degree in self._coefficients:
             return self._coefficients[degree]
         else:
             return self.base_field.zero
@@ -423,11 +598,7 @@ class Polynomial:
 
     def __neg__(self) -> 'Polynomial':
         """Returns the inverse of a polynomial with respect to addition"""
-        a = self._coefficients
-        s = self.null
-        for deg, c in a.items():
-            s._set_term(deg, -c)
-        return s
+        return self._new({deg: -c for deg, c in self._coefficients.items()})
 
     def __mul__(self, other: Operand) -> 'Polynomial':
         if isinstance(other, Polynomial):
@@ -449,11 +620,13 @@ class Polynomial:
             return self.sub(other)
 
     def __pow__(self, n: int, modulo: 'Polynomial' = None) -> 'Polynomial':
-        return self.pow(n)
+        return self.pow(n, modulo)
 
     def __hash__(self) -> int:
         """Allows a polynomial to become a dictionary key"""
-        return hash(tuple(self._coefficients.items()))
+        if self._hash is None:
+            self._hash = hash(tuple(sorted(self._coefficients.items())))
+        return self._hash
 
     def __truediv__(self, other: Operand) -> 'Polynomial':
         return self.__floordiv__(other)
@@ -471,6 +644,12 @@ class Polynomial:
     def __mod__(self, other: Operand) -> 'Polynomial':
         return self.long_division(other)[1]
 
+    def __reduce__(self):
+        """Pickles the non null terms with their coefficients as integers, or vectors of integers over finite fields,
+        turned back into elements by the base field"""
+        terms = [(deg, _raw_coefficient(c)) for deg, c in self._coefficients.items()]
+        return _unpickle_polynomial, (self.base_field, self.indeterminate, terms)
+
     def __repr__(self) -> str:
         s = f'{repr(self.base_field)}.polynomial('
         s += f'{", ".join([repr(c) for c in self.coefficients])}, '
@@ -505,6 +684,50 @@ class Polynomial:
 
     # Gory Details (as usual)
 
+    def _cache_metadata(self):
+        terms = self._coefficients
+        if len(terms) > 0:
+            self._degree, self._valuation = max(terms), min(terms)
+        else:
+            self._degree, self._valuation = 0, None
+        self._hash = None
+
+    def _euclid_gcd(self, p: 'Polynomial') -> 'Polynomial':
+        a, b = self, p
+        while not b.is_null:
+            a, b = b, a % b
+        return a
+
+    def _half_gcd_matrix(self, p: 'Polynomial') -> Tuple['Polynomial', 'Polynomial', 'Polynomial', 'Polynomial']:
+        """Half-GCD of `self` and `p` where `self.degree > p.degree`.
+
+        Returns a matrix `M = (m00, m01, m10, m11)` of the remainder sequence such that
+        `(c, d) = (m00 * self + m01 * p, m10 * self + m11 * p)` satisfies `deg c >= m > deg d`
+        with `m = ceil(self.degree / 2)`"""
+        a, b = self, p
+        m = (a.degree + 1) // 2
+        if b.is_null or b.degree < m:
+            return a.unit, a.null, a.null, a.unit
+
+        r00, r01, r10, r11 = a._shift_right(m)._half_gcd_matrix(b._shift_right(m))
+        c, d = r00 * a + r01 * b, r10 * a + r11 * b
+        if d.is_null or d.degree < m:
+            return r00, r01, r10, r11
+
+        q, e = c.long_division(d)
+        r00, r01, r10, r11 = r10, r11, r00 - q * r10, r01 - q * r11
+        if e.is_null or e.degree < m:
+            return r00, r01, r10, r11
+
+        k = 2 * m - d.degree
+        s00, s01, s10, s11 = d._shift_right(k)._half_gcd_matrix(e._shift_right(k))
+        return (s00 * r00 + s01 * r10, s00 * r01 + s01 * r11,
+                s10 * r00 + s11 * r10, s10 * r01 + s11 * r11)
+
+    def _shift_right(self, k: int) -> 'Polynomial':
+        """Returns the quotient of the polynomial by `X^k`"""
+        return Polynomial(self.coefficients[k:], base_field=self.base_field, indeterminate=self.indeterminate)
+
     def _format_coefficient(self, c: BaseNumber, display_plus_sign: bool = False, raw: bool = False) -> str:
         sf = ''
         if isinstance(c, int):
@@ -550,6 +773,55 @@ class Polynomial:
                             sf += sc
         return sf
 
+    @staticmethod
+    def _from_terms(terms: Dict[int, BaseNumber], base_field: BaseField, indeterminate: Optional[str] = 'X') \
+            -> 'Polynomial':
+        """Returns a polynomial from a `dict` of non null terms indexed by their degree.
+        The `dict` is not copied and must not be altered afterwards"""
+        poly = Polynomial.__new__(Polynomial)
+        poly.base_field = base_field
+        poly.indeterminate = indeterminate
+        poly._coefficients = terms
+        poly._cache_metadata()
+        return poly
+
+    def _new(self, terms: Dict[int, BaseNumber]) -> 'Polynomial':
+        """Same as `Polynomial._from_terms` over the same field and in the same indeterminate"""
+        return Polynomial._from_terms(terms, self.base_field, self.indeterminate)
+
+    @staticmethod
+    def _newton_interpolation(points: Sequence[BaseNumber], values: Sequence[BaseNumber],
+                              base_field: BaseField) -> 'Polynomial':
+        n = len(points)
+        differences = list(values)
+        coefficients = [differences[0]]
+        for k in range(1, n):
+            denominators = batch_inverse([points[i + k] - points[i] for i in range(n - k)], base_field)
+            differences = [(differences[i + 1] - differences[i]) * denominators[i] for i in range(n - k)]
+            coefficients.append(differences[0])
+
+        res = Polynomial([coefficients[-1]], base_field=base_field)
+        for k in range(n - 2, -1, -1):
+            res = res * base_field.linear_polynomial(points[k]) + coefficients[k]
+        return res
+
+    def _pow_mod(self, n: int, modulo: 'Polynomial') -> 'Polynomial':
+        if modulo.is_null:
+            raise ZeroDivisionError('Polynomial modulo by the null polynomial')
+
+        result = self.unit % modulo
+        if n < 0:
+            base, n = self.inverse_mod(modulo), -n
+        else:
+            base = self % modulo
+        while n > 0:
+            if n % 2 != 0:
+                result = (result * base) % modulo
+            n //= 2
+            if n > 0:
+                base = (base * base) % modulo
+        return result
+
     def _remove_trailing_zeros(self, seq: Sequence) -> Collection:
         if len(seq) == 0:
             return []
@@ -565,12 +837,218 @@ class Polynomial:
         bf = self.base_field
         return dict({deg: bf.element(c) for deg, c in enumerate(seq) if c != bf.zero})
 
-    def _set_term(self, deg: int, c: BaseNumber):
-        if c == self.base_field.zero:
-            if deg in self._coefficients.keys():
-                del self._coefficients[deg]
+
+class PolynomialBuilder:
+    """Mutable buffer of terms to accumulate a polynomial in place, e.g. in the inner loop of a division,
+    before freezing it into an immutable `Polynomial`
+    """
+
+    def __init__(self, base_field: BaseField, indeterminate: Optional[str] = 'X', poly: Optional[Polynomial] = None):
+        """`base_field` is the field the coefficients are drawn from, `indeterminate` the indeterminate of the
+        resulting polynomial and `poly` an optional polynomial whose terms initialize the buffer
+        """
+        self.base_field = base_field
+        self.indeterminate = indeterminate
+        self._zero = base_field.zero
+        self._one = base_field.one
+        self._terms = dict() if poly is None else poly.internal
+
+    def freeze(self) -> Polynomial:
+        """Returns the polynomial accumulated so far. The builder remains usable afterwards"""
+        return Polynomial._from_terms(dict(self._terms), self.base_field, self.indeterminate)
+
+    def iadd_scaled_shift(self, poly: Polynomial, c: BaseNumber, shift: int = 0) -> 'PolynomialBuilder':
+        """Adds `c * X^shift * poly` in place"""
+        if c == self._one:
+            for deg, a in poly._coefficients.items():
+                self.iadd_term(deg + shift, a)
+        else:
+            for deg, a in poly._coefficients.items():
+                self.iadd_term(deg + shift, c * a)
+        return self
+
+    def iadd_term(self, degree: int, c: BaseNumber) -> 'PolynomialBuilder':
+        """Adds `c * X^degree` in place"""
+        terms = self._terms
+        if degree in terms:
+            c = terms[degree] + c
+        if c == self._zero:
+            terms.pop(degree, None)
         else:
-            self._coefficients[deg] = c
+            terms[degree] = c
+        return self
+
+    @property
+    def is_null(self) -> bool:
+        """Returns `True` if all the terms accumulated so far are zero"""
+        return len(self._terms) == 0
+
+    def isub_scaled_shift(self, poly: Polynomial, c: BaseNumber, shift: int = 0) -> 'PolynomialBuilder':
+        """Subtracts `c * X^shift * poly` in place"""
+        return self.iadd_scaled_shift(poly, -c, shift)
+
+    def __getitem__(self, degree: int) -> BaseNumber:
+        """Returns the coefficient of the term of a given degree accumulated so far"""
+        return self._terms.get(degree, self._zero)
+
+
+class FrobeniusMatrix:
+    """Matrix of the Frobenius map `a -> a^q` in the quotient ring `K[X]/(modulus)` where `q` is the order
+    of the finite field `K`
+
+    Row `i` is `X^(q*i) % modulus`. Since `c^q = c` for any element `c` of `K`, the q-th power of
+    `a = sum(a_i * X^i)` is `sum(a_i * row_i)`. Once the matrix is computed, a q-th power modulo `modulus` costs
+    a single matrix-vector product instead of a modular exponentiation.
+
+    When the modulus is sparse, reducing `sum(a_i * X^(q*i))` modulo `modulus` is cheaper than the matrix-vector
+    product: the rows are then never computed.
+
+    Matrices are cached per modulus by `FrobeniusMatrix.of`
+    """
+
+    cache_size = 32
+    """Maximum number of matrices kept in cache by `FrobeniusMatrix.of`"""
+
+    _cache = OrderedDict()
+    _cache_lock = Lock()
+
+    def __init__(self, modulus: Polynomial):
+        """`modulus` is a polynomial of degree at least 1 over a finite field"""
+        assert modulus.degree > 0 and modulus.base_field.characteristic > 0
+        self.modulus = modulus
+        self.order = modulus.base_field.order
+        self._rows = None
+
+    @classmethod
+    def of(cls, modulus: Polynomial) -> 'FrobeniusMatrix':
+        """Returns the Frobenius matrix of a modulus, computes it only if it is not in cache already"""
+        key = repr(modulus)
+        with cls._cache_lock:
+            matrix = cls._cache.get(key)
+            if matrix is not None:
+                cls._cache.move_to_end(key)
+                return matrix
+            # the rows are computed lazily, outside of the lock
+            matrix = cls._cache[key] = cls(modulus)
+            while len(cls._cache) > cls.cache_size:
+                cls._cache.popitem(last=False)
+        return matrix
+
+    def power(self, a: Polynomial, k: int = 1) -> Polynomial:
+        """Returns `a^(q^k) % modulus` by `k` matrix-vector products"""
+        modulus = self.modulus
+        if a.degree >= modulus.degree:
+            a = a % modulus
+        if self.is_sparse:
+            for _ in range(k):
+                a = a._new({deg * self.order: c for deg, c in a._coefficients.items()}) % modulus
+            return a
+
+        rows = self.rows
+        for _ in range(k):
+            res = PolynomialBuilder(modulus.base_field, indeterminate=modulus.indeterminate)
+            for deg, c in a._coefficients.items():
+                res.iadd_scaled_shift(rows[deg], c)
+            a = res.freeze()
+        return a
+
+    @property
+    def is_sparse(self) -> bool:
+        """Returns `True` if a reduction modulo `modulus` costs less than a matrix-vector product, that is if
+        `(q - 1) * w < n` where `w` is the number of terms and `n` the degree of the modulus"""
+        return (self.order - 1) * len(self.modulus._coefficients) < self.modulus.degree
+
+    @property
+    def rows(self) -> List[Polynomial]:
+        """Returns the rows of the matrix, computed on first access"""
+        if self._rows is None:
+            modulus = self.modulus
+            x_q = pow(modulus.monic(1), self.order, modulus)
+            row = modulus.unit
+            self._rows = [row]
+            for _ in range(1, modulus.degree):
+                row = (row * x_q) % modulus
+                self._rows.append(row)
+        return self._rows
+
+
+class SubproductTree:
+    """Subproduct tree of the linear polynomials `X - k` for a sequence of points `k`
+
+    The leaves are the linear polynomials, every node is the product of its two children and the root is
+    the product of all the leaves. The tree is stored level by level, from the leaves up to the root"""
+
+    def __init__(self, points: Sequence[BaseNumber], base_field: BaseField):
+        assert len(points) > 0
+        self.base_field = base_field
+        self.points = [base_field.element(k) for k in points]
+
+        level = [base_field.linear_polynomial(k) for k in self.points]
+        self.levels = [level]
+        while len(level) > 1:
+            level = [level[i] * level[i + 1] if i + 1 < len(level) else level[i] for i in range(0, len(level), 2)]
+            self.levels.append(level)
+
+    @property
+    def root(self) -> Polynomial:
+        """Returns the product of all the linear polynomials `X - k`"""
+        return self.levels[-1][0]
+
+    def remainders(self, p: Polynomial) -> List[BaseNumber]:
+        """Returns the remainders of `p` modulo each linear polynomial `X - k` that is the values of `p` at the points"""
+        remainders = [p % self.root]
+        for level in reversed(self.levels[:-1]):
+            remainders = [remainders[i // 2] % node for i, node in enumerate(level)]
+        return [r.constant for r in remainders]
+
+    def linear_combination(self, coefficients: Sequence[BaseNumber]) -> Polynomial:
+        """Returns the sum of `c * root / (X - k)` for each coefficient `c` and its matching point `k`"""
+        assert len(coefficients) == len(self.points)
+        combination = [Polynomial([c], base_field=self.base_field) for c in coefficients]
+        for level in self.levels[:-1]:
+            combination = [combination[i] * level[i + 1] + combination[i + 1] * level[i]
+                           if i + 1 < len(level) else combination[i]
+                           for i in range(0, len(level), 2)]
+        return combination[0]
+
+
+def batch_inverse(elements: Sequence[BaseNumber], base_field: BaseField) -> List[BaseNumber]:
+    """Returns the multiplicative inverses of several field elements with a single field inversion
+    (Montgomery's trick)"""
+    if len(elements) == 0:
+        return []
+
+    prefix = [base_field.one]
+    for e in elements:
+        prefix.append(prefix[-1] * e)
+
+    inverse = base_field.one / prefix[-1]
+    res = [base_field.zero] * len(elements)
+    for i in range(len(elements) - 1, -1, -1):
+        res[i] = inverse * prefix[i]
+        inverse = inverse * elements[i]
+    return res
+
+
+def _raw_coefficient(c: BaseNumber) -> Any:
+    """Returns the integer value of an element of a prime field, the vector of integer values of an element
+    of a finite field, the element itself otherwise"""
+    if not hasattr(c, 'field'):
+        return c
+    if hasattr(c, 'vector'):
+        return tuple(int(v) for v in c.vector)
+    return int(c)
+
+
+def _unpickle_polynomial(base_field: BaseField, indeterminate: str, terms: Sequence[Tuple[int, Any]]) -> Polynomial:
+    def element(c):
+        if isinstance(c, int):
+            return base_field.element(c)
+        if isinstance(c, tuple):
+            return base_field.element(list(c))
+        return c
+
+    return Polynomial._from_terms({deg: element(c) for deg, c in terms}, base_field, indeterminate)
 
 
 def symbolic_polynomial(expression: str, base_field: BaseField, indeterminate: Optional[str] = 'X'):
@@ -584,6 +1062,39 @@ def symbolic_polynomial(expression: str, base_field: BaseField, indeterminate: O
     return PolynomialParser.parse(expression, base_field, indeterminate=indeterminate)
 
 
+def parse_stream(file: TextIO, base_field: BaseField, indeterminate: Optional[str] = 'X',
+                 workers: Optional[int] = None, chunk_size: int = 1024) -> Iterator[Union[Polynomial, SyntaxError]]:
+    """Parses a text file with one algebraic expression per line and yields, in the order of the lines,
+    either the polynomial of each line or a `SyntaxError` whose `lineno` and `text` locate the invalid line.
+    Blank lines are skipped.
+
+    Lines are read lazily. If `workers` is greater than 1, chunks of `chunk_size` lines are parsed by a process pool
+    of `workers` processes, with at most `2 * workers` chunks in flight, so that memory stays bounded whatever
+    the size of the file"""
+    assert chunk_size > 0
+    filename = getattr(file, 'name', None)
+    lines = enumerate(file, start=1)
+    if workers is None or workers <= 1:
+        yield from PolynomialParser.parse_lines(lines, base_field, indeterminate, filename)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        while True:
+            chunk = list(islice(lines, chunk_size))
+            if len(chunk) > 0:
+                pending.append(executor.submit(_parse_chunk, chunk, base_field, indeterminate, filename))
+            if len(pending) == 0:
+                break
+            if len(chunk) == 0 or len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+
+
+def _parse_chunk(lines: List[Tuple[int, str]], base_field: BaseField, indeterminate: str,
+                 filename: Optional[str]) -> List[Union[Polynomial, SyntaxError]]:
+    return list(PolynomialParser.parse_lines(lines, base_field, indeterminate, filename))
+
+
 """Lexer et Parser code follows, should not be exported"""
 
 
@@ -600,6 +1111,8 @@ class Lexer:
     class Token(namedtuple('Token', 'type, value, position')):
         __slots__ = ()
 
+    _cache = dict()
+
     def __init__(self, indeterminate: Optional[str] = 'X', root_symbol: Optional[str] = 'j'):
         self.indeterminate = indeterminate
         self.root_symbol = root_symbol
@@ -614,18 +1127,28 @@ class Lexer:
             (Lexer.IGNORE, r'\s'),  # must stay before the last item
             (Lexer.MISMATCH, r'.')  # must stay the last item
         ]
-        self.tokens_re = '|'.join([f'(?P<{tok}>{re})' for tok, re in self.symbols])
+        self.tokens_re = '|'.join([f'(?P<{tok}>{regex})' for tok, regex in self.symbols])
+        self._pattern = re.compile(self.tokens_re)
+
+    @classmethod
+    def of(cls, indeterminate: Optional[str] = 'X', root_symbol: Optional[str] = 'j') -> 'Lexer':
+        """Returns the lexer of an indeterminate and a root symbol, compiled on first request only"""
+        key = indeterminate, root_symbol
+        lexer = cls._cache.get(key)
+        if lexer is None:
+            lexer = cls._cache.setdefault(key, cls(indeterminate, root_symbol))
+        return lexer
 
     def lex(self, expression: str) -> Iterator['Lexer.Token']:
 
-        for tok in finditer(self.tokens_re, expression):
+        for tok in self._pattern.finditer(expression):
             token = Lexer.Token(tok.lastgroup, tok.group(), tok.start())
 
             if token.type == Lexer.IGNORE:
                 continue
             elif token.type == Lexer.SUBEXPR:
                 # remove left and right parentheses
-                lexer = Lexer(indeterminate=self.root_symbol, root_symbol='')
+                lexer = Lexer.of(indeterminate=self.root_symbol, root_symbol='')
                 yield Lexer.Token(token.type, lexer.lex(token.value[1:-1], ), token.position)
 
             elif token.type == Lexer.INTEGER:
@@ -642,12 +1165,19 @@ class Lexer:
 
 
 class ParsingContext:
+    """Terms are accumulated in a `PolynomialBuilder`, frozen into a polynomial once the expression is parsed"""
+
     def __init__(self, base_field: BaseField, indeterminate: str):
         self.base_field = base_field
         self.indeterminate = indeterminate
 
         self._stack = []
-        self._stack.append(self.base_field.polynomial(self.base_field.zero, indeterminate=self.indeterminate))
+        self._subexpression_context = None
+        self.reset()
+
+    def reset(self):
+        """Clears the context before parsing another expression"""
+        self._stack = [PolynomialBuilder(self.base_field, indeterminate=self.indeterminate)]
 
     def accumulate_neutral(self, *_):
         self._stack.append(self.base_field.neutral)
@@ -662,21 +1192,29 @@ class ParsingContext:
         self._stack.append(v)
 
     def accumulate_subexpression(self, tok: Lexer.Token, *_):
+        if not hasattr(self.base_field, 'prime_field'):
+            raise SyntaxError(f'Syntax error at {tok.position}: unexpected sub-expression over {self.base_field}')
+
         def convert_subexpr(subexpr):
-            ctx = ParsingContext(self.base_field.prime_field, indeterminate=self.base_field.root_symbol)
+            if self._subexpression_context is None:
+                self._subexpression_context = ParsingContext(self.base_field.prime_field,
+                                                             indeterminate=self.base_field.root_symbol)
+            ctx = self._subexpression_context
+            ctx.reset()
             return self.base_field.element_from_polynomial(PolynomialParser.start(subexpr, ctx))
 
         self._stack.append(convert_subexpr(tok.value))
 
     def reduce(self, *_):
         try:
-            (result, op, coefficient, degree), self._stack = self._stack[-4:], self._stack[:-4]
-            self._stack.append(op(result, result.monic(degree).mul_constant(coefficient)))
+            builder, op, coefficient, degree = self._stack[-4:]
+            del self._stack[-3:]
+            builder.iadd_term(degree, coefficient if op is operator.add else -coefficient)
         except BaseException as e:
             raise RuntimeError(e)
 
     def get_result(self) -> 'Polynomial':
-        return self._stack.pop()
+        return self._stack.pop().freeze()
 
 
 class PolynomialParser:
@@ -684,14 +1222,28 @@ class PolynomialParser:
     @staticmethod
     def parse(expression: str, base_field: BaseField, indeterminate: Optional[str] = 'X'):
         """Main parsing utility"""
-        if hasattr(base_field, 'root_symbol'):
-            lexer = Lexer(indeterminate=indeterminate, root_symbol=base_field.root_symbol)
-        else:
-            lexer = Lexer(indeterminate=indeterminate, root_symbol='')
+        lexer = Lexer.of(indeterminate=indeterminate, root_symbol=getattr(base_field, 'root_symbol', ''))
 
         ctx = ParsingContext(base_field, indeterminate)
         return PolynomialParser.start(lexer.lex(expression), ctx)
 
+    @staticmethod
+    def parse_lines(lines: Iterable[Tuple[int, str]], base_field: BaseField, indeterminate: Optional[str] = 'X',
+                    filename: Optional[str] = None) -> Iterator[Union[Polynomial, SyntaxError]]:
+        """Parses numbered lines with a single lexer and parsing context, yields a polynomial per non blank line
+        or a `SyntaxError` located at the line"""
+        lexer = Lexer.of(indeterminate=indeterminate, root_symbol=getattr(base_field, 'root_symbol', ''))
+        ctx = ParsingContext(base_field, indeterminate)
+        for line_number, line in lines:
+            expression = line.strip()
+            if len(expression) == 0:
+                continue
+            ctx.reset()
+            try:
+                yield PolynomialParser.start(lexer.lex(expression), ctx)
+            except (SyntaxError, ValueError, RuntimeError) as e:
+                yield SyntaxError(str(e), (filename, line_number, None, expression))
+
     @staticmethod
     def start(lexer: Iterator, context: ParsingContext) -> Polynomial:
 
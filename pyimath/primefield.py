@@ -1,13 +1,16 @@
-from typing import Iterator, Tuple, Union, Any, List, Dict
+from array import array
+from collections.abc import Mapping
+from typing import Iterator, Tuple, Union, Any, List, Dict, Sequence
 import random
 import operator
 
 from pyimath.functions import maybe_prime, power
 from pyimath.polynomial import Polynomial, symbolic_polynomial
+from pyimath.tables import default_table_cache
 
 
 AdditiveGroup = List[int]
-MultiplicativeGroup = Dict[Tuple[int, int], Union[int, List[int]]]
+MultiplicativeGroup = Dict[Tuple[int, int], Union[int, Dict[int, int]]]
 
 
 __all__ = ['PrimeField', 'PFElement']
@@ -19,10 +22,16 @@ class PrimeField:
        The field elements are not represented by integer modulo P
        but rather by signed integers in the range `-(P-1)/2..(P-1)/2`
        """
+
+    table_cache_min_order = 256
+    """Smallest characteristic from which the multiplication table is loaded from and stored into `table_cache`"""
+    table_cache = None
+    """`TableCache` of the multiplication tables, `tables.default_table_cache()` if `None`"""
+
     def __init__(self, prime: int):
         self.characteristic = prime
         self.additive_group = self._additive_group_representation(prime)
-        self.multiplicative_group = self._multiplicative_group_representation(self.additive_group)
+        self.multiplicative_group = self._cached_multiplicative_group()
 
     def add(self, a: 'PFElement', b: 'PFElement') -> 'PFElement':
         """Returns the sum of two elements
@@ -74,19 +83,15 @@ class PrimeField:
         the maximum number of attempts.
         """
         max_retries = max(degree // 2, max_retries)
-        tries = 0
         retries = 0
         while retries <= max_retries:
-            while tries <= degree:
-                coefficients = [self.random_element() for _ in range(degree)]
-                p = self.polynomial(coefficients)
-                p += p.monic(degree)
-
+            for _ in range(degree + 1):
+                p = self.random_polynomial(degree)
                 if p.is_irreducible:
                     return p
-                tries += 1
             retries += 1
-        err_msg = f'Could not find an irreducible polynomial of degree {degree} over {self} in {tries*retries} attempts'
+        err_msg = f'Could not find an irreducible polynomial of degree {degree} over {self} in ' \
+                  f'{(degree + 1) * (max_retries + 1)} attempts'
         raise RuntimeError(err_msg)
 
     def linear_polynomial(self, e: 'PFElement') -> Polynomial:
@@ -129,6 +134,12 @@ class PrimeField:
         """
         return self(1)
 
+    @property
+    def order(self) -> int:
+        """Returns the order of the field, that is its characteristic
+        """
+        return self.characteristic
+
     def parse_poly(self, expr: str) -> Polynomial:
         """Returns a polynomial from its symbolic expression
         """
@@ -189,6 +200,12 @@ class PrimeField:
         """
         return (self(n) for n in self.additive_group)
 
+    def __reduce__(self):
+        """Pickles the field by its characteristic, the unpickled field is the one of the registry of `finite_field`
+        """
+        from pyimath.finitefield import finite_field  # the finitefield module imports this one
+        return finite_field, (self.characteristic,)
+
     def __repr__(self) -> str:
         return f'{self.__class__.__name__}({self.characteristic})'
 
@@ -197,6 +214,28 @@ class PrimeField:
 
     """LOW LEVEL FIELD OPERATIONS"""
 
+    def _cached_multiplicative_group(self) -> MultiplicativeGroup:
+        """Returns the multiplication table read from the table cache, computes and stores it if it is not in cache.
+        Small fields do not use the cache"""
+        p = self.characteristic
+        if p < self.table_cache_min_order:
+            return self._multiplicative_group_representation(self.additive_group)
+
+        cache = self.table_cache if self.table_cache is not None else default_table_cache()
+        tables = cache.load('prime', [p])
+        if tables is not None:
+            return _MultiplicationTable(p, tables['products'], tables['inverses'])
+
+        group = self._multiplicative_group_representation(self.additive_group)
+        products, inverses = [0] * (p * p), [0] * p
+        for (a, b), v in group.items():
+            if a != 0:
+                products[(a % p) * p + b % p] = v
+        for a, v in group[(0, 0)].items():
+            inverses[a % p] = v
+        cache.store('prime', [p], dict(products=products, inverses=inverses))
+        return group
+
     @staticmethod
     def _additive_group_representation(p: int) -> AdditiveGroup:
         assert p >= 2  # indeed, p must be a prime
@@ -308,6 +347,7 @@ class PrimeField:
                             reciprocals[e] = f
                             reciprocals[f] = e
                             reciprocals[-e] = -f
+                            reciprocals[-f] = -e
                         if -v == 1:
                             reciprocals[-e] = f
                             reciprocals[f] = -e
@@ -362,6 +402,47 @@ class PrimeField:
         return PrimeField._pf_mul(a, _1_b, gr)
 
 
+class _MultiplicationTable(Mapping):
+    """Read-only view of the multiplication table of a prime field of characteristic `p` over buffers
+    of integers, that behaves as the `multiplicative_group` dict
+
+    `products[(a % p) * p + b % p]` is the product of two non null elements `a` and `b` and `inverses[a % p]` the
+    inverse of `a`. The key `(0, 0)` maps each non null element to its inverse"""
+
+    def __init__(self, p: int, products: Sequence[int], inverses: Sequence[int]):
+        self._p = p
+        self._products = products
+        self._inverses = inverses
+        self._reciprocals = {a: inverses[a % p] for a in range(-(p // 2), p // 2 + 1) if a != 0}
+
+    def __contains__(self, key: Any) -> bool:
+        a, b = key
+        bound = self._p // 2
+        return a == b == 0 or (a != 0 and b != 0 and -bound <= a <= bound and -bound <= b <= bound)
+
+    def __getitem__(self, key: Tuple[int, int]) -> Union[int, Dict[int, int]]:
+        if key not in self:
+            raise KeyError(key)
+        a, b = key
+        if a == 0:
+            return self._reciprocals
+        p = self._p
+        return self._products[(a % p) * p + b % p]
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        elements = list(self._reciprocals)
+        yield from ((a, b) for a in elements for b in elements)
+        yield 0, 0
+
+    def __len__(self) -> int:
+        return (self._p - 1) ** 2 + 1
+
+    def __reduce__(self):
+        # memory mapped buffers cannot be pickled, their content can
+        return self.__class__, (self._p, array(self._products.format, self._products),
+                                array(self._inverses.format, self._inverses))
+
+
 class PFElement:
     """Represents a single element from a prime field by, basically, duck-typing an integer
     """
@@ -477,6 +558,9 @@ class PFElement:
     def __radd__(self, other: Any) -> 'PFElement':
         return self.__add__(other)
 
+    def __reduce__(self):
+        return self.__class__, (self.field, self.value)
+
     def __repr__(self) -> str:
         return repr(int(self))
 
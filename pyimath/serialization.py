@@ -0,0 +1,332 @@
+import struct
+import sys
+from array import array
+from collections import namedtuple
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from pyimath.annotations import BaseField
+from pyimath.finitefield import FiniteField, _field_from_parameters, _field_parameters, finite_field
+from pyimath.integer import IntegerRing
+from pyimath.polynomial import Polynomial
+from pyimath.primefield import PrimeField
+
+__all__ = [
+    'decode',
+    'dump',
+    'dump_many',
+    'dumps',
+    'iter_decode',
+    'load',
+    'load_many',
+    'loads',
+    'Record',
+]
+
+FORMAT_VERSION = 1
+"""Version of the binary format of polynomials, records of another version are rejected"""
+
+MAX_CHARACTERISTIC = 2 ** 9
+"""Largest characteristic of the base field of a decoded record. Building a prime field takes time cubic in its
+characteristic (1.5 s for 509, 12 s for 1021), records over larger fields are rejected before the field is built"""
+
+MAX_FIELD_ORDER = 2 ** 12
+"""Largest order of the finite field of a decoded record (1.6 s to build a field of order 2048), records over
+larger fields are rejected before the field is built"""
+
+Record = namedtuple('Record', 'base_field indeterminate coefficients end')
+"""A decoded polynomial: its base field, its indeterminate, the flat sequence of the integer values of its
+coefficients and the offset of the next record in the buffer"""
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+def dumps(poly: Polynomial, varint: bool = False) -> bytes:
+    """Returns the binary encoding of a polynomial over the integers, a prime field or a finite field.
+
+    A record is made of:
+
+    * a prefix: magic `PYIP`, format version (uint8), kind of base field (`Z`, `P` or `F`), width of the coefficients
+      (uint8), size of the parameters and size of the coefficients in bytes (uint32 and uint64), all little-endian
+    * the parameters of the base field and the indeterminate, as varints and strings prefixed by their length
+    * the coefficients by increasing degree, the components of each coefficient over a finite field, either as signed
+      integers of the given width or as zigzag varints if the width is 0
+
+    The coefficients start on a multiple of 8 bytes from the start of the record and records are padded to
+    a multiple of 8 bytes, so that fixed width coefficients can be mapped without copy by `decode`.
+    Coefficients are fixed width integers unless `varint` is set or they do not fit in 64 bits
+    """
+    kind, params = _field_header(poly.base_field)
+    params += _encode_string(poly.indeterminate)
+    values = _raw_coefficients(poly)
+
+    bound = max((abs(v) for v in values), default=0)
+    width = 0 if varint or bound >= 2 ** 63 else next(w for w in (1, 2, 4, 8) if bound < 2 ** (8 * w - 1))
+    if width == 0:
+        data = b''.join(_encode_varint(_zigzag(v)) for v in values)
+    else:
+        coefficients = array(_TYPECODES[width], values)
+        if sys.byteorder == 'big':
+            coefficients.byteswap()
+        data = coefficients.tobytes()
+
+    head = _PREFIX.pack(_MAGIC, FORMAT_VERSION, kind, width, len(params), len(data)) + params
+    return _pad(head) + _pad(data)
+
+
+def loads(data: Buffer) -> Polynomial:
+    """Returns the polynomial encoded by `dumps`"""
+    record = decode(data)
+    return _polynomial(record)
+
+
+def dump(poly: Polynomial, file: BinaryIO, varint: bool = False):
+    """Writes the binary encoding of a polynomial to a binary file"""
+    file.write(dumps(poly, varint=varint))
+
+
+def load(file: BinaryIO) -> Polynomial:
+    """Reads a polynomial written by `dump` from a binary file"""
+    record = _read_record(file)
+    if record is None:
+        raise EOFError('No polynomial to read')
+    return _polynomial(record)
+
+
+def dump_many(polys: Iterable[Polynomial], file: BinaryIO, varint: bool = False) -> int:
+    """Writes the polynomials one after the other to a binary file and returns their number"""
+    count = 0
+    for poly in polys:
+        dump(poly, file, varint=varint)
+        count += 1
+    return count
+
+
+def load_many(file: BinaryIO) -> Iterator[Polynomial]:
+    """Yields the polynomials written by `dump_many` from a binary file, reading one record at a time"""
+    while True:
+        record = _read_record(file)
+        if record is None:
+            return
+        yield _polynomial(record)
+
+
+def decode(data: Buffer, offset: int = 0) -> Record:
+    """Decodes the record at a given offset of a buffer without building the polynomial.
+
+    Fixed width coefficients are returned as a `memoryview` of the buffer cast to the integer type,
+    without any copy, on little-endian platforms. Varint coefficients are decoded into a list"""
+    view = memoryview(data)
+    if view.format != 'B':
+        view = view.cast('B')
+    if len(view) - offset < _PREFIX.size:
+        raise ValueError('Truncated record')
+
+    magic, version, kind, width, params_size, data_size = _PREFIX.unpack_from(view, offset)
+    _check_prefix(magic, version, kind, width)
+    start = offset + _PREFIX.size
+    data_start = offset + _align(_PREFIX.size + params_size)
+    end = data_start + _align(data_size)
+    if end > len(view):
+        raise ValueError('Truncated record')
+
+    base_field, indeterminate = _parse_params(kind, view[start:start + params_size])
+    coefficients = _decode_coefficients(view[data_start:data_start + data_size], width)
+    return Record(base_field, indeterminate, coefficients, end)
+
+
+def iter_decode(data: Buffer) -> Iterator[Record]:
+    """Yields the records of a buffer holding polynomials written by `dump_many`, e.g. a memory mapped file"""
+    offset = 0
+    while offset < len(data):
+        record = decode(data, offset)
+        yield record
+        offset = record.end
+
+
+# Gory Details (as usual)
+
+_MAGIC = b'PYIP'
+_PREFIX = struct.Struct('<4sBcBxIQ')
+_TYPECODES = {array(t).itemsize: t for t in 'bhiq'}
+
+
+def _align(n: int) -> int:
+    return (n + 7) // 8 * 8
+
+
+def _pad(data: bytes) -> bytes:
+    return data + bytes(_align(len(data)) - len(data))
+
+
+def _check_prefix(magic: bytes, version: int, kind: bytes, width: int):
+    if magic != _MAGIC:
+        raise ValueError('Not a binary encoded polynomial')
+    if version != FORMAT_VERSION:
+        raise ValueError(f'Unsupported format version {version}')
+    if kind not in (b'Z', b'P', b'F'):
+        raise ValueError(f'Unknown kind of base field {kind!r}')
+    if width not in (0, 1, 2, 4, 8):
+        raise ValueError(f'Invalid width of coefficients {width}')
+
+
+def _field_header(base_field: BaseField) -> Tuple[bytes, bytes]:
+    if isinstance(base_field, IntegerRing):
+        return b'Z', b''
+    if isinstance(base_field, PrimeField):
+        return b'P', _encode_varint(base_field.characteristic)
+    if isinstance(base_field, FiniteField):
+        prime, dimension, ideal, generator, root_symbol = _field_parameters(base_field)
+        values = [prime, dimension] + [_zigzag(c) for c in ideal]
+        values += [0] if generator is None else [1] + [_zigzag(c) for c in generator]
+        return b'F', b''.join(_encode_varint(v) for v in values) + _encode_string(root_symbol)
+    raise TypeError(f'Cannot serialize polynomials over {base_field}')
+
+
+def _parse_params(kind: bytes, params: memoryview) -> Tuple[BaseField, str]:
+    reader = _Reader(params)
+    if kind == b'Z':
+        base_field = IntegerRing()
+    elif kind == b'P':
+        base_field = _prime_field(reader.varint(), 1)
+    else:
+        prime, dimension = reader.varint(), reader.varint()
+        prime_field = _prime_field(prime, dimension)
+        ideal = tuple(_unzigzag(reader.varint()) for _ in range(dimension + 1))
+        if dimension > 1:
+            _check_ideal(prime_field.polynomial(*ideal), dimension)
+        generator = None
+        if reader.varint():
+            generator = tuple(_unzigzag(reader.varint()) for _ in range(dimension))
+        base_field = _field_from_parameters(prime, dimension, ideal, generator, reader.string())
+    return base_field, reader.string()
+
+
+def _prime_field(prime: int, dimension: int) -> PrimeField:
+    # checks the order before building the prime field, a record may come from anywhere
+    if not 2 <= prime <= MAX_CHARACTERISTIC or dimension < 1 or dimension >= MAX_FIELD_ORDER.bit_length() \
+            or prime ** dimension > MAX_FIELD_ORDER:
+        raise ValueError(f'Invalid or too large field of characteristic {prime} and dimension {dimension}')
+    base_field = finite_field(prime)
+    if not isinstance(base_field, PrimeField):
+        raise ValueError(f'{base_field} is not a prime field')
+    return base_field
+
+
+def _check_ideal(ideal: Polynomial, dimension: int):
+    # FiniteField only asserts these properties
+    if ideal.degree != dimension or not ideal.is_monic:
+        raise ValueError(f'{ideal} is not a monic polynomial of degree {dimension}')
+    if not ideal.is_irreducible:
+        raise ValueError(f'{ideal} is not irreducible')
+
+
+def _raw_coefficients(poly: Polynomial) -> List[int]:
+    if poly.is_null:
+        return []
+    if isinstance(poly.base_field, FiniteField):
+        return [int(v) for c in poly.coefficients for v in c.vector]
+    return [int(c) for c in poly.coefficients]
+
+
+def _decode_coefficients(data: memoryview, width: int) -> Sequence[int]:
+    if width == 0:
+        reader = _Reader(data)
+        values = []
+        while not reader.at_end:
+            values.append(_unzigzag(reader.varint()))
+        return values
+
+    typecode = _TYPECODES[width]
+    if len(data) % width != 0:
+        raise ValueError('Truncated coefficients')
+    if sys.byteorder == 'big':
+        values = array(typecode)
+        values.frombytes(data)
+        values.byteswap()
+        return values
+    return data.cast(typecode)
+
+
+def _polynomial(record: Record) -> Polynomial:
+    base_field, values = record.base_field, record.coefficients
+    if isinstance(base_field, FiniteField):
+        n = base_field.dimension
+        if len(values) % n != 0:
+            raise ValueError(f'Coefficients are not vectors of dimension {n}')
+        coefficients = [base_field.element(list(values[i:i + n])) for i in range(0, len(values), n)]
+    else:
+        coefficients = [base_field.element(v) for v in values]
+    return Polynomial(coefficients, base_field=base_field, indeterminate=record.indeterminate)
+
+
+def _read_record(file: BinaryIO) -> Optional[Record]:
+    prefix = file.read(_PREFIX.size)
+    if len(prefix) == 0:
+        return None
+    if len(prefix) < _PREFIX.size:
+        raise ValueError('Truncated record')
+
+    magic, version, kind, width, params_size, data_size = _PREFIX.unpack(prefix)
+    _check_prefix(magic, version, kind, width)
+    rest_size = _align(_PREFIX.size + params_size) - _PREFIX.size + _align(data_size)
+    rest = file.read(rest_size)
+    if len(rest) < rest_size:
+        raise ValueError('Truncated record')
+    return decode(prefix + rest)
+
+
+def _encode_string(s: Optional[str]) -> bytes:
+    raw = b'' if s is None else s.encode('utf-8')
+    return _encode_varint(len(raw)) + raw
+
+
+def _encode_varint(n: int) -> bytes:
+    """Unsigned LEB128 encoding"""
+    out = bytearray()
+    while n >= 0x80:
+        out.append((n & 0x7f) | 0x80)
+        n >>= 7
+    out.append(n)
+    return bytes(out)
+
+
+def _zigzag(n: int) -> int:
+    return 2 * n if n >= 0 else -2 * n - 1
+
+
+def _unzigzag(n: int) -> int:
+    return n >> 1 if n & 1 == 0 else -((n + 1) >> 1)
+
+
+class _Reader:
+    """Sequential reader of varints and strings from a buffer"""
+
+    def __init__(self, data: memoryview):
+        self._data = data
+        self._pos = 0
+
+    @property
+    def at_end(self) -> bool:
+        return self._pos >= len(self._data)
+
+    def string(self) -> Optional[str]:
+        size = self.varint()
+        if size == 0:
+            return None
+        if self._pos + size > len(self._data):
+            raise ValueError('Truncated string')
+        s = bytes(self._data[self._pos:self._pos + size]).decode('utf-8')
+        self._pos += size
+        return s
+
+    def varint(self) -> int:
+        n, shift = 0, 0
+        while True:
+            if self._pos >= len(self._data):
+                raise ValueError('Truncated varint')
+            b = self._data[self._pos]
+            self._pos += 1
+            n |= (b & 0x7f) << shift
+            if b < 0x80:
+                return n
+            shift += 7
@@ -0,0 +1,145 @@
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from typing import Dict, Optional, Sequence
+
+__all__ = [
+    'cache_directory',
+    'default_table_cache',
+    'TableCache',
+]
+
+FORMAT_VERSION = 1
+"""Version of the binary format of the table files, files of another version are ignored"""
+
+Tables = Dict[str, memoryview]
+
+
+class TableCache:
+    """Cache of the precomputed tables of fields, one binary file per field in `directory`
+
+    A table is a named array of integers. On loading, the file is mapped in memory and each table is returned
+    as a read-only `memoryview` of the mapping, cast to its integer type: nothing is copied and the pages are
+    shared by all the processes that map the same file.
+
+    A file is made of a header, an index of the tables and their data, each aligned on 8 bytes:
+
+    * header: magic `PYIMTBL\\0`, format version (uint32), byte order (`<` or `>`), number of tables (uint32)
+    * index entry: name (16 bytes), typecode (1 byte), number of items (uint64), offset of the data (uint64)
+
+    The tables of a field are looked up by a key made of the parameters that define the field.
+    A `params` table holding these parameters is checked on loading
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def load(self, kind: str, params: Sequence[int]) -> Optional[Tables]:
+        """Returns the tables of a field given by its kind and its parameters, `None` if they are not in cache"""
+        try:
+            with open(self._path(kind, params), 'rb') as file:
+                mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+
+        try:
+            tables = self._read(mapping)
+        except (struct.error, ValueError, UnicodeDecodeError):
+            tables = None
+        if tables is None or list(tables.get('params', [])) != list(params):
+            return None
+        return tables
+
+    def store(self, kind: str, params: Sequence[int], tables: Dict[str, Sequence[int]]):
+        """Writes the tables of a field given by its kind and its parameters. Failures are silently ignored"""
+        tables = dict(tables, params=params)
+        arrays = {name: array(_typecode(values), values) for name, values in tables.items()}
+
+        header = struct.pack('=8sIc3xI', _MAGIC, FORMAT_VERSION, _BYTE_ORDER, len(arrays))
+        offset = _align(len(header) + len(arrays) * _INDEX_ENTRY.size)
+        index, data = [], []
+        for name, values in arrays.items():
+            index.append(_INDEX_ENTRY.pack(name.encode('ascii'), values.typecode.encode('ascii'), len(values), offset))
+            raw = values.tobytes()
+            data.append(raw + bytes(_align(len(raw)) - len(raw)))
+            offset += _align(len(raw))
+
+        content = header + b''.join(index)
+        content += bytes(_align(len(content)) - len(content)) + b''.join(data)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as file:
+                file.write(content)
+            os.replace(tmp_path, self._path(kind, params))
+        except OSError:
+            pass
+
+    # Gory Details (as usual)
+
+    def _path(self, kind: str, params: Sequence[int]) -> str:
+        digest = hashlib.sha1(','.join(str(v) for v in params).encode('ascii')).hexdigest()[:16]
+        return os.path.join(self.directory, f'{kind}-{digest}.tables')
+
+    @staticmethod
+    def _read(mapping: mmap.mmap) -> Optional[Tables]:
+        header_size = struct.calcsize('=8sIc3xI')
+        if len(mapping) < header_size:
+            return None
+        magic, version, byte_order, count = struct.unpack_from('=8sIc3xI', mapping)
+        if magic != _MAGIC or version != FORMAT_VERSION or byte_order != _BYTE_ORDER:
+            return None
+        if header_size + count * _INDEX_ENTRY.size > len(mapping):
+            return None
+
+        view = memoryview(mapping)
+        tables = dict()
+        for i in range(count):
+            name, typecode, length, offset = _INDEX_ENTRY.unpack_from(mapping, header_size + i * _INDEX_ENTRY.size)
+            typecode = typecode.decode('ascii')
+            if typecode not in _TYPECODES:
+                return None
+            size = length * array(typecode).itemsize
+            if offset + size > len(mapping):
+                return None
+            tables[name.rstrip(b'\0').decode('ascii')] = view[offset:offset + size].cast(typecode)
+        return tables
+
+
+def cache_directory() -> str:
+    """Returns the directory of the on-disk caches of `pyimath`, named by the `PYIMATH_CACHE_DIR` environment
+    variable, `~/.cache/pyimath` by default"""
+    return os.environ.get('PYIMATH_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'pyimath'))
+
+
+def default_table_cache() -> TableCache:
+    """Returns the table cache used by the fields when none is set, in the `tables` subdirectory
+    of `cache_directory()`"""
+    global _default_table_cache
+    if _default_table_cache is None:
+        _default_table_cache = TableCache(os.path.join(cache_directory(), 'tables'))
+    return _default_table_cache
+
+
+_default_table_cache = None
+
+_MAGIC = b'PYIMTBL\0'
+_BYTE_ORDER = b'<' if sys.byteorder == 'little' else b'>'
+_INDEX_ENTRY = struct.Struct('=16sc7xQQ')
+_TYPECODES = 'bhiq'
+
+
+def _align(n: int) -> int:
+    return (n + 7) // 8 * 8
+
+
+def _typecode(values: Sequence[int]) -> str:
+    bound = max((abs(v) for v in values), default=0)
+    for typecode in _TYPECODES:
+        if bound < 2 ** (8 * array(typecode).itemsize - 1):
+            return typecode
+    raise OverflowError('Table values do not fit in 64 bits')
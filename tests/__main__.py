@@ -9,6 +9,7 @@ from unittest import main as run_tests
 NB_TESTS = 10
 
 TEST_CASES = [
+    'tables',
     'primefield',
     'polynomial',
     'finitefield',
@@ -16,7 +17,11 @@ TEST_CASES = [
     'transtype',
     'pfpoly',
     'ffpoly',
+    'irreducible',
+    'serialization',
+    'linalg',
     'factorize',
+    'hensel',
     'ff_factorize',
     'gaussint',
     'functions',
@@ -1,9 +1,15 @@
 from unittest import TestCase
 from unittest import main as run_tests
 
-from pyimath.factorize import factorize
+from concurrent.futures import ProcessPoolExecutor
+from random import Random
+from unittest.mock import patch
+
+from pyimath.factorize import factorize, factorize_many, Factorization, FactorizationCache
 from pyimath.primefield import PrimeField
+from pyimath.integer import IntegerRing
 from pyimath.polynomial import symbolic_polynomial
+from pyimath.finitefield import finite_field
 
 
 class TestSquareFreeFactorization(TestCase):
@@ -219,6 +225,64 @@ class TestDistinctDegree(TestCase):
         self.assertTrue(fdeg4.value == p1 * p2)
         self.assertTrue(fdeg3.value == p3)
 
+    def test8(self):
+        """Check distinct degree factorization of a polynomial of degree 40 over F7
+        """
+        f7 = PrimeField(7)
+        p1 = f7.polynomial(1, 0, 1)  # irreducible of degree 2
+        p2 = f7.polynomial(-1, -3, 0, 1)  # irreducible of degree 3
+        p3 = f7.polynomial(3, 1)
+        p = f7.polynomial(1, -3, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+                          0, 0, 0, 0, 0, 1) * p1 * p2 * p3
+        sqf, multiple_factors = factorize(p).square_free()
+        self.assertEqual(len(multiple_factors), 0)
+
+        factors = factorize(p).distinct_degree()
+        self.assertEqual(factorize(p).factors_product(factors), p)
+        for fct in factors:
+            self.assertEqual(fct.value.degree % fct.max_degree, 0)
+            self.assertTrue(fct.value % p1 != fct.value.null or fct.max_degree == 2)
+            self.assertTrue(fct.value % p2 != fct.value.null or fct.max_degree == 3)
+        self.assertIn(2, [fct.max_degree for fct in factors])
+        self.assertIn(3, [fct.max_degree for fct in factors])
+
+    def test9(self):
+        """Check baby-step giant-step distinct degree factorization against the incremental one
+        """
+        f2 = PrimeField(2)
+        f7 = PrimeField(7)
+        ps = [
+            f2.polynomial(1, 1) * f2.polynomial(1, 1, 1) * f2.polynomial(1, 1, 0, 1) * f2.polynomial(1, 0, 0, 1, 1),
+            f7.polynomial(1, -3, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+                          0, 0, 0, 0, 0, 1) * f7.polynomial(1, 0, 1) * f7.polynomial(-1, -3, 0, 1) * f7.polynomial(3, 1),
+            f7.polynomial(-1, -3, 0, 1),
+            f7.polynomial(3, 1),
+        ]
+        for p in ps:
+            with self.subTest(p=p):
+                expected = factorize(p).distinct_degree(method='incremental')
+                factors = factorize(p).distinct_degree(method='baby_step_giant_step')
+                self.assertEqual(factorize(p).factors_product(factors), p)
+                self.assertEqual(sorted((fct.max_degree, str(fct.value)) for fct in factors),
+                                 sorted((fct.max_degree, str(fct.value)) for fct in expected))
+
+        with self.assertRaises(ValueError):
+            factorize(ps[0]).distinct_degree(method='unknown')
+
+    def test10(self):
+        """Check that the automatic distinct degree factorization only picks baby-step giant-step once enabled
+        """
+        p = PrimeField(7).polynomial(1, 0, 1) * PrimeField(7).polynomial(-1, -3, 0, 1)
+        expected = factorize(p).distinct_degree(method='incremental')
+        for threshold in (None, 2):
+            with self.subTest(threshold=threshold), \
+                    patch.object(Factorization, 'baby_step_giant_step_min_degree', threshold), \
+                    patch.object(Factorization, '_baby_step_giant_step_distinct_degree', return_value=[]) as bsgs:
+                factors = factorize(p).distinct_degree()
+                self.assertEqual(bsgs.called, threshold is not None)
+                if threshold is None:
+                    self.assertEqual(factors, expected)
+
 
 class TestEqualDegree(TestCase):
     def test1(self):
@@ -385,6 +449,272 @@ class TestFullFactorization(TestCase):
         factors, c = factorize(p).cantor_zassenhaus()
         self.assertTrue(factorize(p).factors_product(factors) * c == p)
 
+    def test6(self):
+        """Check full factorization over F7 with a process pool
+        """
+        f7 = PrimeField(7)
+        p = f7.polynomial(1, -3, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+                          0, 0, 0, 0, 1)
+        p *= f7.polynomial(1, 0, 1) * f7.polynomial(-1, -3, 0, 1) ** 2 * f7.polynomial(3, 1) * f7.polynomial(-3, 1)
+
+        expected, _ = factorize(p).cantor_zassenhaus()
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            factors, c = factorize(p, executor=executor).cantor_zassenhaus()
+
+        self.assertEqual(factorize(p).factors_product(factors) * c, p)
+        self.assertEqual(sorted((str(f.value), f.multiplicity) for f in factors),
+                         sorted((str(f.value), f.multiplicity) for f in expected))
+
+
+class TestBerlekamp(TestCase):
+    def test1(self):
+        """Check Berlekamp factorization over F3
+        """
+        f3 = PrimeField(3)
+
+        c0 = f3.polynomial(1, 1)
+        c1 = f3.polynomial(0, 0, 1)
+        c2 = f3.polynomial(-1, 1) ** 3
+        c3 = f3.polynomial(-1, 1, 1)
+
+        p = c0 * c1 * c2 * c3
+
+        factors, c = factorize(p).berlekamp()
+        self.assertTrue(c == 1)
+        self.assertEqual(len(factors), 4)
+        self.assertTrue(all(f.is_irreducible for f in factors))
+        self.assertEqual(factorize(p).factors_product(factors), p)
+
+    def test2(self):
+        """Check Berlekamp factorization over F2, square of degree 8
+        """
+        f2 = PrimeField(2)
+        p = symbolic_polynomial('1 + X^2 + X^4 + X^8', f2)
+
+        factors, c = factorize(p).berlekamp()
+        self.assertEqual(len(factors), 2)
+        self.assertEqual(factorize(p).factors_product(factors), p)
+
+    def test3(self):
+        """Check Berlekamp factorization over F7, non monic
+        """
+        f7 = PrimeField(7)
+        p = symbolic_polynomial('-3X^3 - 2X^2 + X + 3', f7)
+
+        factors, c = factorize(p).berlekamp()
+        self.assertEqual(factorize(p).factors_product(factors) * c, p)
+
+    def test4(self):
+        """Check that Berlekamp and Cantor-Zassenhaus factorizations agree over F7
+        """
+        f7 = PrimeField(7)
+        p = f7.polynomial(1, -3, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+                          0, 0, 0, 0, 1)
+        p *= f7.polynomial(1, 0, 1) * f7.polynomial(-1, -3, 0, 1) ** 2 * f7.polynomial(3, 1)
+
+        bk_factors, c = factorize(p).berlekamp()
+        cz_factors, _ = factorize(p).cantor_zassenhaus()
+        self.assertEqual(factorize(p).factors_product(bk_factors) * c, p)
+        self.assertEqual(sorted((str(f.value), f.multiplicity) for f in bk_factors),
+                         sorted((str(f.value), f.multiplicity) for f in cz_factors))
+
+    def testDispatch(self):
+        """Check the selection of the factorization algorithm
+        """
+        f3 = PrimeField(3)
+        p = symbolic_polynomial('-X^3 - X^2 + X + 1', f3)
+        for method in ('auto', 'berlekamp', 'cantor_zassenhaus'):
+            with self.subTest(method=method):
+                factors, c = factorize(p).factor(method=method)
+                self.assertEqual(factorize(p).factors_product(factors) * c, p)
+
+        with self.assertRaises(ValueError):
+            factorize(p).factor(method='unknown')
+
+
+class TestZassenhaus(TestCase):
+    def setUp(self):
+        self.z = IntegerRing()
+
+    def test1(self):
+        """Check factorization over the integers of a product of linear and quadratic polynomials
+        """
+        z = self.z
+        p = z.polynomial(-1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1)
+
+        factors, c = factorize(p).zassenhaus()
+        self.assertEqual(c, 1)
+        self.assertEqual(sorted(str(f.value) for f in factors),
+                         sorted(['-1 + X', '1 + X', '1 + X^2', '1 + X + X^2', '1 - X + X^2', '1 - X^2 + X^4']))
+        self.assertEqual(factorize(p).factors_product(factors), p)
+
+    def test2(self):
+        """Check factorization over the integers of a non monic polynomial with content
+        """
+        z = self.z
+        p = (z.polynomial(3, 2) * z.polynomial(-5, 7) * z.polynomial(1, 1, 1, 5)).mul_constant(-6)
+
+        factors, c = factorize(p).zassenhaus()
+        self.assertEqual(c, -6)
+        self.assertEqual(len(factors), 3)
+        self.assertEqual(factorize(p).factors_product(factors) * c, p)
+
+    def test3(self):
+        """Check factorization over the integers of a non square free polynomial
+        """
+        z = self.z
+        p = z.polynomial(2, 3, 1) * z.polynomial(1, 0, 1) * z.polynomial(-2, 0, 0, 1) ** 2
+
+        factors, c = factorize(p).zassenhaus()
+        self.assertEqual(sorted((str(f.value), f.multiplicity) for f in factors),
+                         [('-2 + X^3', 2), ('1 + X', 1), ('1 + X^2', 1), ('2 + X', 1)])
+        self.assertEqual(factorize(p).factors_product(factors) * c, p)
+
+    def test4(self):
+        """Check factorization over the integers of irreducible polynomials
+        """
+        z = self.z
+        for p in (z.polynomial(1, 0, 0, 0, 1), z.polynomial(-2, 0, 1), z.polynomial(3, 5)):
+            with self.subTest(p=p):
+                factors, c = factorize(p).factor()
+                self.assertEqual(len(factors), 1)
+                self.assertEqual(factorize(p).factors_product(factors) * c, p)
+
+        factors, c = factorize(z.polynomial(-7)).zassenhaus()
+        self.assertEqual((factors, c), ([], -7))
+
+    def test5(self):
+        """Check that Zassenhaus factorization is rejected over finite fields
+        """
+        f3 = PrimeField(3)
+        with self.assertRaises(ValueError):
+            factorize(f3.polynomial(1, 1, 1)).zassenhaus()
+
+    def test6(self):
+        """Check that the factors have a positive leading coefficient with a negative leading coefficient
+        and zero low order coefficients
+        """
+        z = self.z
+        for p, content, expected in ((z.polynomial(0, -1), -1, [('X', 1)]),
+                                     (z.polynomial(0, 0, 2, 4), 2, [('1 + 2X', 1), ('X', 2)]),
+                                     (z.polynomial(0, 0, -3, 0, 6), 3, [('-1 + 2X^2', 1), ('X', 2)]),
+                                     (z.polynomial(0, 4, 0, -2), -2, [('-2 + X^2', 1), ('X', 1)])):
+            with self.subTest(p=p):
+                factors, c = factorize(p).zassenhaus()
+                self.assertEqual(c, content)
+                self.assertEqual(sorted((str(f.value), f.multiplicity) for f in factors), expected)
+                self.assertEqual(factorize(p).factors_product(factors) * c, p)
+
+    def test7(self):
+        """Check the sign of the content and of the factors of random polynomials
+        """
+        z = self.z
+        rng = Random(37)
+        for _ in range(50):
+            p = z.polynomial(*[rng.randint(-9, 9) for _ in range(rng.randint(2, 6))])
+            if p.degree < 1:
+                continue
+            with self.subTest(p=p):
+                factors, c = factorize(p).zassenhaus()
+                self.assertTrue(all(f.value.leading > 0 for f in factors))
+                self.assertGreater(c * p.leading, 0)
+                self.assertEqual(factorize(p).factors_product(factors) * c, p)
+
+
+class TestFactorizationCache(TestCase):
+    def setUp(self):
+        self.f7 = PrimeField(7)
+
+    def testHitsAndMisses(self):
+        """Check that factorizations are cached whatever the leading coefficient
+        """
+        f7 = self.f7
+        cache = FactorizationCache()
+        p = f7.polynomial(1, 0, 1) * f7.polynomial(-1, -3, 0, 1) ** 2 * f7.polynomial(3, 1) * f7.polynomial(2, 1)
+
+        factors, c = factorize(p, cache=cache).cantor_zassenhaus()
+        self.assertEqual(cache.cache_info().hits, 0)
+        misses = cache.cache_info().misses
+
+        cached_factors, cached_c = factorize(p.mul_constant(f7(3)), cache=cache).cantor_zassenhaus()
+        self.assertEqual(cache.cache_info().hits, 1)
+        self.assertEqual(cache.cache_info().misses, misses)
+        self.assertEqual(cached_factors, factors)
+        self.assertEqual(cached_c, 3 * c)
+
+        cached_factors, _ = factorize(p, cache=cache).berlekamp()
+        self.assertEqual(cache.cache_info().hits, 2)
+        self.assertEqual(cached_factors, factors)
+
+    def testSubFactors(self):
+        """Check that the factorizations of distinct degree factors are reused across calls
+        """
+        f7 = self.f7
+        cache = FactorizationCache()
+        linear = f7.polynomial(3, 1) * f7.polynomial(2, 1) * f7.polynomial(-1, 1)
+        p = f7.polynomial(1, 0, 1) * linear
+        q = f7.polynomial(-1, -3, 0, 1) * linear
+
+        factorize(p, cache=cache).cantor_zassenhaus()
+        self.assertEqual(cache.cache_info().hits, 0)
+        factors, _ = factorize(q, cache=cache).cantor_zassenhaus()
+        self.assertEqual(cache.cache_info().hits, 1)
+        self.assertEqual(factorize(q).factors_product(factors), q)
+
+    def testEviction(self):
+        """Check the LRU eviction of cached factorizations
+        """
+        f7 = self.f7
+        cache = FactorizationCache(max_size=2)
+        ps = [f7.polynomial(k, 0, 1) for k in (1, 2, 3)]
+        for p in ps:
+            factorize(p, cache=cache).cantor_zassenhaus()
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get(ps[0]))
+        self.assertIsNotNone(cache.get(ps[2]))
+
+        cache.clear()
+        self.assertEqual(cache.cache_info(), FactorizationCache.CacheInfo(0, 0, 2, 0))
+
+
+class TestFactorizeMany(TestCase):
+    def setUp(self):
+        f2, f7, f9 = PrimeField(2), PrimeField(7), finite_field(9)
+        self.polys = [
+            f7.polynomial(1, 0, 1) * f7.polynomial(3, 1),
+            f2.polynomial(1, 0, 1, 1) * f2.polynomial(1, 1) ** 2,
+            f9.polynomial(f9(0, 1), 1) ** 2 * f9.polynomial(1, f9(1, 1), 1),
+            f7.polynomial(-1, -3, 0, 1).mul_constant(f7(2)),
+            f7.polynomial(3),
+            f2.polynomial(0, 1, 1, 1),
+        ]
+
+    def check(self, results):
+        results = list(results)
+        self.assertEqual(len(results), len(self.polys))
+        for p, (factors, c) in zip(self.polys, results):
+            if p.degree > 0:
+                self.assertEqual(factorize(p).factors_product(factors) * c, p)
+            else:
+                self.assertEqual((factors, c), ([], p.constant))
+
+    def testSequential(self):
+        """Check batch factorization in the current process, in input order
+        """
+        self.check(factorize_many(self.polys, chunk_size=2))
+
+    def testGenerator(self):
+        """Check that batch factorization streams its results
+        """
+        results = factorize_many(iter(self.polys))
+        factors, c = next(results)
+        self.assertEqual(factorize(self.polys[0]).factors_product(factors) * c, self.polys[0])
+
+    def testProcessPool(self):
+        """Check batch factorization over a process pool, in input order
+        """
+        self.check(factorize_many(iter(self.polys), workers=2, chunk_size=2))
+
 
 class TestFactor(TestCase):
     def test1(self):
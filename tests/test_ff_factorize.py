@@ -62,5 +62,16 @@ class TestFiniteFieldFactorization(TestCase):
                 self.assertTrue(p == factorize(p).factors_product(factors) * c)
 
 
+    def testBerlekamp(self):
+        """Check full Berlekamp factorization over F4, F8 and F9
+        """
+        for q in (4, 8, 9):
+            fq = finite_field(q)
+            p = fq.polynomial(fq(0, 1), 1, fq(0, 1), 0, fq(1, 1)) * fq.polynomial(fq(1, 1), fq(1, 0), 1) ** 3
+            with self.subTest(f'Testing factorizing {str(p)}'):
+                factors, c = factorize(p).berlekamp()
+                self.assertTrue(all(f.is_irreducible for f in factors))
+                self.assertTrue(p == factorize(p).factors_product(factors) * c)
+
 if __name__ == '__main__':
     run_tests()
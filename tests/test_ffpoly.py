@@ -4,7 +4,8 @@ from unittest import main as run_tests
 from pyimath.finitefield import FiniteField, FFElement
 from pyimath.primefield import PrimeField
 from pyimath.functions import gcd
-from pyimath.polynomial import symbolic_polynomial
+from pyimath.polynomial import symbolic_polynomial, Polynomial, FrobeniusMatrix
+from pyimath.finitefield import finite_field
 
 
 class TestStr(TestCase):
@@ -92,5 +93,51 @@ class TestDiv(TestCase):
         self.assertEqual(gcd(a, b), f16.polynomial(1))
 
 
+
+class TestInterpolation(TestCase):
+    def testF9Interpolation(self):
+        """Check multipoint evaluation and interpolation of polynomials over F9
+        """
+        f9 = finite_field(9)
+        p = f9.polynomial(f9(1, 1), 0, f9(0, -1), 1, f9(1, 0))
+        points = list(f9)
+        values = p.evaluate_many(points)
+        self.assertEqual(values, [p.evaluate(k) for k in points])
+
+        threshold = Polynomial.subproduct_tree_threshold
+        try:
+            for t in (threshold, 1):
+                Polynomial.subproduct_tree_threshold = t
+                self.assertEqual(p.evaluate_many(points), values)
+                self.assertEqual(Polynomial.interpolate(points, values, f9), p)
+        finally:
+            Polynomial.subproduct_tree_threshold = threshold
+
+
+class TestFrobeniusMatrix(TestCase):
+    def testF9Power(self):
+        """Check that the Frobenius matrix over F9 raises to the power 9, not to the characteristic
+        """
+        f9 = finite_field(9)
+        m = f9.polynomial(f9(1, 1), f9(0, 1), 0, 1)
+        frobenius = FrobeniusMatrix(m)
+        self.assertEqual(frobenius.order, 9)
+        p = f9.polynomial(f9(1, -1), 1, f9(0, 1))
+        self.assertEqual(frobenius.power(p), pow(p, 9, m))
+        self.assertEqual(frobenius.power(p, 2), pow(p, 81, m))
+
+
+class TestRoots(TestCase):
+    def testRoots(self):
+        """Check root finding over F4, F8 and F9
+        """
+        for q in (4, 8, 9):
+            fq = finite_field(q)
+            poly = fq.polynomial(fq(0, 1), 1) * fq.polynomial(fq(1, 1), 1) ** 2 * fq.polynomial(1, 1, 0, 1)
+            with self.subTest(q=q):
+                expected = [k for k in fq if poly.evaluate(k) == fq.zero]
+                self.assertEqual(sorted(repr(k) for k in poly.roots()), sorted(repr(k) for k in expected))
+
+
 if __name__ == '__main__':
     run_tests()
@@ -2,6 +2,14 @@ from unittest import TestCase
 from unittest import skip
 from unittest import main as run_tests
 
+from concurrent.futures import ThreadPoolExecutor
+import os
+import pickle
+from tempfile import TemporaryDirectory
+from threading import Event, Thread
+from unittest.mock import patch
+
+from pyimath import finitefield, irreducible, tables
 from pyimath.finitefield import FiniteField, FFElement, finite_field
 from pyimath.polynomial import Polynomial
 from pyimath.primefield import PrimeField, PFElement
@@ -213,5 +221,137 @@ class TestGenerator(TestCase):
                     self.assertEqual(a / b, f27g.element(a) / f27g.element(b))
 
 
+class TestFiniteFieldRegistry(TestCase):
+
+    def setUp(self):
+        # keep the primitive polynomials found by the tests out of the user cache
+        self.directory = TemporaryDirectory()
+        self.environ = patch.dict(os.environ, PYIMATH_CACHE_DIR=self.directory.name)
+        self.environ.start()
+        self.caches = irreducible._default_cache, tables._default_table_cache
+        irreducible._default_cache = tables._default_table_cache = None
+
+    def tearDown(self):
+        irreducible._default_cache, tables._default_table_cache = self.caches
+        self.environ.stop()
+        self.directory.cleanup()
+
+    def testPrimeOrder(self):
+        """Check that a prime order gives a prime field
+        """
+        for p in (2, 23, 101):
+            with self.subTest(p=p):
+                field = finite_field(p)
+                self.assertIsInstance(field, PrimeField)
+                self.assertEqual(field.characteristic, p)
+
+    def testPrimePowerOrder(self):
+        """Check finite fields of prime power orders beyond the predefined ones
+        """
+        for q, p, n in ((32, 2, 5), (49, 7, 2), (81, 3, 4), (125, 5, 3)):
+            with self.subTest(q=q):
+                field = finite_field(q)
+                self.assertIsInstance(field, FiniteField)
+                self.assertEqual((field.order, field.characteristic, field.dimension), (q, p, n))
+                self.assertTrue(field.has_valid_generator)
+                self.assertEqual(field.generator, field(0, 1))
+
+    def testPredefined(self):
+        """Check that the small finite fields keep their defining polynomial and generator
+        """
+        f9 = finite_field(9)
+        self.assertEqual(f9.base_polynomial, PrimeField(3).polynomial(1, 0, 1))
+        self.assertEqual(f9.generator, f9(1, 1))
+
+    def testMemoization(self):
+        """Check that a field is built once and shared
+        """
+        self.assertIs(finite_field(27), finite_field(27))
+        self.assertIs(finite_field(13), finite_field(13))
+
+    def testThreads(self):
+        """Check that concurrent requests of a new field share a single instance
+        """
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            fields = list(executor.map(finite_field, [64] * 8))
+        self.assertTrue(all(f is fields[0] for f in fields))
+
+    def testConcurrentOrders(self):
+        """Check that building a field does not block the requests of fields of other orders
+        """
+        make_finite_field = finitefield._make_finite_field
+        building, built = Event(), Event()
+        unblocked = []
+
+        def slow_make_finite_field(order):
+            if order == 11:
+                building.set()
+                unblocked.append(built.wait(timeout=10))
+            return make_finite_field(order)
+
+        with patch.dict(finitefield._registry, clear=True), patch.dict(finitefield._definitions, clear=True), \
+                patch.object(finitefield, '_make_finite_field', slow_make_finite_field):
+            thread = Thread(target=finite_field, args=(11,))
+            thread.start()
+            building.wait(timeout=10)
+            self.assertIsInstance(finite_field(13), PrimeField)
+            built.set()
+            thread.join()
+            self.assertIsInstance(finitefield._registry.get(11), PrimeField)
+        self.assertEqual(unblocked, [True])
+
+    def testNotAPrimePower(self):
+        """Check that orders that are not prime powers are rejected
+        """
+        for q in (0, 1, 6, 12, 100):
+            with self.subTest(q=q):
+                with self.assertRaises(ValueError):
+                    finite_field(q)
+
+
+class TestPickling(TestCase):
+
+    def testPrimeField(self):
+        """Check that a prime field, its elements and polynomials are pickled without the field tables
+        """
+        f101 = PrimeField(101)
+        p = f101.polynomial(*range(-50, 50))
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            with self.subTest(protocol=protocol):
+                self.assertIs(pickle.loads(pickle.dumps(f101, protocol)), finite_field(101))
+                self.assertEqual(pickle.loads(pickle.dumps(f101(-7), protocol)), f101(-7))
+                q = pickle.loads(pickle.dumps(p, protocol))
+                self.assertEqual(q, p)
+                self.assertIs(q.base_field, finite_field(101))
+        self.assertLess(len(pickle.dumps(p)), 1024)
+
+    def testFiniteField(self):
+        """Check that a finite field of the registry, its elements and polynomials are pickled by value
+        """
+        f27 = finite_field(27)
+        p = f27.polynomial(f27(1, 1), f27(0, -1), f27.one, indeterminate='Y')
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            with self.subTest(protocol=protocol):
+                self.assertIs(pickle.loads(pickle.dumps(f27, protocol)), f27)
+                self.assertEqual(pickle.loads(pickle.dumps(f27(1, 0, -1), protocol)), f27(1, 0, -1))
+                q = pickle.loads(pickle.dumps(p, protocol))
+                self.assertEqual(q, p)
+                self.assertEqual(q.indeterminate, 'Y')
+                self.assertIs(q.base_field, f27)
+        self.assertLess(len(pickle.dumps(p)), 1024)
+
+    def testOtherDefinition(self):
+        """Check that a finite field defined apart from the registry is rebuilt once with the same definition
+        """
+        f3 = PrimeField(3)
+        f27 = FiniteField(3, 3, f3.polynomial(1, -1, 0, 1), root_symbol='k')
+        field = pickle.loads(pickle.dumps(f27))
+        self.assertIsNot(field, finite_field(27))
+        self.assertIs(pickle.loads(pickle.dumps(f27)), field)
+        self.assertEqual(field.base_polynomial, f27.base_polynomial)
+        self.assertEqual(field.root_symbol, 'k')
+        self.assertIsNone(field.generator)
+
+
 if __name__ == '__main__':
     run_tests()
@@ -4,6 +4,7 @@ from random import randint
 
 
 from pyimath.functions import *
+from pyimath.primefield import PrimeField
 
 
 class TestBinCoeff(TestCase):
@@ -12,6 +13,40 @@ class TestBinCoeff(TestCase):
         self.assertListEqual(r, [1, 5, 10, 10, 5, 1])
 
 
+class TestGCD(TestCase):
+    def testIntegers(self):
+        """The GCD of integers is non negative, with or without zero operands
+        """
+        self.assertEqual(gcd(0, -2), 2)
+        self.assertEqual(gcd(-4, 0), 4)
+        self.assertEqual(gcd(0, 0), 0)
+        self.assertEqual(gcd(-12, 18), 6)
+
+    def testPolynomials(self):
+        """The GCD of polynomials over a field is monic, with or without zero operands
+        """
+        f5 = PrimeField(5)
+        p = f5.polynomial(1, 2, 2)
+        monic = p.make_monic()
+        self.assertEqual(gcd(p.null, p), monic)
+        self.assertEqual(gcd(p, p.null), monic)
+        self.assertEqual(gcd(p * f5.polynomial(1, 1), p * f5.polynomial(-1, 1)), monic)
+
+
+class TestIntegerSquareRoot(TestCase):
+    def test(self):
+        """Check the integer square root against squares and their neighbours
+        """
+        for r in list(range(0, 100)) + [2 ** 40 + 5, 10 ** 30 + 7]:
+            with self.subTest(r=r):
+                self.assertEqual(isqrt(r * r), r)
+                self.assertEqual(isqrt(r * r + 2 * r), r)
+                if r > 0:
+                    self.assertEqual(isqrt(r * r - 1), r - 1)
+        with self.assertRaises(ValueError):
+            isqrt(-1)
+
+
 class TestFactor(TestCase):
     def testPrime(self):
         r = factor(2137)
@@ -27,6 +62,13 @@ class TestFactor(TestCase):
             r = factor(n)
             self.assertEqual(n, mul_factor(r))
 
+    def testLargeFactors(self):
+        r = factor(2 ** 64 - 1)
+        self.assertListEqual(r, [(3, 1), (5, 1), (17, 1), (257, 1), (641, 1), (65537, 1), (6700417, 1)])
+
+        r = factor(4 * 999983 ** 2 * 1000003)
+        self.assertListEqual(r, [(2, 2), (999983, 2), (1000003, 1)])
+
     def testPrimes(self):
         p = primes(100)
         self.assertEqual(len(p), 25)
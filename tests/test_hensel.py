@@ -0,0 +1,80 @@
+from unittest import TestCase
+from unittest import main as run_tests
+
+from functools import reduce
+
+from pyimath.integer import IntegerRing
+from pyimath.primefield import PrimeField
+from pyimath.hensel import hensel_lift, hensel_step, reduce_mod, to_integers, to_prime_field
+from pyimath.hensel import _inverse_mod
+
+
+class TestHenselLifting(TestCase):
+    def setUp(self):
+        self.z = IntegerRing()
+
+    def testReduction(self):
+        """Check the conversions between polynomials over the integers and over a prime field
+        """
+        z, f5 = self.z, PrimeField(5)
+        p = z.polynomial(12, -7, 0, 3)
+        self.assertEqual(reduce_mod(p, 5), z.polynomial(2, -2, 0, -2))
+        self.assertEqual(to_prime_field(p, f5), f5.polynomial(2, -2, 0, -2))
+        self.assertEqual(to_integers(f5.polynomial(2, -2, 0, -2)), z.polynomial(2, -2, 0, -2))
+
+    def testHenselStep(self):
+        """Check a single quadratic Hensel step over the integers
+        """
+        z, f5 = self.z, PrimeField(5)
+        f = z.polynomial(-1, 0, 0, 0, 1)
+        g, h = z.polynomial(-1, 1), z.polynomial(1, 1, 1, 1)
+        _, s, t = to_prime_field(g, f5).xgcd(to_prime_field(h, f5))
+        s, t = to_integers(s), to_integers(t)
+        g, h, s, t = hensel_step(f, g, h, s, t, 5)
+        self.assertEqual(reduce_mod(f - g * h, 25), f.null)
+        self.assertEqual(reduce_mod(s * g + t * h, 25), f.unit)
+
+    def testMultifactorLifting(self):
+        """Check multifactor Hensel lifting of the factorization of X^4 - 1 modulo 5
+        """
+        z, f5 = self.z, PrimeField(5)
+        f = z.polynomial(-1, 0, 0, 0, 1)
+        factors = [f5.polynomial(-1, 1), f5.polynomial(1, 1), f5.polynomial(2, 1), f5.polynomial(-2, 1)]
+        for k in (1, 2, 3, 10):
+            with self.subTest(k=k):
+                lifted = hensel_lift(f, factors, k)
+                self.assertEqual(len(lifted), 4)
+                self.assertEqual(reduce_mod(reduce(lambda a, b: a * b, lifted), 5 ** k), reduce_mod(f, 5 ** k))
+                self.assertEqual([to_prime_field(v, f5) for v in lifted], factors)
+        # X^4 - 1 = (X - 1)(X + 1)(X^2 + 1) over the integers
+        lifted = hensel_lift(f, factors, 10)
+        self.assertIn(z.polynomial(-1, 1), lifted)
+        self.assertIn(z.polynomial(1, 1), lifted)
+
+    def testNonMonicLifting(self):
+        """Check multifactor Hensel lifting of a non monic polynomial
+        """
+        z, f7 = self.z, PrimeField(7)
+        f = z.polynomial(3, 2) * z.polynomial(-5, 3) * z.polynomial(1, 1, 1, 5)
+        fp = to_prime_field(f, f7)
+        factors = [to_prime_field(g, f7).make_monic() for g in (z.polynomial(3, 2), z.polynomial(-5, 3),
+                                                                 z.polynomial(1, 1, 1, 5))]
+        self.assertEqual(reduce(lambda a, b: a * b, factors).mul_constant(fp.leading), fp)
+
+        lifted = hensel_lift(f, factors, 8)
+        m = 7 ** 8
+        self.assertTrue(all(v.is_monic for v in lifted))
+        self.assertEqual(reduce_mod(reduce(lambda a, b: a * b, lifted).mul_constant(f.leading), m), reduce_mod(f, m))
+
+    def testInverseMod(self):
+        """Check modular inverses of integers, positive or negative
+        """
+        for a, m in ((3, 7), (-2, 7 ** 8), (12346, 5 ** 10), (1, 2)):
+            with self.subTest(a=a, m=m):
+                self.assertEqual(a * _inverse_mod(a, m) % m, 1 % m)
+        with self.assertRaises(ValueError):
+            _inverse_mod(14, 49)
+
+
+if __name__ == '__main__':
+    run_tests()
@@ -0,0 +1,129 @@
+from unittest import TestCase
+from unittest import main as run_tests
+
+import json
+import os
+from tempfile import TemporaryDirectory
+
+from pyimath.finitefield import finite_field
+from pyimath.primefield import PrimeField
+from pyimath.irreducible import irreducible_polynomial, is_primitive, IrreducibleCache
+
+
+class TestIrreduciblePolynomial(TestCase):
+    def assertHasOrder(self, f, order):
+        """Check that X has the given multiplicative order modulo f, the hard way
+        """
+        x = f.monic(1) % f
+        power = x
+        for k in range(1, order):
+            self.assertFalse(power.is_unit)
+            power = (power * x) % f
+        self.assertTrue(power.is_unit)
+
+    def testSparse(self):
+        """Check that trinomials are preferred
+        """
+        f2 = PrimeField(2)
+        p = irreducible_polynomial(f2, 31, cache=IrreducibleCache())
+        self.assertEqual(str(p), '1 + X^3 + X^31')
+        self.assertTrue(p.is_irreducible)
+
+    def testSwan(self):
+        """Check that a pentanomial is returned over F2 for a degree multiple of 8
+        """
+        f2 = PrimeField(2)
+        for degree in (8, 16, 24):
+            with self.subTest(degree=degree):
+                p = irreducible_polynomial(f2, degree, cache=IrreducibleCache())
+                self.assertEqual(len(p.internal), 5)
+                self.assertTrue(p.is_irreducible)
+
+    def testIsPrimitive(self):
+        """Check primitivity of irreducible polynomials
+        """
+        f2, f3 = PrimeField(2), PrimeField(3)
+        self.assertTrue(is_primitive(f2.polynomial(1, 1, 0, 0, 1)))
+        self.assertFalse(is_primitive(f2.polynomial(1, 1, 1, 1, 1)))  # X has order 5
+        self.assertFalse(is_primitive(f2.polynomial(1, 1, 0, 1, 1)))  # reducible
+        self.assertTrue(is_primitive(f3.polynomial(-1, 1, 1)))
+        self.assertFalse(is_primitive(f3.polynomial(1, 0, 1)))  # X has order 4
+
+    def testPrimitive(self):
+        """Check primitive polynomials over small prime fields
+        """
+        for p, degree in ((2, 1), (2, 8), (3, 1), (3, 4), (5, 3), (7, 1), (7, 2)):
+            with self.subTest(p=p, degree=degree):
+                f = irreducible_polynomial(PrimeField(p), degree, primitive=True, cache=IrreducibleCache())
+                self.assertEqual(f.degree, degree)
+                self.assertTrue(f.is_monic)
+                self.assertHasOrder(f, p ** degree - 1)
+
+    def testNotAPrimeField(self):
+        """Check that only prime fields are accepted
+        """
+        with self.assertRaises(ValueError):
+            irreducible_polynomial(finite_field(4), 3, cache=IrreducibleCache())
+
+
+class TestIrreducibleCache(TestCase):
+    def testPersistence(self):
+        """Check that a polynomial found in a process is read from the file by another
+        """
+        f3 = PrimeField(3)
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'irreducible.json')
+            cache = IrreducibleCache(path)
+            p = irreducible_polynomial(f3, 12, primitive=True, cache=cache)
+            self.assertEqual(len(cache), 1)
+            self.assertTrue(os.path.exists(path))
+
+            other = IrreducibleCache(path)
+            self.assertEqual(other.get(3, 12, primitive=True), [int(c) for c in p.coefficients])
+            # a primitive polynomial is also irreducible
+            self.assertEqual(other.get(3, 12), [int(c) for c in p.coefficients])
+            self.assertIsNone(other.get(3, 13))
+            self.assertEqual(irreducible_polynomial(f3, 12, primitive=True, cache=other), p)
+
+            other.clear()
+            self.assertEqual(len(other), 0)
+            self.assertFalse(os.path.exists(path))
+
+    def testLookup(self):
+        """Check that cached entries are returned without any search
+        """
+        f5 = PrimeField(5)
+        cache = IrreducibleCache()
+        # a reducible polynomial, so that it can only come from the cache
+        cache.put(5, 2, False, [1, 2, 1])
+        self.assertEqual(irreducible_polynomial(f5, 2, cache=cache), f5.polynomial(1, 2, 1))
+        self.assertTrue(irreducible_polynomial(f5, 2, primitive=True, cache=cache).is_irreducible)
+        self.assertEqual(len(cache), 2)
+
+    def testMerge(self):
+        """Check that entries written by several caches over the same file are merged
+        """
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'irreducible.json')
+            first, second = IrreducibleCache(path), IrreducibleCache(path)
+            first.put(2, 3, False, [1, 1, 0, 1])
+            second.put(2, 4, False, [1, 1, 0, 0, 1])
+            with open(path) as file:
+                self.assertEqual(set(json.load(file)), {'2^3', '2^4'})
+
+    def testCorruptedFile(self):
+        """Check that an unreadable file is ignored
+        """
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'irreducible.json')
+            with open(path, 'w') as file:
+                file.write('{not json')
+            cache = IrreducibleCache(path)
+            self.assertIsNone(cache.get(2, 3))
+            f2 = PrimeField(2)
+            self.assertEqual(irreducible_polynomial(f2, 3, cache=cache), f2.polynomial(1, 1, 0, 1))
+            self.assertEqual(IrreducibleCache(path).get(2, 3), [1, 1, 0, 1])
+
+
+if __name__ == '__main__':
+    run_tests()
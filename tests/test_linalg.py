@@ -0,0 +1,51 @@
+from unittest import TestCase
+from unittest import main as run_tests
+
+
+from pyimath.primefield import PrimeField
+from pyimath.finitefield import finite_field
+from pyimath.linalg import kernel, rank, row_echelon, transpose
+
+
+class TestLinearAlgebra(TestCase):
+    def setUp(self):
+        self.f5 = PrimeField(5)
+
+    def testRowEchelon(self):
+        """Check Gauss-Jordan elimination over F5
+        """
+        f5 = self.f5
+        m = [[f5(1), f5(2), f5(0)], [f5(2), f5(-1), f5(1)], [f5(-2), f5(1), f5(-1)]]
+        reduced, pivots = row_echelon(m, f5)
+        self.assertEqual(pivots, [0, 2])
+        self.assertEqual(reduced, [[f5(1), f5(2), f5(0)], [f5(0), f5(0), f5(1)]])
+        self.assertEqual(rank(m, f5), 2)
+        # input left untouched
+        self.assertEqual(m[1], [f5(2), f5(-1), f5(1)])
+
+    def testKernel(self):
+        """Check null space computation over F5
+        """
+        f5 = self.f5
+        m = [[f5(1), f5(2), f5(0), f5(1)], [f5(2), f5(-1), f5(1), f5(0)]]
+        basis = kernel(m, f5)
+        self.assertEqual(len(basis), 4 - rank(m, f5))
+        for v in basis:
+            for row in m:
+                self.assertEqual(sum((a * b for a, b in zip(row, v)), f5.zero), f5.zero)
+
+    def testKernelFullRank(self):
+        """Check that an invertible matrix has a trivial null space
+        """
+        f9 = finite_field(9)
+        m = [[f9(1, 1), f9(0, 1)], [f9(0, 1), f9(1, 0)]]
+        self.assertEqual(kernel(m, f9), [])
+
+    def testTranspose(self):
+        """Check matrix transposition
+        """
+        self.assertEqual(transpose([[1, 2, 3], [4, 5, 6]]), [[1, 4], [2, 5], [3, 6]])
+
+
+if __name__ == '__main__':
+    run_tests()
@@ -1,8 +1,13 @@
 from unittest import TestCase
 from unittest import main as run_tests
 
+from concurrent.futures import ThreadPoolExecutor
+from random import randint
+from unittest.mock import patch
+
 from pyimath.primefield import PrimeField
-from pyimath.polynomial import Polynomial
+from pyimath.polynomial import Polynomial, FrobeniusMatrix
+from pyimath.functions import gcd
 
 
 class TestPFPolynomial(TestCase):
@@ -47,6 +52,14 @@ class TestPFPolynomial(TestCase):
         p += f2(1)
         self.assertEqual(p, p.monic(1))
 
+    def testAddConstantNoConstantTerm(self):
+        """Check add constant term to a polynomial without constant term over a prime field
+        """
+        f5 = self.f5
+        p = f5.polynomial(0, 1, 2)
+        self.assertEqual(p + f5(2), f5.polynomial(2, 1, 2))
+        self.assertEqual(p + 0, p)
+
     def testAddConstantWithCast(self):
         """Check typecasting from int to PFElement for instantiation and addition
         """
@@ -81,6 +94,289 @@ class TestPFPolynomial(TestCase):
         self.assertIsInstance(p[1], type(f2(0)))
 
 
+class TestMultipointEvaluation(TestCase):
+    def setUp(self):
+        self.f7 = PrimeField(7)
+        self.threshold = Polynomial.subproduct_tree_threshold
+
+    def tearDown(self):
+        Polynomial.subproduct_tree_threshold = self.threshold
+
+    def testEvaluateMany(self):
+        """Check multipoint evaluation of a polynomial over a prime field
+        """
+        f7 = self.f7
+        p = f7.polynomial(3, 0, -2, 1, 1, 0, 0, 2)
+        points = [f7(k % 7) if k % 7 < 4 else f7(k % 7 - 7) for k in range(20)]
+        expected = [p.evaluate(k) for k in points]
+        self.assertEqual(expected, [p % f7.linear_polynomial(k) for k in points])
+
+        self.assertEqual(p.evaluate_many(points), expected)
+        Polynomial.subproduct_tree_threshold = 1
+        self.assertEqual(p.evaluate_many(points), expected)
+        self.assertEqual(p.evaluate_many(points[:1]), expected[:1])
+        self.assertEqual(p.null.evaluate_many(points), [f7.zero] * len(points))
+        self.assertEqual(p.evaluate_many([]), [])
+
+
+class TestInterpolation(TestCase):
+    def setUp(self):
+        self.f11 = PrimeField(11)
+        self.threshold = Polynomial.subproduct_tree_threshold
+
+    def tearDown(self):
+        Polynomial.subproduct_tree_threshold = self.threshold
+
+    def testInterpolate(self):
+        """Check interpolation of a polynomial over a prime field
+        """
+        f11 = self.f11
+        p = f11.polynomial(3, 0, -2, 1, 5, 0, 0, 2)
+        points = list(f11)[:p.degree + 1]
+        values = p.evaluate_many(points)
+
+        self.assertEqual(Polynomial.interpolate(points, values, f11), p)
+        Polynomial.subproduct_tree_threshold = 1
+        self.assertEqual(Polynomial.interpolate(points, values, f11), p)
+        self.assertEqual(Polynomial.interpolate(points[:1], values[:1], f11), f11.polynomial(values[0]))
+
+    def testInterpolateTooManyPoints(self):
+        """Check interpolation with more points than needed over a prime field
+        """
+        f11 = self.f11
+        p = f11.polynomial(1, 2, 3)
+        values = p.evaluate_many(f11)
+        for threshold in (self.threshold, 1):
+            Polynomial.subproduct_tree_threshold = threshold
+            self.assertEqual(Polynomial.interpolate(list(f11), values, f11), p)
+
+    def testInvalidPoints(self):
+        """Check interpolation with duplicate points over a prime field
+        """
+        f11 = self.f11
+        with self.assertRaises(ValueError):
+            Polynomial.interpolate([1, 2, 1], [0, 0, 0], f11)
+        with self.assertRaises(ValueError):
+            Polynomial.interpolate([1, 2], [0], f11)
+
+
+class TestModularPower(TestCase):
+    def setUp(self):
+        self.f7 = PrimeField(7)
+
+    def testPowMod(self):
+        """Check three-argument pow of a polynomial over a prime field
+        """
+        f7 = self.f7
+        p = f7.polynomial(1, 2, 0, 3)
+        m = f7.polynomial(-1, 1, 0, 0, 1)
+        for n in (0, 1, 2, 7, 50):
+            with self.subTest(n=n):
+                r = pow(p, n, m)
+                self.assertEqual(r, (p ** n) % m)
+                self.assertTrue(r.degree < m.degree)
+
+    def testPowModKeepsDegreeBounded(self):
+        """Check three-argument pow with a large exponent over a prime field
+        """
+        f7 = self.f7
+        x = f7.polynomial(0, 1)
+        m = f7.polynomial(-1, -3, 0, 1)
+        # X^3 - 3X - 1 is irreducible over F7 so that X^(7^3) = X in F7[X]/(X^3 - 3X - 1)
+        self.assertEqual(pow(x, 7 ** 3, m), x)
+
+    def testPowModNull(self):
+        """Check three-argument pow modulo the null polynomial
+        """
+        p = self.f7.polynomial(1, 1)
+        with self.assertRaises(ZeroDivisionError):
+            pow(p, 2, p.null)
+
+
+class TestFrobeniusMatrix(TestCase):
+    def setUp(self):
+        self.f7 = PrimeField(7)
+
+    def testPower(self):
+        """Check q-th powers computed with the Frobenius matrix over a prime field
+        """
+        f7 = self.f7
+        m = f7.polynomial(2, 1, 0, -1, 0, 3)
+        frobenius = FrobeniusMatrix(m)
+        for p in (f7.polynomial(1), f7.polynomial(0, 1), f7.polynomial(1, 2, 0, 3, -1), m * f7.polynomial(1, 1)):
+            with self.subTest(p=p):
+                self.assertEqual(frobenius.power(p), pow(p, 7, m))
+                self.assertEqual(frobenius.power(p, 3), pow(p, 7 ** 3, m))
+
+    def testCache(self):
+        """Check that Frobenius matrices are cached per modulus
+        """
+        f7 = self.f7
+        m = f7.polynomial(-1, -3, 0, 1)
+        self.assertIs(FrobeniusMatrix.of(m), FrobeniusMatrix.of(f7.polynomial(-1, -3, 0, 1)))
+        self.assertIsNot(FrobeniusMatrix.of(m), FrobeniusMatrix.of(f7.polynomial(1, -3, 0, 1)))
+
+    def testCacheThreads(self):
+        """Check that concurrent lookups do not fail while matrices are evicted
+        """
+        f7 = self.f7
+        moduli = [f7.polynomial(c, 1, 0, 1) for c in range(-3, 4)] * 20
+        cache_size = FrobeniusMatrix.cache_size
+        FrobeniusMatrix.cache_size = 2
+        try:
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                matrices = list(executor.map(FrobeniusMatrix.of, moduli))
+        finally:
+            FrobeniusMatrix.cache_size = cache_size
+        self.assertTrue(all(matrix.modulus == m for matrix, m in zip(matrices, moduli)))
+
+    def testSparseModulus(self):
+        """Check q-th powers modulo a sparse modulus, computed without the rows of the matrix
+        """
+        f2 = PrimeField(2)
+        m = f2.polynomial(1, 0, 0, 1)
+        m += m.monic(31)
+        frobenius = FrobeniusMatrix(m)
+        self.assertTrue(frobenius.is_sparse)
+        self.assertFalse(FrobeniusMatrix(self.f7.polynomial(2, 1, 0, -1, 0, 3)).is_sparse)
+
+        p = f2.polynomial(1, 1, 0, 1, 0, 0, 1)
+        self.assertEqual(frobenius.power(p, 5), pow(p, 2 ** 5, m))
+        self.assertIsNone(frobenius._rows)
+
+
+class TestRoots(TestCase):
+    def testRoots(self):
+        """Check root finding over prime fields
+        """
+        for p in (2, 3, 7, 31):
+            fp = PrimeField(p)
+            for _ in range(5):
+                poly = fp.random_polynomial(randint(1, 8))
+                with self.subTest(p=p, poly=poly):
+                    expected = [k for k in fp if poly.evaluate(k) == fp.zero]
+                    self.assertEqual(sorted(int(k) for k in poly.roots()), sorted(int(k) for k in expected))
+
+    def testSplitPolynomial(self):
+        """Check root finding of a split polynomial with multiple roots
+        """
+        f7 = PrimeField(7)
+        poly = f7.polynomial(-1, 1) ** 3 * f7.polynomial(2, 1) * f7.polynomial(0, 1) * f7.polynomial(1, 0, 1)
+        self.assertEqual(sorted(int(k) for k in poly.roots()), [-2, 0, 1])
+        self.assertEqual(f7.polynomial(3).roots(), [])
+        with self.assertRaises(ValueError):
+            f7.polynomial(0).roots()
+
+
+class TestHalfGCD(TestCase):
+    def setUp(self):
+        self.f7 = PrimeField(7)
+        self.threshold = Polynomial.half_gcd_threshold
+
+    def tearDown(self):
+        Polynomial.half_gcd_threshold = self.threshold
+
+    def testHalfGCD(self):
+        """Check half-GCD against the euclidean algorithm over a prime field
+        """
+        f7 = self.f7
+        for _ in range(10):
+            c = f7.random_polynomial(randint(0, 8))
+            a = f7.random_polynomial(randint(0, 30)) * c
+            b = f7.random_polynomial(randint(0, 30)) * c
+
+            Polynomial.half_gcd_threshold = a.degree + b.degree + 1
+            expected = a.gcd(b)
+            Polynomial.half_gcd_threshold = 2
+            g = a.gcd(b)
+            self.assertEqual(g, expected)
+            self.assertTrue(g.is_monic)
+            self.assertTrue((a % g).is_null and (b % g).is_null)
+            self.assertEqual(gcd(a, b), g)
+
+    def testHighDegree(self):
+        """Check GCD of high degree polynomials over a prime field
+        """
+        f7 = self.f7
+        c = f7.polynomial(1, 2, 3, 1)
+        a = f7.polynomial(1, 1) ** 150 * c
+        b = f7.polynomial(-1, 1) ** 140 * c
+        Polynomial.half_gcd_threshold = 16
+        self.assertEqual(gcd(a, b), c)
+
+
+class TestExtendedGCD(TestCase):
+    def setUp(self):
+        self.f7 = PrimeField(7)
+        self.threshold = Polynomial.half_gcd_threshold
+
+    def tearDown(self):
+        Polynomial.half_gcd_threshold = self.threshold
+
+    def assertBezout(self, a, b):
+        g, s, t = a.xgcd(b)
+        self.assertEqual(s * a + t * b, g)
+        self.assertEqual(g, a.gcd(b))
+        return g, s, t
+
+    def testXGCD(self):
+        """Check Bézout cofactors of polynomials over a prime field
+        """
+        f7 = self.f7
+        for _ in range(10):
+            c = f7.random_polynomial(randint(0, 5))
+            a = f7.random_polynomial(randint(0, 20)) * c
+            b = f7.random_polynomial(randint(0, 20)) * c
+            self.assertBezout(a, b)
+            self.assertBezout(b, a)
+
+    def testXGCDWithHalfGCD(self):
+        """Check Bézout cofactors of polynomials over a prime field with the half-GCD backend
+        """
+        f7 = self.f7
+        Polynomial.half_gcd_threshold = 2
+        for _ in range(10):
+            c = f7.random_polynomial(randint(0, 5))
+            a = f7.random_polynomial(randint(0, 30)) * c
+            b = f7.random_polynomial(randint(0, 30)) * c
+            self.assertBezout(a, b)
+
+    def testInverseMod(self):
+        """Check modular inverses of polynomials over a prime field
+        """
+        f7 = self.f7
+        m = f7.polynomial(-1, -3, 0, 1)
+        for _ in range(10):
+            a = f7.random_polynomial(randint(0, 6))
+            if (a % m).is_null:
+                continue
+            u = a.inverse_mod(m)
+            self.assertTrue(u.degree < m.degree)
+            self.assertEqual((a * u) % m, m.unit)
+            self.assertEqual(pow(a, -1, m), u)
+
+    def testHalfGCDOptIn(self):
+        """Check that the half-GCD backend is only used once a threshold is set
+        """
+        f7 = self.f7
+        a, b = f7.random_polynomial(200), f7.random_polynomial(150)
+        with patch.object(Polynomial, '_half_gcd_matrix', side_effect=AssertionError('half-GCD used')):
+            self.assertBezout(a, b)
+            f7.polynomial(0, 1).inverse_mod(f7.polynomial(-1, -3, 0, 1) ** 60)
+        Polynomial.half_gcd_threshold = 16
+        with patch.object(Polynomial, '_half_gcd_matrix', side_effect=AssertionError('half-GCD used')):
+            with self.assertRaises(AssertionError):
+                a.xgcd(b)
+
+    def testNotInvertible(self):
+        """Check modular inverse of non coprime polynomials over a prime field
+        """
+        f7 = self.f7
+        a = f7.polynomial(1, 1)
+        with self.assertRaises(ValueError):
+            a.inverse_mod(a * f7.polynomial(2, 1))
+
+
 class TestIrreducibility(TestCase):
 
     def assertIsIrreducible(self, p):
@@ -158,6 +454,32 @@ class TestIrreducibility(TestCase):
 
         self.assertIsNotIrreducible(p)
 
+    def test7(self):
+        """Check: Rabin's test with and without early abort
+        """
+        f2 = PrimeField(2)
+        # (X^2 + X + 1)(X^3 + X + 1) has no factor of degree dividing 5 / 5 = 1
+        p = f2.polynomial(1, 1, 1) * f2.polynomial(1, 1, 0, 1)
+        for early_abort in (0, 1, 2, 8):
+            with self.subTest(early_abort=early_abort):
+                self.assertFalse(p.check_irreducibility(early_abort))
+
+        p = f2.polynomial(1, 0, 0, 1)
+        p += p.monic(31)
+        for early_abort in (0, 8, 31):
+            with self.subTest(early_abort=early_abort):
+                self.assertTrue(p.check_irreducibility(early_abort))
+
+    def test8(self):
+        """Check: generation of irreducible polynomials
+        """
+        for field, degree in ((PrimeField(2), 64), (PrimeField(3), 24), (PrimeField(5), 12)):
+            with self.subTest(field=field):
+                p = field.generate_irreducible_polynomial(degree)
+                self.assertEqual(p.degree, degree)
+                self.assertTrue(p.is_monic)
+                self.assertTrue(p.check_irreducibility(early_abort=0))
+
 
 if __name__ == '__main__':
     run_tests()
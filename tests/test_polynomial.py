@@ -1,7 +1,10 @@
 from unittest import TestCase
 from unittest import main as run_tests
 
+import pickle
+
 from pyimath.integer import IntegerRing
+from pyimath.polynomial import PolynomialBuilder
 
 
 def polynomial(*coeffs, indeterminate='X'):
@@ -297,6 +300,81 @@ class TestStrRepr(TestCase):
         self.assertEqual(self.p2, eval(repr(self.p2)))
 
 
+class TestImmutability(TestCase):
+    def testOperandsUnchanged(self):
+        """Extended check: operations leave their operands and their cached metadata unchanged
+        """
+        p = polynomial(0, 2, 0, 1)
+        q = polynomial(1, -2)
+        _ = p + q, p - q, p * q, -p, p * 3, p + 1, divmod(p, polynomial(1, 1)), p.formal_derivative()
+        self.assertEqual(p.coefficients, [0, 2, 0, 1])
+        self.assertEqual((p.degree, p.valuation, p.leading, p.trailing), (3, 1, 1, 2))
+        self.assertEqual(q.coefficients, [1, -2])
+        self.assertEqual((q.degree, q.valuation, q.leading, q.trailing), (1, 0, -2, 1))
+
+    def testMetadata(self):
+        """Extended check: degree, valuation, leading and trailing coefficients of computed polynomials
+        """
+        p = polynomial(0, 0, 1, 1) - polynomial(0, 0, 0, 1)
+        self.assertEqual((p.degree, p.valuation, p.leading, p.trailing), (2, 2, 1, 1))
+        p = p - p
+        self.assertTrue(p.is_null)
+        self.assertEqual((p.degree, p.leading, p.trailing), (0, 0, 0))
+
+    def testHash(self):
+        """Extended check: equal polynomials have the same hash
+        """
+        p = polynomial(1, 0, 2) + polynomial(0, 3)
+        q = polynomial(0, 3) + polynomial(1, 0, 2)
+        self.assertEqual(p, q)
+        self.assertEqual(hash(p), hash(q))
+        self.assertEqual(len({p, q, polynomial(1, 3, 2)}), 1)
+
+
+class TestPickling(TestCase):
+    def testIntegers(self):
+        """Check the pickling of polynomials over the integers
+        """
+        p = polynomial(10 ** 30, 0, -3, 1, indeterminate='T')
+        q = pickle.loads(pickle.dumps(p))
+        self.assertEqual(q, p)
+        self.assertEqual(q.indeterminate, 'T')
+        self.assertEqual(pickle.loads(pickle.dumps(p.null)), p.null)
+
+
+class TestPolynomialBuilder(TestCase):
+    def testBuilder(self):
+        """Extended check: in-place accumulation of terms
+        """
+        p = polynomial(1, 2, 1)
+        b = PolynomialBuilder(IntegerRing(), poly=p)
+        b.iadd_term(3, 2).iadd_term(0, -1)
+        self.assertEqual(b.freeze(), polynomial(0, 2, 1, 2))
+        b.isub_scaled_shift(p, 2, 1)
+        self.assertEqual(b.freeze(), polynomial(0, 0, -3, 0))
+        self.assertEqual(b[2], -3)
+        b.iadd_scaled_shift(polynomial(0, 0, 3), 1)
+        self.assertTrue(b.is_null)
+        self.assertEqual(b.freeze(), p.null)
+        self.assertEqual(p, polynomial(1, 2, 1))
+
+    def testFreezeIndeterminate(self):
+        """Extended check: indeterminate of a frozen polynomial
+        """
+        b = PolynomialBuilder(IntegerRing(), indeterminate='z').iadd_term(2, 1)
+        self.assertEqual(str(b.freeze()), 'z^2')
+
+
+class TestEvaluation(TestCase):
+    def testEvaluate(self):
+        """Extended check: evaluation of a polynomial over Z
+        """
+        p = polynomial(1, -2, 0, 3)
+        self.assertEqual(p.evaluate(2), 21)
+        self.assertEqual(p.evaluate_many(range(-3, 4)), [1 - 2 * k + 3 * k ** 3 for k in range(-3, 4)])
+        self.assertEqual(p.null.evaluate(5), 0)
+
+
 class TestGCD(TestCase):
     def setUp(self):
         self.p1 = polynomial(1, 2, 1)
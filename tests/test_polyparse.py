@@ -1,8 +1,12 @@
 from unittest import TestCase
 from unittest import main as run_tests
 
+import io
+import os
+from tempfile import TemporaryDirectory
 
-from pyimath.polynomial import symbolic_polynomial
+
+from pyimath.polynomial import Lexer, parse_stream, symbolic_polynomial
 from pyimath.finitefield import FiniteField
 from pyimath.primefield import PrimeField
 from pyimath.integer import IntegerRing
@@ -180,5 +184,81 @@ class TestParserComplete(TestCase):
         self.assertTrue(p == IntegerRing().polynomial(IntegerRing().zero))
 
 
+class TestParserPerformance(TestCase):
+
+    def testLexerCache(self):
+        """Check that lexers are compiled once per indeterminate and root symbol
+        """
+        self.assertIs(Lexer.of('X', 'j'), Lexer.of('X', 'j'))
+        self.assertIsNot(Lexer.of('X', 'j'), Lexer.of('Y', 'j'))
+        self.assertIsNot(Lexer.of('X', 'j'), Lexer.of('X', 'k'))
+
+    def testLargeExpression(self):
+        """Parsing a polynomial of 20000 terms
+        """
+        f7 = PrimeField(7)
+        coefficients = [(i * i + 3) % 7 - 3 for i in range(20000)]
+        p = f7.polynomial(*coefficients)
+        self.assertEqual(symbolic_polynomial(str(p), f7), p)
+
+    def testRepeatedDegrees(self):
+        """Terms of the same degree are summed
+        """
+        f5 = PrimeField(5)
+        p = symbolic_polynomial('1 + 2X^3 - X + 2X^3 + X^3 + X - 2', f5)
+        self.assertEqual(p, f5.polynomial(-1))
+        self.assertTrue(symbolic_polynomial('X - X', f5).is_null)
+
+
+class TestParseStream(TestCase):
+
+    def setUp(self):
+        self.f7 = PrimeField(7)
+        self.lines = ['1 + X + X^2', '', '-3X^4 + 2X', '1 + * X', '   X^3 - 1  ', 'X^', '5X', '(1+j)X']
+
+    def check(self, results):
+        f7 = self.f7
+        self.assertEqual(len(results), 7)
+        self.assertEqual(results[0], f7.polynomial(1, 1, 1))
+        self.assertEqual(results[1], f7.polynomial(0, 2, 0, 0, -3))
+        self.assertEqual(results[3], f7.polynomial(-1, 0, 0, 1))
+        errors = [(r.lineno, r.text) for r in results if isinstance(r, SyntaxError)]
+        self.assertEqual(errors, [(4, '1 + * X'), (6, 'X^'), (7, '5X'), (8, '(1+j)X')])
+
+    def testSequential(self):
+        """Check that the lines are parsed in order and that invalid lines give located errors
+        """
+        self.check(list(parse_stream(io.StringIO('\n'.join(self.lines)), self.f7)))
+
+    def testFile(self):
+        """Check that errors name the parsed file
+        """
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'polynomials.txt')
+            with open(path, 'w') as file:
+                file.write('\n'.join(self.lines))
+            with open(path) as file:
+                results = list(parse_stream(file, self.f7))
+        self.check(results)
+        self.assertEqual(results[2].filename, path)
+
+    def testFiniteField(self):
+        """Parsing lines over a finite field
+        """
+        f4 = FiniteField(2, 2, PrimeField(2).polynomial(1, 1, 1))
+        results = list(parse_stream(io.StringIO('(1+j)X^2 + X\n1 + (j)X\n'), f4, indeterminate='X'))
+        self.assertEqual([str(p) for p in results], ['X + (1+j)X^2', '1 + (j)X'])
+
+    def testProcessPool(self):
+        """Check that parsing by chunks in a process pool yields the same results in the same order
+        """
+        lines = self.lines * 5
+        results = list(parse_stream(io.StringIO('\n'.join(lines)), self.f7, workers=2, chunk_size=3))
+        expected = list(parse_stream(io.StringIO('\n'.join(lines)), self.f7))
+        self.assertEqual([str(r) for r in results], [str(r) for r in expected])
+        self.assertEqual([r.lineno for r in results if isinstance(r, SyntaxError)],
+                         [r.lineno for r in expected if isinstance(r, SyntaxError)])
+
+
 if __name__ == '__main__':
     run_tests()
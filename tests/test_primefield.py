@@ -87,6 +87,16 @@ class TestMultiplicativeGroup(TestCase):
         self.assertTrue(PrimeField._pf_div(-3, 2, self.mulgr7) == 2)
         self.assertTrue(PrimeField._pf_div(-2, 3, self.mulgr7) == -3)
 
+    def testReciprocals(self):
+        """Checking low level primitive for multiplicative inverses up to F31
+        """
+        for p in (11, 17, 19, 23, 29, 31):
+            gr = PrimeField._multiplicative_group_representation(PrimeField._additive_group_representation(p))
+            for a in range(-(p - 1) // 2, (p + 1) // 2):
+                if a != 0:
+                    with self.subTest(p=p, a=a):
+                        self.assertEqual(PrimeField._pf_mul(a, PrimeField._pf_multiplicative_inverse(a, gr), gr), 1)
+
 
 class TestFieldOps(TestCase):
     def setUp(self):
@@ -0,0 +1,173 @@
+from unittest import TestCase
+from unittest import main as run_tests
+
+import io
+from time import perf_counter
+
+from pyimath.finitefield import FiniteField, finite_field
+from pyimath.functions import maybe_prime
+from pyimath.integer import IntegerRing
+from pyimath.polynomial import symbolic_polynomial
+from pyimath.primefield import PrimeField
+from pyimath.serialization import FORMAT_VERSION, MAX_CHARACTERISTIC, MAX_FIELD_ORDER, decode, dump, dump_many, dumps, iter_decode, load, load_many, loads
+
+
+class TestRoundTrip(TestCase):
+    def setUp(self):
+        f101 = finite_field(101)
+        f27 = finite_field(27)
+        z = IntegerRing()
+        self.polys = [
+            f101.polynomial(*range(-50, 51)),
+            f101.polynomial(0),
+            f101.polynomial(3, indeterminate='T'),
+            finite_field(2).polynomial(1, 1, 0, 0, 0, 0, 0, 0, 1),
+            symbolic_polynomial('(1+j)X^3 + (1+j^2)X + (j)', f27),
+            symbolic_polynomial('X^5 - 3X^2 + 12X - 1', z),
+            z.polynomial(10 ** 30, 0, -2 ** 70, 1),
+            z.polynomial(300, -40000, 5),
+        ]
+
+    def testParser(self):
+        """Check that decoded polynomials are the ones parsed from their string representation
+        """
+        for p in self.polys:
+            for varint in (False, True):
+                with self.subTest(p=str(p), varint=varint):
+                    q = loads(dumps(p, varint=varint))
+                    self.assertEqual(q, p)
+                    self.assertEqual(q.indeterminate, p.indeterminate)
+                    self.assertEqual(str(q), str(p))
+                    if not p.is_null:
+                        self.assertEqual(q, symbolic_polynomial(str(p), p.base_field, indeterminate=p.indeterminate))
+
+    def testFields(self):
+        """Check that base fields are restored from their parameters
+        """
+        self.assertIs(loads(dumps(self.polys[0])).base_field, finite_field(101))
+        self.assertIs(loads(dumps(self.polys[4])).base_field, finite_field(27))
+
+        f9 = FiniteField(3, 2, PrimeField(3).polynomial(-1, 1, 1), root_symbol='k')
+        p = f9.polynomial(f9(1, 1), f9(0, 1))
+        q = loads(dumps(p))
+        self.assertEqual(q.base_field.base_polynomial, f9.base_polynomial)
+        self.assertEqual(q.base_field.root_symbol, 'k')
+        self.assertEqual(str(q), str(p))
+
+    def testStream(self):
+        """Check that a stream of polynomials is read back in order, one record at a time
+        """
+        file = io.BytesIO()
+        self.assertEqual(dump_many(self.polys, file), len(self.polys))
+        dump(self.polys[0], file, varint=True)
+        file.seek(0)
+        self.assertEqual(list(load_many(file)), self.polys + self.polys[:1])
+
+        file.seek(0)
+        self.assertEqual(load(file), self.polys[0])
+        file.seek(0, io.SEEK_END)
+        with self.assertRaises(EOFError):
+            load(file)
+
+    def testZeroCopy(self):
+        """Check that fixed width coefficients are views of the buffer
+        """
+        data = bytearray()
+        for p in self.polys[:3]:
+            data += dumps(p)
+        records = list(iter_decode(data))
+        self.assertEqual(len(records), 3)
+        self.assertEqual(records[-1].end, len(data))
+        self.assertEqual(list(records[0].coefficients), list(range(-50, 51)))
+        self.assertEqual(records[0].coefficients.itemsize, 1)
+        self.assertEqual(records[2].indeterminate, 'T')
+
+        if isinstance(records[0].coefficients, memoryview):
+            # 101 coefficients of one byte padded to 104 bytes
+            data[records[0].end - 4] = 7
+            self.assertEqual(records[0].coefficients[-1], 7)
+
+        f27 = decode(dumps(self.polys[4]))
+        self.assertEqual(len(f27.coefficients), 4 * 3)
+
+    def testWidths(self):
+        """Check that coefficients are packed in the smallest width or as varints
+        """
+        z = IntegerRing()
+        self.assertEqual(decode(dumps(z.polynomial(300, 1))).coefficients.itemsize, 2)
+        self.assertEqual(decode(dumps(z.polynomial(2 ** 40, 1))).coefficients.itemsize, 8)
+        self.assertIsInstance(decode(dumps(z.polynomial(2 ** 63, 1))).coefficients, list)
+        self.assertLess(len(dumps(z.polynomial(*[1] * 64), varint=True)), len(dumps(z.polynomial(*[2 ** 40] * 64))))
+
+    def testInvalid(self):
+        """Check that invalid records are rejected
+        """
+        data = dumps(self.polys[0])
+        with self.assertRaises(ValueError):
+            loads(b'NOPE' + data[4:])
+        with self.assertRaises(ValueError):
+            loads(data[:4] + bytes([FORMAT_VERSION + 1]) + data[5:])
+        with self.assertRaises(ValueError):
+            loads(data[:-16])
+        with self.assertRaises(ValueError):
+            load_many(io.BytesIO(data[:-16])).__next__()
+
+    def testNotAPolynomial(self):
+        """Check that a file that does not hold polynomials is rejected before its sizes are used
+        """
+        for data in (b'\xff' * 64, b'NOPE' + dumps(self.polys[0])[4:]):
+            with self.subTest(data=data[:8]):
+                file = io.BytesIO(data)
+                with self.assertRaises(ValueError):
+                    load(file)
+                self.assertEqual(file.tell(), 20)
+
+    def testLargeFields(self):
+        """Check that records over fields too large or that are not fields are rejected
+        """
+        data = bytearray(dumps(finite_field(101).polynomial(1, 2, 3)))
+        data[20] = 103
+        self.assertEqual(loads(data).base_field, finite_field(103))
+        over_limit = next(p for p in range(MAX_CHARACTERISTIC + 1, 2 * MAX_CHARACTERISTIC) if maybe_prime(p))
+        for characteristic in (2 ** 61 - 1, 65521, over_limit, 0, 1, 9):
+            with self.subTest(characteristic=characteristic):
+                start = perf_counter()
+                with self.assertRaises(ValueError):
+                    loads(self._reencode(data, b'P', characteristic))
+                self.assertLess(perf_counter() - start, 0.1)
+        for dimension in (MAX_FIELD_ORDER.bit_length(), 4, 3000):
+            with self.subTest(dimension=dimension):
+                with self.assertRaises(ValueError):
+                    loads(self._reencode(data, b'F', 2, dimension))
+
+    def testReducibleIdeal(self):
+        """Check that records over a finite field defined by a reducible or non monic ideal are rejected
+        """
+        data = dumps(finite_field(9).polynomial(1, -1))
+
+        def record(ideal):
+            return self._reencode(data, b'F', 3, 2, *(2 * c if c >= 0 else -2 * c - 1 for c in ideal), 0, 0)
+
+        self.assertEqual(loads(record((1, 0, 1))).base_field.base_polynomial, PrimeField(3).polynomial(1, 0, 1))
+        for ideal in ((-1, 0, 1), (0, 0, 1), (1, 0, -1), (1, 1, 0)):
+            with self.subTest(ideal=ideal):
+                with self.assertRaises(ValueError):
+                    loads(record(ideal))
+
+    @staticmethod
+    def _reencode(data: bytes, kind: bytes, *values: int) -> bytes:
+        """Returns a record of the given kind with the given varints as parameters and no coefficients
+        """
+        params = b''
+        for v in values:
+            while v >= 0x80:
+                params += bytes([v & 0x7f | 0x80])
+                v >>= 7
+            params += bytes([v])
+        params += b'\0'
+        head = data[:5] + kind + data[6:8] + len(params).to_bytes(4, 'little') + bytes(8) + params
+        return bytes(head) + bytes(-len(head) % 8)
+
+
+if __name__ == '__main__':
+    run_tests()
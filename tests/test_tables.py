@@ -0,0 +1,167 @@
+from unittest import TestCase
+from unittest import main as run_tests
+
+import os
+import pickle
+import struct
+from tempfile import TemporaryDirectory
+
+from pyimath.finitefield import FiniteField
+from pyimath.primefield import PrimeField
+from pyimath.tables import FORMAT_VERSION, TableCache
+
+
+class TestTableCache(TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.cache = TableCache(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def testRoundTrip(self):
+        """Check that tables are read back as read-only views of the right integer types
+        """
+        cache = self.cache
+        cache.store('test', [7, 2], dict(small=[-1, 0, 1], large=[2 ** 40, -3], empty=[]))
+        tables = cache.load('test', [7, 2])
+        self.assertEqual(list(tables['small']), [-1, 0, 1])
+        self.assertEqual(list(tables['large']), [2 ** 40, -3])
+        self.assertEqual(list(tables['empty']), [])
+        self.assertEqual(list(tables['params']), [7, 2])
+        self.assertEqual(tables['small'].itemsize, 1)
+        self.assertTrue(tables['large'].readonly)
+
+    def testMisses(self):
+        """Check that missing, foreign, corrupted or outdated files are ignored
+        """
+        cache = self.cache
+        self.assertIsNone(cache.load('test', [1]))
+
+        cache.store('test', [1], dict(values=[1, 2, 3]))
+        path = cache._path('test', [1])
+        with open(path, 'rb') as file:
+            content = file.read()
+
+        # another version of the format
+        with open(path, 'wb') as file:
+            file.write(content[:8] + struct.pack('=I', FORMAT_VERSION + 1) + content[12:])
+        self.assertIsNone(cache.load('test', [1]))
+
+        # truncated data
+        with open(path, 'wb') as file:
+            file.write(content[:-8])
+        self.assertIsNone(cache.load('test', [1]))
+
+        # empty file
+        with open(path, 'wb'):
+            pass
+        self.assertIsNone(cache.load('test', [1]))
+
+    def testCorruptedHeader(self):
+        """Check that files with a corrupted header or index are ignored
+        """
+        cache = self.cache
+        cache.store('test', [1], dict(values=[1, 2, 3]))
+        path = cache._path('test', [1])
+        with open(path, 'rb') as file:
+            content = file.read()
+
+        corruptions = [
+            content[:16] + struct.pack('=I', 2 ** 32 - 1) + content[20:],  # number of tables
+            content[:16] + struct.pack('=I', 3) + content[20:],
+            content[:36] + b'Z' + content[37:],  # typecode
+            content[:36] + b'\xff' + content[37:],
+            content[:20] + b'\xff' * 16 + content[36:],  # name
+            content[:44] + struct.pack('=Q', 2 ** 63) + content[52:],  # number of items
+        ]
+        for corrupted in corruptions:
+            with self.subTest(corrupted=corrupted[:56]):
+                with open(path, 'wb') as file:
+                    file.write(corrupted)
+                self.assertIsNone(cache.load('test', [1]))
+
+    def testUnwritableDirectory(self):
+        """Check that a cache that cannot be written to is not an error
+        """
+        path = os.path.join(self.directory.name, 'file')
+        with open(path, 'w'):
+            pass
+        cache = TableCache(os.path.join(path, 'tables'))
+        cache.store('test', [1], dict(values=[1]))
+        self.assertIsNone(cache.load('test', [1]))
+
+
+class TestFieldTables(TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.settings = [(cls, cls.table_cache, cls.table_cache_min_order) for cls in (PrimeField, FiniteField)]
+        for cls in (PrimeField, FiniteField):
+            cls.table_cache = TableCache(self.directory.name)
+            cls.table_cache_min_order = 2
+
+    def tearDown(self):
+        for cls, cache, min_order in self.settings:
+            cls.table_cache = cache
+            cls.table_cache_min_order = min_order
+        self.directory.cleanup()
+
+    def testPrimeField(self):
+        """Check that the multiplication table of a prime field is loaded from the cache
+        """
+        computed, loaded = PrimeField(31), PrimeField(31)
+        self.assertIsInstance(computed.multiplicative_group, dict)
+        self.assertNotIsInstance(loaded.multiplicative_group, dict)
+        self.assertEqual(dict(loaded.multiplicative_group), computed.multiplicative_group)
+        for a in range(-15, 16):
+            for b in range(-15, 16):
+                self.assertEqual(loaded(a) * loaded(b), computed(a) * computed(b))
+                if b != 0:
+                    self.assertEqual(loaded(a) / loaded(b), computed(a) / computed(b))
+
+        unpickled = pickle.loads(pickle.dumps(loaded))
+        self.assertEqual(unpickled(7) * unpickled(-9), loaded(7) * loaded(-9))
+
+    def testCorruptedFile(self):
+        """Check that a field is computed again when its cache file is corrupted
+        """
+        computed = PrimeField(31)
+        path = PrimeField.table_cache._path('prime', [31])
+        with open(path, 'r+b') as file:
+            file.seek(16)
+            file.write(struct.pack('=I', 1000))
+        field = PrimeField(31)
+        self.assertIsInstance(field.multiplicative_group, dict)
+        self.assertEqual(field.multiplicative_group, computed.multiplicative_group)
+
+    def testFiniteField(self):
+        """Check that the tables of a finite field are loaded from the cache
+        """
+        ideal = PrimeField(3).polynomial(-1, -1, 0, 1)
+        computed, loaded = (FiniteField(3, 3, ideal, generator=(1, 0, 1)) for _ in range(2))
+        self.assertIsInstance(computed.generator_powers, dict)
+        self.assertNotIsInstance(loaded.generator_powers, dict)
+        self.assertTrue(loaded.has_valid_generator)
+        self.assertEqual(dict(loaded.root_powers), computed.root_powers)
+        self.assertEqual([e.vector for e in loaded.frobenius_map], [e.vector for e in computed.frobenius_map])
+        for a in computed:
+            self.assertEqual(loaded.element(a.vector).vector, a.vector)
+            for b in computed:
+                product = loaded.element(a.vector) * loaded.element(b.vector)
+                self.assertEqual(product.vector, (a * b).vector)
+
+        unpickled = pickle.loads(pickle.dumps(loaded))
+        self.assertEqual((unpickled(1, 1) * unpickled(0, 1, 1)).vector, (loaded(1, 1) * loaded(0, 1, 1)).vector)
+
+    def testFiniteFieldWithoutGenerator(self):
+        """Check the tables of a finite field defined without a generator
+        """
+        ideal = PrimeField(2).polynomial(1, 1, 0, 0, 1)
+        computed, loaded = (FiniteField(2, 4, ideal) for _ in range(2))
+        self.assertFalse(loaded.has_valid_generator)
+        self.assertEqual([e.vector for e in loaded.frobenius_map], [e.vector for e in computed.frobenius_map])
+        self.assertEqual((loaded(1, 1) * loaded(0, 1, 1)).vector, (computed(1, 1) * computed(0, 1, 1)).vector)
+
+
+if __name__ == '__main__':
+    run_tests()